@@ -2,6 +2,7 @@
 import logging
 from fastmcp import FastMCP
 from app.mcp.server import mcp
+from app.mcp.io_executor import freeze_startup_objects
 
 logger = logging.getLogger("cursor_automation_builder_mcp")
 
@@ -88,11 +89,13 @@ if __name__ == "__main__":
         # Check if tools are registered by testing imports
         expected_tools = [
             ('build_automation_system', 'app.mcp.tools.automation_builder.automation_builder'),
+            ('build_automation_systems_batch', 'app.mcp.tools.automation_builder.automation_builder'),
             ('list_automation_templates', 'app.mcp.tools.automation_builder.automation_builder'),
             ('build_from_template', 'app.mcp.tools.automation_builder.automation_builder'),
             ('start_learning_path', 'app.mcp.tools.automation_builder.automation_builder'),
             ('meta_optimize_system', 'app.mcp.tools.automation_builder.automation_builder'),
             ('analyze_workspace', 'app.mcp.tools.workspace_analyzer.workspace_analyzer'),
+            ('analyze_workspaces', 'app.mcp.tools.workspace_analyzer.workspace_analyzer'),
             ('list_templates', 'app.mcp.tools.template_manager.template_manager'),
             ('get_template_details', 'app.mcp.tools.template_manager.template_manager'),
             ('create_custom_template', 'app.mcp.tools.template_manager.template_manager')
@@ -112,5 +115,8 @@ if __name__ == "__main__":
     logger.info(f"Total tools registered: {tool_count}")
     logger.info("🌟 Cursor Automation System Builder MCP Server ready!")
     
+    # Keep full garbage collections from stalling tool calls (see freeze_startup_objects)
+    freeze_startup_objects()
+    
     # Start the server
     mcp.run()
\ No newline at end of file
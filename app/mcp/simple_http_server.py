@@ -13,6 +13,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 from .server import mcp
 from .mcp import register_all_tools
+from .io_executor import run_io, shutdown_io_executor, freeze_startup_objects
+from .tools.workspace_analyzer.workspace_watcher import start_workspace_watchers, stop_workspace_watchers
 
 # Ensure tools are registered
 register_all_tools(mcp)
@@ -33,6 +35,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep full garbage collections from stalling tool calls (see freeze_startup_objects)
+@app.on_event("startup")
+async def freeze_startup():
+    freeze_startup_objects()
+
+# Optional live workspace watchers (WORKSPACE_WATCH_ROOTS, separated like PATH)
+@app.on_event("startup")
+async def start_watchers():
+    """Keep analysis results hot for the configured workspace roots"""
+    roots = [root for root in os.getenv("WORKSPACE_WATCH_ROOTS", "").split(os.pathsep) if root]
+    if roots:
+        # The initial index sync walks the disk, so keep it off the event loop
+        await run_io(start_workspace_watchers, roots)
+
+@app.on_event("shutdown")
+async def stop_watchers():
+    await run_io(stop_workspace_watchers)
+    # Blocking tool work runs on the shared I/O executor (IO_EXECUTOR_WORKERS threads)
+    shutdown_io_executor()
+
 # SSE endpoint for Cursor MCP integration
 @app.get("/sse")
 async def sse_endpoint():
@@ -58,11 +80,13 @@ async def sse_endpoint():
                 # Fallback tool list
                 tools = [
                     {"name": "build_automation_system", "description": "Build complete automation systems from descriptions"},
+                    {"name": "build_automation_systems_batch", "description": "Build many automation systems concurrently in one call"},
                     {"name": "list_automation_templates", "description": "List available automation templates"},
                     {"name": "build_from_template", "description": "Build systems using proven templates"},
                     {"name": "start_learning_path", "description": "Start guided learning tutorials"},
                     {"name": "meta_optimize_system", "description": "Optimize and analyze system performance"},
                     {"name": "analyze_workspace", "description": "Analyze workspace for automation opportunities"},
+                    {"name": "analyze_workspaces", "description": "Analyze several workspaces in parallel with a combined roll-up"},
                     {"name": "list_templates", "description": "List all available templates"},
                     {"name": "get_template_details", "description": "Get detailed template information"},
                     {"name": "create_custom_template", "description": "Create custom templates"}
@@ -158,15 +182,17 @@ async def list_tools():
             except Exception as e:
                 pass
         
-        # Method 3: Hardcoded tool list as fallback (your 9 known tools)
+        # Method 3: Hardcoded tool list as fallback (your 11 known tools)
         if not tools:
             tools = [
                 {"name": "build_automation_system", "description": "Build complete automation systems from descriptions"},
+                {"name": "build_automation_systems_batch", "description": "Build many automation systems concurrently in one call"},
                 {"name": "list_automation_templates", "description": "List available automation templates"},
                 {"name": "build_from_template", "description": "Build systems using proven templates"},
                 {"name": "start_learning_path", "description": "Start guided learning tutorials"},
                 {"name": "meta_optimize_system", "description": "Optimize and analyze system performance"},
                 {"name": "analyze_workspace", "description": "Analyze workspace for automation opportunities"},
+                {"name": "analyze_workspaces", "description": "Analyze several workspaces in parallel with a combined roll-up"},
                 {"name": "list_templates", "description": "List all available templates"},
                 {"name": "get_template_details", "description": "Get detailed template information"},
                 {"name": "create_custom_template", "description": "Create custom templates"}
@@ -2,19 +2,31 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Callable, Awaitable, Optional
 import asyncio
 import time
 
 from app.mcp.server import mcp
+from fastmcp import Context
+from app.mcp.io_executor import run_io, run_cancellable
+from app.mcp.tools.workspace_analyzer.scan_service import get_scan_service
+from app.mcp.tools.workspace_analyzer.client_manifest import scan_manifest
+from .build_cache import get_build_cache, build_cache_key, write_if_changed
+from .skeleton_pool import get_skeleton_pool, skeleton_key
+from .template_engine import render_templates
 from .automation_builder_pydantic import (
     AutomationBuilderInput, AutomationBuilderOutput, SystemCapability, 
     EnhancementSuggestion, TemplateBuilderInput, TemplateListOutput, 
     AvailableTemplate, LearningPathInput, LearningPathOutput, LearningStep,
     MetaOptimizationInput, MetaOptimizationOutput, OptimizationOpportunity,
-    SystemType, BuildMode, EnhancementPreference
+    SystemType, BuildMode, EnhancementPreference,
+    AutomationBatchInput, AutomationBatchItem, AutomationBatchOutput
 )
 
+# Version of the system templates and the files generated from them; part of every
+# build cache key, so bump it whenever generated output changes
+SYSTEM_TEMPLATE_VERSION = "1.0.0"
+
 @mcp.tool(
     description="Build a complete automation system from a description. Creates production-ready systems with intelligent enhancements, error handling, and professional features."
 )
@@ -34,59 +46,72 @@ async def build_automation_system(input_data: AutomationBuilderInput) -> Automat
     the most appropriate solution with all necessary components.
     """
     
-    start_time = time.time()
-    
-    # Analyze the automation goal and determine system type
-    detected_system_type = await _detect_system_type(input_data.automation_goal)
-    system_type = input_data.system_type or detected_system_type
-    
-    # Determine build mode if auto-detect
-    build_mode = input_data.build_mode
-    if build_mode == BuildMode.AUTO_DETECT:
-        build_mode = await _detect_build_mode(input_data.automation_goal)
-    
-    # Analyze workspace context
-    workspace_analysis = await _analyze_workspace_context(input_data.workspace_context)
+    return await _build_automation(input_data)
+
+@mcp.tool(
+    description="Build many automation systems in one call. Runs the builds concurrently, shares one workspace scan and template catalog across them, and streams each result as it finishes."
+)
+async def build_automation_systems_batch(input_data: AutomationBatchInput, ctx: Optional[Context] = None) -> AutomationBatchOutput:
+    """
+    Run build_automation_system for many goals at once.
+    
+    Up to max_concurrency builds run at a time. Builds with the same
+    workspace_manifest (or none) share a single workspace scan, and the
+    template catalog is loaded once for the whole batch. Each finished
+    build is streamed to the client as a progress notification plus a log
+    message carrying its full result. A build that fails is reported with
+    its error and does not stop the others.
+    """
     
-    # Get the appropriate template and enhancements
-    template_info = await _get_system_template(system_type, workspace_analysis)
-    enhancements = await _determine_enhancements(
-        system_type, 
-        workspace_analysis, 
-        input_data.enhancement_preference
-    )
+    started = time.monotonic()
+    templates = await _load_system_templates()
+    # One scan per distinct manifest, started by the first build that needs it
+    scans: Dict[Optional[str], asyncio.Task] = {}
+    limit = asyncio.Semaphore(input_data.max_concurrency)
+    
+    def shared_scan(workspace_manifest: Optional[str]) -> asyncio.Task:
+        if workspace_manifest not in scans:
+            scans[workspace_manifest] = asyncio.create_task(_scan_workspace(workspace_manifest))
+        return scans[workspace_manifest]
+    
+    async def build(position: int, build_input: AutomationBuilderInput) -> AutomationBatchItem:
+        async with limit:
+            item_started = time.monotonic()
+            try:
+                output = await _build_automation(build_input, scan=shared_scan(build_input.workspace_manifest), templates=templates)
+                error = None
+            except Exception as e:
+                output, error = None, str(e) or type(e).__name__
+            return AutomationBatchItem(
+                position=position,
+                automation_goal=build_input.automation_goal,
+                output=output,
+                error=error,
+                elapsed_ms=round((time.monotonic() - item_started) * 1000, 1)
+            )
     
-    # Build the system
-    build_result = await _build_system(
-        automation_goal=input_data.automation_goal,
-        system_type=system_type,
-        build_mode=build_mode,
-        template_info=template_info,
-        enhancements=enhancements,
-        custom_requirements=input_data.custom_requirements or [],
-        workspace_analysis=workspace_analysis
-    )
-    
-    build_time = time.time() - start_time
-    
-    # Generate template if this was a successful build
-    template_generated = None
-    if build_result["success"] and build_time < 900:  # Less than 15 minutes indicates good efficiency
-        template_generated = await _generate_template_from_build(build_result, input_data.automation_goal)
-    
-    return AutomationBuilderOutput(
-        success=build_result["success"],
-        system_name=build_result["system_name"],
-        system_description=build_result["description"],
-        capabilities=build_result["capabilities"],
-        file_locations=build_result["files"],
-        usage_instructions=build_result["usage_instructions"],
-        build_time_minutes=build_time / 60,
-        applied_enhancements=build_result["applied_enhancements"],
-        suggested_enhancements=build_result["suggested_enhancements"],
-        performance_metrics=build_result["performance_metrics"],
-        next_steps=build_result["next_steps"],
-        template_generated=template_generated
+    results = []
+    pending = [asyncio.create_task(build(position, build_input)) for position, build_input in enumerate(input_data.builds)]
+    try:
+        for finished in asyncio.as_completed(pending):
+            result = await finished
+            results.append(result)
+            if ctx is not None:
+                status = result.output.system_name if result.output is not None else f"failed: {result.error}"
+                await ctx.report_progress(len(results), len(pending), f"{result.automation_goal}: {status}")
+                await ctx.info(f"{result.automation_goal} {'built' if result.output is not None else 'failed'}", extra=result.model_dump(mode="json"))
+    finally:
+        # A cancelled batch should not leave builds or scans running
+        for task in [*pending, *scans.values()]:
+            task.cancel()
+    
+    succeeded = sum(1 for result in results if result.output is not None)
+    return AutomationBatchOutput(
+        results=results,
+        builds_succeeded=succeeded,
+        builds_failed=len(results) - succeeded,
+        workspace_scans=len(scans),
+        elapsed_ms=round((time.monotonic() - started) * 1000, 1)
     )
 
 @mcp.tool(
@@ -214,6 +239,158 @@ async def meta_optimize_system(input_data: MetaOptimizationInput) -> MetaOptimiz
 
 # Helper functions for the automation building logic
 
+async def _build_automation(
+    input_data: AutomationBuilderInput,
+    scan: Optional[Awaitable[Dict[str, Any]]] = None,
+    templates: Optional[Dict[SystemType, Dict[str, Any]]] = None
+) -> AutomationBuilderOutput:
+    """
+    Build one automation system (see build_automation_system).
+    
+    scan is a workspace scan already started by the caller, such as the
+    one a batch shares between its builds; templates is a catalog loaded
+    by the caller. Either is fetched by this build when not given.
+    """
+    
+    start_time = time.time()
+    phase_timings: Dict[str, float] = {}
+    cache_key = None
+    
+    async def system_type_phase() -> SystemType:
+        # Analyze the automation goal unless the caller chose the system type
+        return input_data.system_type or await _detect_system_type(input_data.automation_goal)
+    
+    async def build_mode_phase() -> BuildMode:
+        if input_data.build_mode == BuildMode.AUTO_DETECT:
+            return await _detect_build_mode(input_data.automation_goal)
+        return input_data.build_mode
+    
+    async def workspace_analysis_phase() -> Dict[str, Any]:
+        workspace_scan = await scan if scan is not None else await _scan_workspace(input_data.workspace_manifest)
+        return _workspace_analysis(workspace_scan, input_data.workspace_context)
+    
+    async def cache_phase(system_type, build_mode, template_info, enhancements) -> Optional[AutomationBuilderOutput]:
+        # The workspace only affects a build through its enhancements, so the scan itself is not hashed
+        nonlocal cache_key
+        cache_key = build_cache_key(
+            {
+                "automation_goal": input_data.automation_goal,
+                "system_type": system_type,
+                "build_mode": build_mode,
+                "enhancement_preference": input_data.enhancement_preference,
+                "workspace_context": input_data.workspace_context,
+                "custom_requirements": input_data.custom_requirements
+            },
+            template_info,
+            SYSTEM_TEMPLATE_VERSION,
+            enhancements
+        )
+        return await run_io(get_build_cache().get, cache_key)
+    
+    async def build_phase(cached, system_type, build_mode, template_info, enhancements, workspace_analysis) -> Optional[Dict[str, Any]]:
+        if cached is not None:
+            return None
+        return await _build_system(
+            automation_goal=input_data.automation_goal,
+            system_type=system_type,
+            build_mode=build_mode,
+            template_info=template_info,
+            enhancements=enhancements,
+            custom_requirements=input_data.custom_requirements or [],
+            workspace_analysis=workspace_analysis
+        )
+    
+    # Only the enhancements and the build itself need the workspace scan, so the goal
+    # analysis and the template lookup run while the scan is in flight
+    phases = await _run_build_phases({
+        "system_type": ([], system_type_phase),
+        "build_mode": ([], build_mode_phase),
+        "workspace_analysis": ([], workspace_analysis_phase),
+        "template": (["system_type"], lambda system_type: _get_system_template(system_type, templates)),
+        "enhancements": (
+            ["system_type", "workspace_analysis"],
+            lambda system_type, workspace_analysis: _determine_enhancements(
+                system_type,
+                workspace_analysis,
+                input_data.enhancement_preference
+            )
+        ),
+        "cache": (["system_type", "build_mode", "template", "enhancements"], cache_phase),
+        "build": (["cache", "system_type", "build_mode", "template", "enhancements", "workspace_analysis"], build_phase)
+    }, phase_timings)
+    
+    # An identical earlier build whose files are all still in place is returned as is
+    if phases["cache"] is not None:
+        phase_timings["total"] = round((time.time() - start_time) * 1000, 2)
+        return phases["cache"].model_copy(update={
+            "build_time_minutes": (time.time() - start_time) / 60,
+            "phase_timings_ms": phase_timings,
+            "cache_hit": True
+        })
+    build_result = phases["build"]
+    
+    build_time = time.time() - start_time
+    
+    # Generate template if this was a successful build
+    template_generated = None
+    if build_result["success"] and build_time < 900:  # Less than 15 minutes indicates good efficiency
+        started = time.perf_counter()
+        template_generated = await _generate_template_from_build(build_result, input_data.automation_goal)
+        phase_timings["template_generation"] = round((time.perf_counter() - started) * 1000, 2)
+    phase_timings["total"] = round((time.time() - start_time) * 1000, 2)
+    
+    output = AutomationBuilderOutput(
+        success=build_result["success"],
+        system_name=build_result["system_name"],
+        system_description=build_result["description"],
+        capabilities=build_result["capabilities"],
+        file_locations=build_result["files"],
+        usage_instructions=build_result["usage_instructions"],
+        build_time_minutes=build_time / 60,
+        applied_enhancements=build_result["applied_enhancements"],
+        suggested_enhancements=build_result["suggested_enhancements"],
+        performance_metrics=build_result["performance_metrics"],
+        next_steps=build_result["next_steps"],
+        template_generated=template_generated,
+        phase_timings_ms=phase_timings
+    )
+    get_build_cache().put(cache_key, output)
+    return output
+
+async def _run_build_phases(
+    phases: Dict[str, Tuple[List[str], Callable[..., Awaitable[Any]]]],
+    timings: Dict[str, float]
+) -> Dict[str, Any]:
+    """
+    Run build phases as a dependency graph and return each phase's result by name.
+    
+    phases maps a name to (names of the phases it needs, coroutine function
+    called with their results in that order); a phase only names phases
+    listed before it. Every phase starts as soon as its inputs are ready,
+    so independent phases run concurrently. timings receives each phase's
+    own run time in milliseconds, excluding the time spent waiting for its
+    inputs. If a phase fails the others are cancelled and the error is raised.
+    """
+    
+    tasks: Dict[str, asyncio.Task] = {}
+    
+    async def run(name: str, needs: List[str], phase: Callable[..., Awaitable[Any]]) -> Any:
+        inputs = [await tasks[need] for need in needs]
+        started = time.perf_counter()
+        result = await phase(*inputs)
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    
+    for name, (needs, phase) in phases.items():
+        tasks[name] = asyncio.create_task(run(name, needs, phase))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return {name: task.result() for name, task in tasks.items()}
+
 async def _detect_system_type(automation_goal: str) -> SystemType:
     """Detect the most appropriate system type from the automation goal"""
     
@@ -259,8 +436,19 @@ async def _detect_build_mode(automation_goal: str) -> BuildMode:
     else:
         return BuildMode.BALANCED
 
-async def _analyze_workspace_context(workspace_context: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Analyze the workspace for relevant files, APIs, and context"""
+async def _scan_workspace(workspace_manifest: Optional[str] = None) -> Dict[str, Any]:
+    """Scan the workspace for data files, API docs and config files"""
+    
+    # A remote server's working directory is not the user's workspace, so a client
+    # manifest takes precedence. Otherwise check the actual workspace through the shared
+    # scan service, which reuses the result of a recent analyze_workspace call when the
+    # tree has not changed
+    if workspace_manifest is not None:
+        return await run_cancellable(scan_manifest, workspace_manifest)
+    return await get_scan_service().scan_async(Path("."))
+
+def _workspace_analysis(scan: Dict[str, Any], workspace_context: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Turn a workspace scan into the relevant files, APIs, and context for a build"""
     
     analysis = {
         "data_files": [],
@@ -271,26 +459,8 @@ async def _analyze_workspace_context(workspace_context: Dict[str, Any] = None) -
         "opportunities": []
     }
     
-    # Check the actual workspace
-    project_root = Path(".")
-    
-    # Look for data files
-    for pattern in ["*.csv", "*.json", "*.xlsx", "*.xml"]:
-        for file_path in project_root.rglob(pattern):
-            if not any(skip in str(file_path) for skip in [".git", "__pycache__", "node_modules"]):
-                analysis["data_files"].append(str(file_path))
-    
-    # Look for API documentation
-    for pattern in ["*api*", "*swagger*", "*openapi*"]:
-        for file_path in project_root.rglob(pattern):
-            if file_path.is_file() and not any(skip in str(file_path) for skip in [".git", "__pycache__"]):
-                analysis["api_docs"].append(str(file_path))
-    
-    # Look for config files
-    for pattern in ["*.config.*", "*.env*", "config.*"]:
-        for file_path in project_root.rglob(pattern):
-            if file_path.is_file():
-                analysis["config_files"].append(str(file_path))
+    for group_name in ["data_files", "api_docs", "config_files"]:
+        analysis[group_name].extend(scan["groups"][group_name]["examples"])
     
     # Add workspace context if provided
     if workspace_context:
@@ -298,8 +468,8 @@ async def _analyze_workspace_context(workspace_context: Dict[str, Any] = None) -
     
     return analysis
 
-async def _get_system_template(system_type: SystemType, workspace_analysis: Dict[str, Any]) -> Dict[str, Any]:
-    """Get the appropriate template for the system type"""
+async def _load_system_templates() -> Dict[SystemType, Dict[str, Any]]:
+    """Load the catalog of system templates, keyed by system type"""
     
     templates = {
         SystemType.DATA_PROCESSING: {
@@ -329,6 +499,14 @@ async def _get_system_template(system_type: SystemType, workspace_analysis: Dict
         }
     }
     
+    return templates
+
+async def _get_system_template(system_type: SystemType, templates: Optional[Dict[SystemType, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Get the appropriate template for the system type from the catalog (loaded if not given)"""
+    
+    if templates is None:
+        templates = await _load_system_templates()
+    
     return templates.get(system_type, {
         "name": "custom_system",
         "base_capabilities": ["core_processing"],
@@ -383,7 +561,7 @@ async def _build_system(
     # Create the system directory
     system_name = automation_goal.lower().replace(" ", "_").replace(",", "")[:30]
     system_dir = Path(f"automation-systems/{system_name}")
-    system_dir.mkdir(parents=True, exist_ok=True)
+    await run_io(system_dir.mkdir, parents=True, exist_ok=True)
     
     # Build capabilities list
     capabilities = []
@@ -439,28 +617,27 @@ async def _build_system(
         ]
     }
 
-async def _create_system_files(
-    system_dir: Path, 
-    system_type: SystemType, 
-    template_info: Dict[str, Any],
-    enhancements: List[str]
-) -> Dict[str, str]:
-    """Create the actual system files"""
-    
-    files = {}
-    
-    # Create main system file
-    main_content = f"""#!/usr/bin/env python3
-\"\"\"
-{system_type.value.replace('_', ' ').title()} Automation System
+# Files every generated system gets, with their purpose
+SYSTEM_FILES = {
+    "main.py": "Main automation system entry point",
+    "requirements.txt": "Python dependencies for the system",
+    "README.md": "System documentation and usage guide",
+    "config.json": "System configuration settings"
+}
+
+# Template sources of those files, compiled once into a single render function (see template_engine)
+SYSTEM_FILE_TEMPLATES = {
+    "main.py": '''#!/usr/bin/env python3
+"""
+{{ system_type|human|title }} Automation System
 Generated by Cursor Automation System Builder
 
 This system provides:
-{chr(10).join('- ' + cap for cap in template_info.get('base_capabilities', []))}
+{{ capabilities|bullets }}
 
 Enhancements applied:
-{chr(10).join('- ' + enh for enh in enhancements)}
-\"\"\"
+{{ enhancements|bullets }}
+"""
 
 import os
 import sys
@@ -473,12 +650,12 @@ logger = logging.getLogger(__name__)
 
 class AutomationSystem:
     def __init__(self):
-        self.name = "{system_type.value.replace('_', ' ').title()} System"
+        self.name = "{{ system_type|human|title }} System"
         self.version = "1.0.0"
-        logger.info(f"Initializing {{self.name}} v{{self.version}}")
+        logger.info(f"Initializing {self.name} v{self.version}")
     
     async def run(self):
-        \"\"\"Main system execution\"\"\"
+        """Main system execution"""
         logger.info("Starting automation system...")
         
         # TODO: Implement your automation logic here
@@ -490,44 +667,27 @@ if __name__ == "__main__":
     import asyncio
     system = AutomationSystem() 
     asyncio.run(system.run())
-"""
-    
-    main_file = system_dir / "main.py"
-    main_file.write_text(main_content)
-    files[str(main_file)] = "Main automation system entry point"
-    
-    # Create requirements.txt
-    requirements = [
-        "asyncio",
-        "pathlib",
+''',
+    # One package per line; the conditional blocks add each enhancement's dependencies
+    "requirements.txt": (
+        "asyncio\n"
+        "pathlib\n"
         "logging"
-    ]
-    
-    if "data_validation" in enhancements:
-        requirements.extend(["pandas>=1.5.0", "numpy>=1.20.0"])
-    
-    if "api_integration" in enhancements:
-        requirements.extend(["httpx>=0.24.0", "pydantic>=1.10.0"])
-    
-    if "advanced_reporting" in enhancements:
-        requirements.extend(["matplotlib>=3.5.0", "plotly>=5.0.0"])
-    
-    req_file = system_dir / "requirements.txt"
-    req_file.write_text("\n".join(requirements))
-    files[str(req_file)] = "Python dependencies for the system"
-    
-    # Create README
-    readme_content = f"""# {system_type.value.replace('_', ' ').title()} Automation System
+        "{% if 'data_validation' in enhancements %}\npandas>=1.5.0\nnumpy>=1.20.0{% endif %}"
+        "{% if 'api_integration' in enhancements %}\nhttpx>=0.24.0\npydantic>=1.10.0{% endif %}"
+        "{% if 'advanced_reporting' in enhancements %}\nmatplotlib>=3.5.0\nplotly>=5.0.0{% endif %}"
+    ),
+    "README.md": '''# {{ system_type|human|title }} Automation System
 
 Intelligent automation system built with the Cursor Automation System Builder.
 
 ## Features
 
-{chr(10).join('- ' + cap.replace('_', ' ').title() for cap in template_info.get('base_capabilities', []))}
+{{ capabilities|human|title|bullets }}
 
 ## Enhancements Applied
 
-{chr(10).join('- ' + enh.replace('_', ' ').title() for enh in enhancements)}
+{{ enhancements|human|title|bullets }}
 
 ## Quick Start
 
@@ -549,28 +709,59 @@ Edit `config.json` to customize the system for your specific needs.
 
 This system was generated by the Cursor Automation System Builder.
 For support and enhancements, use the meta-optimization tools.
-"""
-    
-    readme_file = system_dir / "README.md"
-    readme_file.write_text(readme_content)
-    files[str(readme_file)] = "System documentation and usage guide"
+''',
+    "config.json": "{{ config|json }}"
+}
+
+async def _create_system_files(
+    system_dir: Path, 
+    system_type: SystemType, 
+    template_info: Dict[str, Any],
+    enhancements: List[str]
+) -> Dict[str, str]:
+    """
+    Create the actual system files.
     
-    # Create config file
-    config = {
-        "system": {
-            "name": system_type.value.replace('_', ' ').title() + " System",
-            "version": "1.0.0",
-            "debug": False
-        },
-        "enhancements": enhancements,
-        "capabilities": template_info.get('base_capabilities', [])
-    }
+    The files depend only on the system type, template and enhancements,
+    so they are cloned from that profile's prebuilt skeleton, which is
+    rendered on the first build of the profile (see SkeletonPool).
+    """
     
-    config_file = system_dir / "config.json"
-    config_file.write_text(json.dumps(config, indent=2))
-    files[str(config_file)] = "System configuration settings"
+    # Skeletons persist across restarts, so the template sources are part of the key: editing
+    # SYSTEM_FILE_TEMPLATES gets new skeletons even if SYSTEM_TEMPLATE_VERSION was not bumped
+    key = skeleton_key({
+        "template_version": SYSTEM_TEMPLATE_VERSION,
+        "templates": SYSTEM_FILE_TEMPLATES,
+        "system_type": system_type,
+        "template": template_info,
+        "enhancements": enhancements
+    })
+    await run_io(
+        get_skeleton_pool().clone,
+        key,
+        lambda: _render_system_files(system_type, template_info, enhancements),
+        system_dir
+    )
+    return {str(system_dir / name): purpose for name, purpose in SYSTEM_FILES.items()}
+
+def _render_system_files(system_type: SystemType, template_info: Dict[str, Any], enhancements: List[str]) -> Dict[str, str]:
+    """Render the content of each file in SYSTEM_FILES from SYSTEM_FILE_TEMPLATES"""
     
-    return files
+    capabilities = template_info.get('base_capabilities', [])
+    return render_templates(SYSTEM_FILE_TEMPLATES, {
+        "system_type": system_type.value,
+        "capabilities": capabilities,
+        "enhancements": enhancements,
+        "config": {
+            "system": {
+                "name": system_type.value.replace('_', ' ').title() + " System",
+                "version": "1.0.0",
+                "debug": False
+            },
+            "enhancements": enhancements,
+            "capabilities": capabilities
+        }
+    })
 
 async def _get_available_templates() -> List[AvailableTemplate]:
     """Get list of available automation templates"""
@@ -672,7 +863,7 @@ async def _build_from_template(template: Dict[str, Any], customizations: Dict[st
     
     # Use the template's predefined structure
     system_dir = Path(f"automation-systems/{template_info.name}_system")
-    system_dir.mkdir(parents=True, exist_ok=True)
+    await run_io(system_dir.mkdir, parents=True, exist_ok=True)
     
     # Apply customizations to base capabilities
     capabilities = template["base_capabilities"].copy()
@@ -784,7 +975,7 @@ async def _generate_template_from_build(build_result: Dict[str, Any], automation
     
     # Create template in the templates directory
     template_dir = Path("automation-systems/automation-framework/templates")
-    template_dir.mkdir(parents=True, exist_ok=True)
+    await run_io(template_dir.mkdir, parents=True, exist_ok=True)
     
     template_content = {
         "name": template_name,
@@ -799,16 +990,19 @@ async def _generate_template_from_build(build_result: Dict[str, Any], automation
     }
     
     template_file = template_dir / f"{template_name}.json"
-    template_file.write_text(json.dumps(template_content, indent=2))
+    await run_io(write_if_changed, template_file, json.dumps(template_content, indent=2))
     
     return template_name
 
 async def _analyze_system_performance(focus_area: str = None) -> Dict[str, Any]:
     """Analyze current system performance"""
     
+    cache = get_build_cache().summary()
+    
     return {
         "health": "Excellent",
         "metrics": {
+            "build_cache": f"{cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.0%} hit rate), {cache['entries']} cached builds",
             "build_success_rate": "95%+",
             "average_build_time": "10.5 minutes", 
             "user_satisfaction": "4.8/5",
@@ -51,6 +51,11 @@ class AutomationBuilderInput(BaseModel):
         description="Additional context about workspace files, APIs, or existing systems that should influence the build"
     )
     
+    workspace_manifest: Optional[str] = Field(
+        None,
+        description="Listing of the client's workspace to detect files from instead of the server's working directory, for remote servers (same format as analyze_workspace's manifest)"
+    )
+    
     custom_requirements: Optional[List[str]] = Field(
         None,
         description="Specific requirements or constraints for the automation system"
@@ -130,6 +135,49 @@ class AutomationBuilderOutput(BaseModel):
         None,
         description="If this build was successful enough to generate a reusable template, the template name"
     )
+    
+    phase_timings_ms: Dict[str, float] = Field(
+        default={},
+        description="Time spent in each build phase in milliseconds, plus the total. Independent phases overlap, so they can add up to more than the total"
+    )
+    
+    cache_hit: bool = Field(
+        False,
+        description="True when an identical earlier build was returned without writing any files"
+    )
+
+# Batch build models
+class AutomationBatchInput(BaseModel):
+    """Input for building several automation systems in one call"""
+    
+    builds: List[AutomationBuilderInput] = Field(
+        ...,
+        min_length=1,
+        description="Automation systems to build, e.g. one per team member being onboarded"
+    )
+    
+    max_concurrency: int = Field(
+        4,
+        ge=1,
+        le=64,
+        description="Most builds to run at the same time"
+    )
+
+class AutomationBatchItem(BaseModel):
+    """Result of one build in a batch"""
+    position: int = Field(..., description="Index of this build in the input list")
+    automation_goal: str = Field(..., description="Goal of this build")
+    output: Optional[AutomationBuilderOutput] = Field(None, description="Build result, unless it failed")
+    error: Optional[str] = Field(None, description="Why the build failed")
+    elapsed_ms: float = Field(..., description="Time spent on this build")
+
+class AutomationBatchOutput(BaseModel):
+    """Output from a batch of builds"""
+    results: List[AutomationBatchItem] = Field(..., description="Per-build results, in completion order")
+    builds_succeeded: int = Field(..., description="Builds that completed")
+    builds_failed: int = Field(..., description="Builds that failed")
+    workspace_scans: int = Field(..., description="Workspace scans run for the whole batch (one per distinct workspace_manifest)")
+    elapsed_ms: float = Field(..., description="Wall-clock time for the whole batch")
 
 # Template-specific models
 class TemplateBuilderInput(BaseModel):
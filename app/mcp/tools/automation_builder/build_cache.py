@@ -0,0 +1,99 @@
+# app/mcp/tools/automation_builder/build_cache.py
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Builds kept for reuse, least recently used dropped first
+MAX_CACHED_BUILDS = 64
+
+def build_cache_key(inputs: Dict[str, Any], template: Dict[str, Any], template_version: str, enhancements: Dict[str, Any]) -> str:
+    """
+    Content hash identifying a build.
+
+    inputs are the resolved build inputs (goal, system type, build mode,
+    requirements and so on). Every mapping is serialized with sorted keys
+    and enums by value, so requests that only differ in key order or in
+    leaving a setting to be auto-detected as what was chosen share a key.
+    """
+
+    payload = {
+        "inputs": inputs,
+        "template": template,
+        "template_version": template_version,
+        "enhancements": enhancements
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write a file unless it already holds exactly this content; returns whether it was written"""
+
+    data = content.encode()
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+class BuildCache:
+    """
+    Completed builds keyed by build_cache_key.
+
+    A cached build is only served while every file it created still
+    exists, so deleting a generated system forces a rebuild. Entries are
+    evicted least recently used first. Returned outputs are shared between
+    callers and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_BUILDS):
+        self._max_entries = max_entries
+        self._builds: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached output for key, or None (counted as a miss) if there is none or its files are gone"""
+
+        with self._lock:
+            output = self._builds.get(key)
+        # Checking the files stats the disk, so it runs outside the lock
+        if output is not None and not all(Path(path).exists() for path in output.file_locations):
+            output = None
+        with self._lock:
+            if output is None:
+                self._builds.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            if key in self._builds:
+                self._builds.move_to_end(key)
+            self.stats["hits"] += 1
+            return output
+
+    def put(self, key: str, output: Any) -> None:
+        with self._lock:
+            self._builds[key] = output
+            self._builds.move_to_end(key)
+            while len(self._builds) > self._max_entries:
+                self._builds.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._builds),
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0
+            }
+
+_cache = BuildCache()
+
+def get_build_cache() -> BuildCache:
+    """Return the process-wide build cache"""
+
+    return _cache
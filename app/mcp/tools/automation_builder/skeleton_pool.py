@@ -0,0 +1,163 @@
+# app/mcp/tools/automation_builder/skeleton_pool.py
+import os
+import json
+import errno
+import shutil
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional
+
+from .build_cache import write_if_changed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Where prebuilt skeletons live (one directory per system profile)
+SKELETON_DIR = Path(os.getenv(
+    "AUTOMATION_SKELETON_DIR",
+    str(Path.home() / ".cache" / "cursor-automation-builder" / "skeletons")
+))
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, XFS, overlayfs on those)
+_FICLONE = 0x40049409
+
+def skeleton_key(profile: Dict[str, Any]) -> str:
+    """Identify a skeleton by everything its files are rendered from"""
+
+    encoded = json.dumps(profile, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:24]
+
+def clone_file(source: Path, target: Path) -> None:
+    """
+    Copy a file, sharing its blocks copy-on-write where the filesystem can.
+
+    Falls back to a plain copy. Hard links are never used: a generated
+    system is meant to be edited, and an edit through a hard link would
+    also change the skeleton and every other system cloned from it.
+    """
+
+    if fcntl is not None:
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                raise
+    shutil.copyfile(source, target)
+
+def _same_content(source: Path, target: Path) -> bool:
+    try:
+        if source.stat().st_size != target.stat().st_size:
+            return False
+        return source.read_bytes() == target.read_bytes()
+    except OSError:
+        return False
+
+class SkeletonPool:
+    """
+    Prebuilt copies of the files generated for each system profile.
+
+    A profile is everything the generated files depend on (system type,
+    template, enhancements, template version and the template sources). The first build of a
+    profile renders its files once into a skeleton directory; every later
+    build clones them instead of rendering and writing them again, so a
+    build costs a clone per file whatever the files contain. Skeletons
+    persist across restarts. If the skeleton directory cannot be written,
+    files are rendered straight into each system instead.
+    """
+
+    def __init__(self, root: Path = SKELETON_DIR):
+        self.root = root
+        self._ready: Dict[str, Path] = {}
+        # Profiles being rendered, each with the lock its builders wait on
+        self._building: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"skeletons_built": 0, "clones": 0, "unchanged": 0}
+
+    def skeleton(self, key: str, render: Callable[[], Dict[str, str]]) -> Optional[Path]:
+        """Return the skeleton directory for a profile, rendering it on first use, or None if it cannot be stored"""
+
+        with self._lock:
+            ready = self._ready.get(key)
+            if ready is not None:
+                return ready
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        # Rendering and writing hold only this profile's lock, so other profiles build alongside
+        with key_lock:
+            with self._lock:
+                ready = self._ready.get(key)
+            if ready is not None:
+                return ready
+            skeleton_dir = self.root / key
+            built = False
+            try:
+                if not skeleton_dir.is_dir():
+                    # Rendered into a temporary directory and renamed, so a skeleton is complete or absent
+                    files = render()
+                    self.root.mkdir(parents=True, exist_ok=True)
+                    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}.", suffix=".tmp", dir=self.root))
+                    try:
+                        for name, content in files.items():
+                            (tmp_dir / name).write_bytes(content.encode())
+                        os.rename(tmp_dir, skeleton_dir)
+                        built = True
+                    except OSError:
+                        # Out of space, or another process stored the same skeleton first
+                        shutil.rmtree(tmp_dir, ignore_errors=True)
+                        if not skeleton_dir.is_dir():
+                            raise
+            except OSError:
+                skeleton_dir = None
+            with self._lock:
+                self._building.pop(key, None)
+                if skeleton_dir is not None:
+                    self._ready[key] = skeleton_dir
+                if built:
+                    self.stats["skeletons_built"] += 1
+            return skeleton_dir
+
+    def clone(self, key: str, render: Callable[[], Dict[str, str]], target_dir: Path) -> Dict[str, bool]:
+        """
+        Materialize a profile's files in target_dir.
+
+        Files that already hold the skeleton's content are left untouched.
+        Returns whether each file was written, by file name.
+        """
+
+        sources: Optional[List[Path]] = None
+        skeleton_dir = self.skeleton(key, render)
+        if skeleton_dir is not None:
+            try:
+                sources = sorted(skeleton_dir.iterdir())
+            except OSError:
+                # Removed behind our back; rebuilt on the next call
+                with self._lock:
+                    self._ready.pop(key, None)
+        if sources is None:
+            return {name: write_if_changed(target_dir / name, content) for name, content in render().items()}
+
+        written = {}
+        for source in sources:
+            target = target_dir / source.name
+            if _same_content(source, target):
+                written[source.name] = False
+                continue
+            clone_file(source, target)
+            written[source.name] = True
+        with self._lock:
+            self.stats["clones"] += sum(written.values())
+            self.stats["unchanged"] += len(written) - sum(written.values())
+        return written
+
+_pool = SkeletonPool()
+
+def get_skeleton_pool() -> SkeletonPool:
+    """Return the process-wide skeleton pool"""
+
+    return _pool
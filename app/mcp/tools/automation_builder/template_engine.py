@@ -0,0 +1,110 @@
+# app/mcp/tools/automation_builder/template_engine.py
+import re
+import ast
+import json
+from functools import lru_cache
+from typing import Dict, List, Any, Callable, Tuple
+
+# {{ name|filter|filter }} substitutes a value; {% if ... %} / {% else %} / {% endif %} are blocks
+_TOKEN = re.compile(r"\{\{(.*?)\}\}|\{%(.*?)%\}", re.S)
+_IF = re.compile(r"if\s+(?:(not)\s+)?(?:(.+?)\s+in\s+)?([A-Za-z_]\w*)$")
+
+def _each(transform: Callable[[str], str]) -> Callable[[Any], Any]:
+    # String filters also apply item by item to lists
+    return lambda value: [transform(str(item)) for item in value] if isinstance(value, (list, tuple)) else transform(str(value))
+
+FILTERS: Dict[str, Callable[[Any], Any]] = {
+    "human": _each(lambda text: text.replace("_", " ")),
+    "title": _each(str.title),
+    "bullets": lambda items: "\n".join("- " + str(item) for item in items),
+    "lines": lambda items: "\n".join(str(item) for item in items),
+    "json": lambda value: json.dumps(value, indent=2)
+}
+
+def _value(expression: str) -> str:
+    name, *filters = [part.strip() for part in expression.split("|")]
+    if not name.isidentifier():
+        raise ValueError(f"Invalid template variable '{name}'")
+    code = f"context[{name!r}]"
+    for filter_name in filters:
+        if filter_name not in FILTERS:
+            raise ValueError(f"Unknown template filter '{filter_name}'")
+        code = f"filters[{filter_name!r}]({code})"
+    return code
+
+def _condition(tag: str) -> str:
+    match = _IF.match(tag)
+    if match is None:
+        raise ValueError(f"Invalid template condition '{tag}'")
+    negate, literal, name = match.groups()
+    if literal is not None:
+        try:
+            code = f"({ast.literal_eval(literal)!r} in context[{name!r}])"
+        except (ValueError, SyntaxError):
+            raise ValueError(f"Invalid template literal '{literal}'") from None
+    else:
+        code = f"context[{name!r}]"
+    return f"not {code}" if negate else code
+
+def _compile_body(source: str, lines: List[str], depth: int) -> None:
+    """Append the statements rendering one template into out"""
+
+    # Open if blocks: (tag, whether its else was seen)
+    blocks: List[Tuple[str, bool]] = []
+    position = 0
+    for match in _TOKEN.finditer(source):
+        indent = "    " * (depth + len(blocks))
+        if match.start() > position:
+            lines.append(f"{indent}append({source[position:match.start()]!r})")
+        position = match.end()
+        if match.group(1) is not None:
+            lines.append(f"{indent}append(str({_value(match.group(1).strip())}))")
+            continue
+        tag = match.group(2).strip()
+        if tag.startswith("if "):
+            lines.append(f"{indent}if {_condition(tag)}:")
+            lines.append(f"{indent}    pass")
+            blocks.append((tag, False))
+        elif tag == "else" and blocks and not blocks[-1][1]:
+            blocks[-1] = (blocks[-1][0], True)
+            lines.append(f"{'    ' * (depth + len(blocks) - 1)}else:")
+            lines.append(f"{indent}pass")
+        elif tag == "endif" and blocks:
+            blocks.pop()
+        else:
+            raise ValueError(f"Unexpected template tag '{tag}'")
+    if blocks:
+        raise ValueError(f"Unclosed template block '{blocks[-1][0]}'")
+    if position < len(source):
+        lines.append(f"{'    ' * depth}append({source[position:]!r})")
+
+@lru_cache(maxsize=256)
+def compile_templates(files: Tuple[Tuple[str, str], ...]) -> Callable[[Dict[str, Any]], Dict[str, str]]:
+    """
+    Compile a set of file templates into one render function.
+
+    files holds (file name, template source) pairs. The templates become a
+    single generated Python function that takes the context and returns
+    the rendered content of every file by name, so rendering a system is
+    one call of straight-line appends. Compiled functions are cached by
+    their sources, so each set is compiled once per process.
+
+    Raises ValueError for malformed templates.
+    """
+
+    lines = ["def render(context):", "    rendered = {}"]
+    for name, source in files:
+        lines.append("    out = []")
+        lines.append("    append = out.append")
+        _compile_body(source, lines, 1)
+        lines.append(f"    rendered[{name!r}] = ''.join(out)")
+    lines.append("    return rendered")
+
+    namespace: Dict[str, Any] = {"filters": FILTERS}
+    exec(compile("\n".join(lines), "<templates>", "exec"), namespace)
+    return namespace["render"]
+
+def render_templates(files: Dict[str, str], context: Dict[str, Any]) -> Dict[str, str]:
+    """Render every template in files (file name to source) with the context, compiling them on first use"""
+
+    return compile_templates(tuple(files.items()))(context)
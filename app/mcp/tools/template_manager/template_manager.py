@@ -5,6 +5,7 @@ from typing import Dict, List, Any, Optional
 import time
 
 from app.mcp.server import mcp
+from app.mcp.io_executor import run_io
 from pydantic import BaseModel, Field
 
 class TemplateInfo(BaseModel):
@@ -298,15 +299,9 @@ async def _load_custom_templates() -> List[TemplateInfo]:
     templates = []
     templates_dir = Path("automation-systems/automation-framework/templates")
     
-    if not templates_dir.exists():
-        return templates
-    
-    # Look for custom template files
-    for template_file in templates_dir.glob("*.json"):
+    # Directory listing and JSON parsing run on the I/O executor, off the event loop
+    for template_data in await run_io(_read_template_files, templates_dir):
         try:
-            with open(template_file, 'r') as f:
-                template_data = json.load(f)
-                
             # Convert to TemplateInfo if it has the required fields
             if all(key in template_data for key in ["name", "display_name", "description"]):
                 # Fill in missing fields with defaults
@@ -325,12 +320,44 @@ async def _load_custom_templates() -> List[TemplateInfo]:
                 
                 templates.append(TemplateInfo(**template_info))
                 
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (KeyError, TypeError) as e:
             # Skip invalid template files
             continue
     
     return templates
 
+def _read_template_files(templates_dir: Path) -> List[Dict[str, Any]]:
+    """Parse every JSON template file in a directory, skipping unreadable or invalid ones"""
+    
+    if not templates_dir.exists():
+        return []
+    
+    templates = []
+    for template_file in templates_dir.glob("*.json"):
+        try:
+            with open(template_file, 'r') as f:
+                template_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(template_data, dict):
+            templates.append(template_data)
+    return templates
+
+def _write_template_file(template_file: Path, template_metadata: Dict[str, Any]) -> None:
+    """Create the templates directory if needed and save a template's metadata"""
+    
+    template_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(template_file, 'w') as f:
+        json.dump(template_metadata, f, indent=2)
+
+def _read_template_file(template_file: Path) -> Optional[Dict[str, Any]]:
+    """Load one template file, or None if it does not exist"""
+    
+    if not template_file.exists():
+        return None
+    with open(template_file, 'r') as f:
+        return json.load(f)
+
 def _apply_template_filters(templates: List[TemplateInfo], category: Optional[str], complexity: Optional[str]) -> List[TemplateInfo]:
     """Apply filters to template list"""
     
@@ -614,9 +641,7 @@ async def _template_exists(template_name: str) -> bool:
 async def _create_template(input_data: TemplateCreationInput) -> Dict[str, Any]:
     """Create a new custom template"""
     
-    # Create template directory
     templates_dir = Path("automation-systems/automation-framework/templates")
-    templates_dir.mkdir(parents=True, exist_ok=True)
     
     # Create template metadata
     template_metadata = {
@@ -637,10 +662,9 @@ async def _create_template(input_data: TemplateCreationInput) -> Dict[str, Any]:
         "template_version": "1.0.0"
     }
     
-    # Save template metadata
+    # Save template metadata (creating the template directory if needed)
     template_file = templates_dir / f"{input_data.template_name}.json"
-    with open(template_file, 'w') as f:
-        json.dump(template_metadata, f, indent=2)
+    await run_io(_write_template_file, template_file, template_metadata)
     
     return {
         "success": True,
@@ -653,16 +677,13 @@ async def _validate_template(template_name: str) -> List[str]:
     
     validation_results = []
     
-    # Check if template file exists
-    template_file = Path(f"automation-systems/automation-framework/templates/{template_name}.json")
-    if not template_file.exists():
-        validation_results.append("❌ Template file not found")
-        return validation_results
-    
     # Load and validate template structure
+    template_file = Path(f"automation-systems/automation-framework/templates/{template_name}.json")
     try:
-        with open(template_file, 'r') as f:
-            template_data = json.load(f)
+        template_data = await run_io(_read_template_file, template_file)
+        if template_data is None:
+            validation_results.append("❌ Template file not found")
+            return validation_results
         
         required_fields = ["name", "display_name", "description", "category", "capabilities"]
         missing_fields = [field for field in required_fields if field not in template_data]
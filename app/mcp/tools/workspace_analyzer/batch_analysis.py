@@ -0,0 +1,122 @@
+# app/mcp/tools/workspace_analyzer/batch_analysis.py
+import os
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
+
+# Upper bound on worker processes, whatever the core count
+MAX_BATCH_WORKERS = 32
+
+# Worker processes are spawned rather than forked: the parent runs an event
+# loop and watcher threads whose locks a forked child could inherit held
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+def batch_worker_count(roots: int, requested: int = 0) -> int:
+    """Worker processes for a batch: one per CPU core unless requested, never more than roots"""
+
+    workers = requested or os.cpu_count() or 1
+    return max(1, min(workers, roots, MAX_BATCH_WORKERS))
+
+async def _analyze_root_async(input_data) -> Tuple[Optional[Any], Optional[str], float]:
+    # Imported here so workspace_analyzer can import this module
+    from .workspace_analyzer import analyze_workspace
+
+    started = time.monotonic()
+    try:
+        output = await analyze_workspace(input_data)
+    except Exception as e:
+        return None, str(e) or type(e).__name__, time.monotonic() - started
+    return output, None, time.monotonic() - started
+
+def _analyze_root(input_data) -> Tuple[Optional[Any], Optional[str], float]:
+    """Run one analysis in a worker process and return (output, error, elapsed seconds)"""
+
+    return asyncio.run(_analyze_root_async(input_data))
+
+async def iter_workspace_analyses(
+    inputs: List[Any],
+    workers: int = 0
+) -> AsyncIterator[Tuple[int, Optional[Any], Optional[str], float]]:
+    """
+    Analyze several workspaces in parallel, yielding each as it completes.
+
+    Yields (position in inputs, WorkspaceAnalysisOutput or None, error
+    message or None, elapsed seconds) in completion order. Each root runs
+    in its own worker process, so classification and aggregation use every
+    core instead of sharing one interpreter. A root that fails is reported
+    with its error and does not stop the others. With a single worker the
+    roots are analyzed in this process, one after another.
+    """
+
+    workers = batch_worker_count(len(inputs), workers)
+    if workers == 1:
+        for position, input_data in enumerate(inputs):
+            yield (position, *await _analyze_root_async(input_data))
+        return
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as pool:
+        pending: Dict[asyncio.Future, int] = {
+            loop.run_in_executor(pool, _analyze_root, input_data): position
+            for position, input_data in enumerate(inputs)
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    position = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker itself died or the result could not be sent back
+                        result = (None, str(e) or type(e).__name__, 0.0)
+                    yield (position, *result)
+        finally:
+            # A consumer that stops early should not wait for roots nobody will read
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def rollup_analyses(outputs: List[Any]) -> Dict[str, Any]:
+    """
+    Combine the outputs of several analyses into one summary.
+
+    Pattern counts and sizes are summed across roots; integrations and
+    suggestions are counted by the number of roots they appear in.
+    """
+
+    patterns: Dict[str, Dict[str, Any]] = {}
+    integrations: Dict[str, int] = {}
+    suggestions: Dict[str, int] = {}
+    health: Dict[str, int] = {}
+    total_files = 0
+    for output in outputs:
+        total_files += output.total_files_analyzed
+        for pattern in output.file_patterns:
+            totals = patterns.setdefault(pattern.pattern_type, {"file_count": 0, "total_size_mb": 0.0, "roots": 0})
+            totals["file_count"] += pattern.file_count
+            totals["total_size_mb"] += pattern.total_size_mb
+            totals["roots"] += 1
+        for integration in output.integration_opportunities:
+            integrations[integration] = integrations.get(integration, 0) + 1
+        for suggestion in {suggestion.automation_type for suggestion in output.automation_suggestions}:
+            suggestions[suggestion] = suggestions.get(suggestion, 0) + 1
+        # "Good (Multiple automation opportunities identified)" counts as "Good"
+        grade = output.workspace_health_score.split(" ", 1)[0]
+        health[grade] = health.get(grade, 0) + 1
+
+    for totals in patterns.values():
+        totals["total_size_mb"] = round(totals["total_size_mb"], 2)
+
+    def by_count(counts: Dict[str, int]) -> Dict[str, int]:
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    return {
+        "total_files_analyzed": total_files,
+        "file_patterns": dict(sorted(patterns.items(), key=lambda item: -item[1]["file_count"])),
+        "integration_opportunities": by_count(integrations),
+        "automation_suggestions": by_count(suggestions),
+        "health_scores": by_count(health)
+    }
@@ -0,0 +1,283 @@
+# app/mcp/tools/workspace_analyzer/client_manifest.py
+import os
+import re
+import gzip
+import time
+import zlib
+import base64
+import binascii
+import threading
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from .scanner import (
+    EntryClassifier, DEFAULT_CLASSIFIER, IGNORE_NAMES, MAX_FILE_SIZE, DEFAULT_EXAMPLE_LIMIT,
+    group_aggregators, new_walk_report
+)
+
+# Base64 characters decoded per step (a multiple of 4, so steps never split a quantum)
+DECODE_CHUNK = 256 * 1024
+
+# Decompressed bytes produced per step, bounding the decoder's buffers whatever the compression ratio
+INFLATE_CHUNK = 1024 * 1024
+
+# Limits on one manifest; entries past them are not read and the result is extrapolated
+MAX_MANIFEST_ENTRIES = 10_000_000
+MAX_MANIFEST_BYTES = 2 * 1024 * 1024 * 1024
+
+# Longest accepted manifest line
+MAX_LINE_BYTES = 16 * 1024
+
+# Entries classified between deadline checks
+DEADLINE_CHECK_INTERVAL = 4096
+
+_WHITESPACE = re.compile(r"\s+")
+
+class ManifestReader:
+    """
+    Stream the entries of a client-supplied workspace manifest.
+
+    A manifest is base64 text of a gzip- or zlib-compressed UTF-8 listing
+    with one file per line: size, mtime (Unix seconds, fractions allowed)
+    and the path relative to the workspace root, separated by tabs. Paths
+    use "/" (or "\\") separators. Blank lines and lines starting with "#"
+    are skipped; malformed lines (including non-finite mtimes) and paths
+    leaving the root are counted in rejected_lines.
+
+    The text is decoded DECODE_CHUNK characters and inflated INFLATE_CHUNK
+    bytes at a time, so apart from the upload itself memory stays constant
+    however many entries the manifest holds. Reading stops after
+    max_entries entries or max_bytes decompressed bytes (truncated).
+    """
+
+    def __init__(self, data: str, max_entries: int = MAX_MANIFEST_ENTRIES, max_bytes: int = MAX_MANIFEST_BYTES):
+        self.data = data
+        self.entries = 0
+        self.rejected_lines = 0
+        self.bytes_inflated = 0
+        # Decompressed bytes of the lines handed out so far
+        self.bytes_parsed = 0
+        self.truncated = False
+        # Base64 characters decoded so far
+        self.consumed = 0
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+    def progress(self) -> float:
+        """Share of the manifest parsed so far, assuming an even compression ratio"""
+
+        if not self.data or not self.bytes_inflated:
+            return 1.0
+        return self.consumed / len(self.data) * min(1.0, self.bytes_parsed / self.bytes_inflated)
+
+    def __iter__(self) -> Iterator[Tuple[str, int, int]]:
+        """Yield (relative path, size, mtime_ns) per entry"""
+
+        for line in self._lines():
+            self.bytes_parsed += len(line) + 1
+            if not line or line[0] == 0x23:
+                continue
+            if line[-1] == 0x0D:
+                line = line[:-1]
+            try:
+                size, mtime, path = line.split(b"\t", 2)
+                size = int(size)
+                mtime_ns = int(float(mtime) * 1_000_000_000)
+                path = path.decode("utf-8")
+            except (ValueError, OverflowError):
+                # OverflowError: an infinite or out-of-range mtime ("inf", "1e400"); NaN raises ValueError
+                self.rejected_lines += 1
+                continue
+            if "\\" in path:
+                path = path.replace("\\", "/")
+            path = path.lstrip("/")
+            while path.startswith("./"):
+                path = path[2:].lstrip("/")
+            if not path or size < 0 or (".." in path and ".." in path.split("/")):
+                self.rejected_lines += 1
+                continue
+
+            if self.entries >= self._max_entries:
+                self.truncated = True
+                return
+            self.entries += 1
+            yield path, size, mtime_ns
+
+    def _lines(self) -> Iterator[bytes]:
+        partial = b""
+        for block in self._blocks():
+            if partial:
+                block = partial + block
+            lines = block.split(b"\n")
+            partial = lines.pop()
+            if len(partial) > MAX_LINE_BYTES:
+                raise ValueError(f"Manifest line exceeds {MAX_LINE_BYTES} bytes")
+            yield from lines
+            if self.truncated:
+                return
+        if partial:
+            yield partial
+
+    def _blocks(self) -> Iterator[bytes]:
+        data = self.data
+        # wbits + 32 detects gzip and zlib headers automatically
+        inflater = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        carry = ""
+        for start in range(0, len(data), DECODE_CHUNK):
+            piece = carry + data[start:start + DECODE_CHUNK]
+            if _WHITESPACE.search(piece):
+                piece = _WHITESPACE.sub("", piece)
+            usable = len(piece) - len(piece) % 4
+            carry = piece[usable:]
+            try:
+                compressed = base64.b64decode(piece[:usable], validate=True)
+            except binascii.Error as e:
+                raise ValueError(f"Manifest is not valid base64: {e}") from e
+
+            fed = len(compressed)
+            while compressed and not inflater.eof:
+                try:
+                    block = inflater.decompress(compressed, INFLATE_CHUNK)
+                except zlib.error as e:
+                    raise ValueError(f"Manifest is not gzip or zlib compressed: {e}") from e
+                compressed = inflater.unconsumed_tail
+                # Compressed input taken so far, in base64 characters, for extrapolating a partial read
+                self.consumed = min(start + (fed - len(compressed)) * 4 // 3, len(data))
+                if not block:
+                    continue
+                self.bytes_inflated += len(block)
+                if self.bytes_inflated > self._max_bytes:
+                    self.truncated = True
+                    return
+                yield block
+            if inflater.eof:
+                return
+
+        if carry:
+            raise ValueError("Manifest base64 text is truncated")
+        if not inflater.eof:
+            raise ValueError("Manifest compressed stream is incomplete")
+
+def encode_manifest(entries: Iterable[Tuple[str, int, float]]) -> str:
+    """Build a manifest from (relative path, size, mtime in seconds) entries, as a client would"""
+
+    lines = "".join(f"{size}\t{mtime}\t{path}\n" for path, size, mtime in entries)
+    return base64.b64encode(gzip.compress(lines.encode("utf-8"))).decode("ascii")
+
+def scan_manifest(
+    data: str,
+    classifier: EntryClassifier = DEFAULT_CLASSIFIER,
+    max_depth: Optional[int] = None,
+    deadline: Optional[float] = None,
+    example_limit: int = DEFAULT_EXAMPLE_LIMIT,
+    example_order: str = "hot",
+    path_limit: int = 0,
+    collectors: Optional[List[Tuple[List[str], Any]]] = None,
+    max_entries: int = MAX_MANIFEST_ENTRIES,
+    cancel: Optional[threading.Event] = None
+) -> Dict[str, Any]:
+    """
+    Classify a client-supplied manifest exactly as scan_workspace classifies a tree, without touching the disk.
+
+    Entries stream through the same classifier, group aggregators and
+    collectors, one pass and constant memory. Names in IGNORE_NAMES and
+    everything below such directories are dropped, files over
+    MAX_FILE_SIZE are not classified, and files deeper than max_depth are
+    counted as depth-limited; ignore files are the client's to apply when
+    building the manifest. Work done once per directory (ignore, depth and
+    integration checks) runs whenever the directory differs from the
+    previous entry's, so manifests grouped by directory, as any walk
+    produces them, are cheapest and their directories_scanned is exact.
+
+    When the deadline, cancel or the entry and size limits stop the read
+    early, counts are extrapolated by the share of the manifest that was
+    read.
+    The result has the shape of scan_workspace's; scan_stats["manifest"]
+    describes the decoding.
+    """
+
+    aggregators, group_bits = group_aggregators(classifier, example_limit, example_order, path_limit, collectors)
+    reader = ManifestReader(data, max_entries=max_entries)
+    report = new_walk_report()
+    group_mask = classifier.group_mask
+    integration_mask = classifier.integration_mask
+    all_integrations = (1 << len(classifier.integration_names)) - 1
+    integrations = 0
+    ignored = depth_limited = oversized = 0
+
+    last_dir = None
+    dir_state = None
+    os_dir = ""
+    for position, (path, size, mtime_ns) in enumerate(reader):
+        if not position % DEADLINE_CHECK_INTERVAL:
+            if cancel is not None and cancel.is_set():
+                report["cancelled"] = report["timed_out"] = True
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                report["timed_out"] = True
+                break
+
+        rel_dir, _, name = path.rpartition("/")
+        if rel_dir != last_dir:
+            last_dir = rel_dir
+            parts = rel_dir.split("/") if rel_dir else []
+            if any(part in IGNORE_NAMES for part in parts):
+                dir_state = "ignored"
+            elif max_depth is not None and len(parts) > max_depth:
+                dir_state = "depth_limited"
+                # A walk still sees the names of the first directories below the depth limit
+                parts = parts[:max_depth + 1]
+            else:
+                dir_state = None
+                report["directories_scanned"] += 1
+                os_dir = rel_dir if os.sep == "/" else rel_dir.replace("/", os.sep)
+            if dir_state != "ignored" and integrations != all_integrations:
+                for part in parts:
+                    integrations |= integration_mask(part)
+
+        if dir_state is not None:
+            if dir_state == "ignored":
+                ignored += 1
+            else:
+                depth_limited += 1
+            continue
+        if name in IGNORE_NAMES:
+            ignored += 1
+            continue
+        if integrations != all_integrations:
+            integrations |= integration_mask(name)
+        if size > MAX_FILE_SIZE:
+            oversized += 1
+            continue
+        mask = group_mask(name)
+        if not mask:
+            continue
+
+        file_record = [name, size, mtime_ns, mask]
+        for bit, aggregator in group_bits:
+            if mask & bit:
+                aggregator.add(os_dir, file_record, 1)
+
+    factor = 1.0
+    if (report["timed_out"] or reader.truncated) and reader.progress() > 0:
+        factor = 1 / reader.progress()
+    groups = {name: aggregator.result(factor) for name, aggregator in aggregators.items()}
+    report["extrapolation_factor"] = round(factor, 3)
+    for key in [key for key in report if key.startswith("_")]:
+        del report[key]
+    report["source"] = "manifest"
+    report["manifest"] = {
+        "entries": reader.entries,
+        "rejected_lines": reader.rejected_lines,
+        "ignored_entries": ignored,
+        "depth_limited_entries": depth_limited,
+        "oversized_entries": oversized,
+        "compressed_bytes": len(data) * 3 // 4,
+        "decompressed_bytes": reader.bytes_inflated,
+        "truncated": reader.truncated
+    }
+
+    return {
+        "groups": groups,
+        "integrations": classifier.integrations_in(integrations),
+        "scan_stats": report
+    }
@@ -0,0 +1,207 @@
+# app/mcp/tools/workspace_analyzer/code_stats.py
+import os
+import re
+import time
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from .scanner import FILE_NAME, FILE_SIZE
+
+# Languages of the script extensions the scanner classifies
+LANGUAGES = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".sh": "Shell",
+    ".bat": "Batch",
+    ".ps1": "PowerShell"
+}
+
+# Bytes read per system call while counting lines
+READ_CHUNK = 1024 * 1024
+
+# Hard caps for a line counting pass; cached files cost nothing against them
+MAX_COUNT_BYTES = 64 * 1024 * 1024
+MAX_COUNT_SECONDS = 2.0
+MAX_TRACKED_FILES = 100_000
+COUNT_WORKERS = 4
+
+# Largest scripts (by lines) reported per pass
+MAX_LARGEST_FILES = 5
+
+# Line counts of files already read, by (device, inode, mtime_ns, size)
+MAX_CACHE_ENTRIES = 200_000
+
+_BLANK_LINE = re.compile(rb"^[ \t\r\f\v]*\n", re.MULTILINE)
+
+_line_cache: Dict[Tuple[int, int, int, int], Tuple[int, int]] = {}
+_line_cache_lock = threading.Lock()
+
+class LanguageCollector:
+    """
+    Tally script files and bytes per language while a scan streams past.
+
+    Plugs into scan_workspace as an extra collector over the scripts group
+    and remembers each file's path so its lines can be counted afterwards.
+    Stops remembering paths (but keeps tallying) after max_files.
+    """
+
+    __slots__ = ("languages", "paths", "truncated", "_max_files")
+
+    def __init__(self, max_files: int = MAX_TRACKED_FILES):
+        self.languages: Dict[str, List[float]] = {}
+        self.paths: List[Tuple[str, str]] = []
+        self.truncated = False
+        self._max_files = max_files
+
+    def add(self, rel_dir: str, file_record: List[Any], scale: float = 1) -> None:
+        name = file_record[FILE_NAME]
+        language = LANGUAGES.get(os.path.splitext(name)[1].lower())
+        if language is None:
+            return
+        totals = self.languages.get(language)
+        if totals is None:
+            totals = self.languages[language] = [0, 0]
+        totals[0] += scale
+        totals[1] += file_record[FILE_SIZE] * scale
+        if len(self.paths) < self._max_files:
+            self.paths.append((language, os.path.join(rel_dir, name) if rel_dir else name))
+        else:
+            self.truncated = True
+
+def count_lines(path: str) -> Tuple[int, int, int]:
+    """
+    Count the lines and blank (whitespace-only) lines of a file.
+
+    Reads in READ_CHUNK blocks and counts newlines on the raw bytes, so no
+    line is ever decoded or materialized. Returns (lines, blank_lines,
+    bytes_read); a final line without a newline still counts.
+    """
+
+    lines = blank = bytes_read = 0
+    partial = b""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            lines += chunk.count(b"\n")
+            buffer = partial + chunk
+            end = buffer.rfind(b"\n") + 1
+            blank += len(_BLANK_LINE.findall(buffer, 0, end))
+            partial = buffer[end:]
+            # Only whether the unfinished line has content matters, not the content itself
+            if partial.strip():
+                partial = b"x"
+    if partial:
+        lines += 1
+        blank += not partial.strip()
+    return lines, blank, bytes_read
+
+def _cache_key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+
+def _remember(key: Tuple[int, int, int, int], counts: Tuple[int, int]) -> None:
+    with _line_cache_lock:
+        _line_cache[key] = counts
+        # Dicts keep insertion order, so the first keys are the oldest
+        while len(_line_cache) > MAX_CACHE_ENTRIES:
+            del _line_cache[next(iter(_line_cache))]
+
+def _count_file(path: str, key: Tuple[int, int, int, int]) -> Tuple[int, int, int]:
+    lines, blank, bytes_read = count_lines(path)
+    _remember(key, (lines, blank))
+    return lines, blank, bytes_read
+
+def language_stats(
+    root: Path,
+    collector: LanguageCollector,
+    max_total_bytes: int = MAX_COUNT_BYTES,
+    max_seconds: float = MAX_COUNT_SECONDS,
+    workers: int = COUNT_WORKERS
+) -> Dict[str, Any]:
+    """
+    Count files, bytes, lines and blank lines per language.
+
+    File and byte totals come from the scan. Lines are taken from the
+    cache when a file's (device, inode, mtime, size) is unchanged since it
+    was last counted; the remaining files are counted on a thread pool
+    under a byte and time budget. Files not counted within the budget are
+    left out of the line totals (counted_files says how many were).
+    """
+
+    started = time.monotonic()
+    root_str = str(root)
+    languages = {
+        language: {"files": round(files), "bytes": round(size), "lines": 0, "blank_lines": 0, "counted_files": 0}
+        for language, (files, size) in collector.languages.items()
+    }
+    largest: List[Tuple[int, str]] = []
+    truncated = collector.truncated
+    cache_hits = 0
+    bytes_read = 0
+    reserved = 0
+
+    def account(language: str, rel_path: str, lines: int, blank: int) -> None:
+        totals = languages[language]
+        totals["lines"] += lines
+        totals["blank_lines"] += blank
+        totals["counted_files"] += 1
+        # Streaming top-K: the full list of counted files is never sorted
+        if len(largest) < MAX_LARGEST_FILES:
+            heapq.heappush(largest, (lines, rel_path))
+        elif lines > largest[0][0]:
+            heapq.heapreplace(largest, (lines, rel_path))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = []
+        for language, rel_path in collector.paths:
+            path = os.path.join(root_str, rel_path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = _cache_key(st)
+            with _line_cache_lock:
+                cached = _line_cache.get(key)
+            if cached is not None:
+                cache_hits += 1
+                account(language, rel_path, *cached)
+                continue
+            if reserved + st.st_size > max_total_bytes:
+                truncated = True
+                continue
+            reserved += st.st_size
+            futures.append((language, rel_path, executor.submit(_count_file, path, key)))
+
+        for index, (language, rel_path, future) in enumerate(futures):
+            remaining = max_seconds - (time.monotonic() - started)
+            try:
+                lines, blank, read = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                truncated = True
+                for _, _, pending in futures[index:]:
+                    pending.cancel()
+                break
+            except OSError:
+                continue
+            bytes_read += read
+            account(language, rel_path, lines, blank)
+
+    for totals in languages.values():
+        totals["code_lines"] = totals["lines"] - totals["blank_lines"]
+
+    return {
+        "languages": dict(sorted(languages.items(), key=lambda item: -item[1]["lines"])),
+        "largest_files": [rel_path for _, rel_path in sorted(largest, reverse=True)],
+        "stats": {
+            "files_counted": sum(totals["counted_files"] for totals in languages.values()),
+            "cache_hits": cache_hits,
+            "bytes_read": bytes_read,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "truncated": truncated
+        }
+    }
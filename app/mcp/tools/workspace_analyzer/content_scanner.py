@@ -0,0 +1,123 @@
+# app/mcp/tools/workspace_analyzer/content_scanner.py
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Iterable
+
+from .scanner import INTEGRATION_INDICATORS
+
+# Only the head of each file is read; integration hints live in imports and config keys
+MAX_BYTES_PER_FILE = 64 * 1024
+
+# Hard caps for a whole content scan
+MAX_TOTAL_BYTES = 64 * 1024 * 1024
+MAX_SCAN_SECONDS = 2.0
+
+# Files listed per integration type in the output
+MAX_FILES_PER_INTEGRATION = 10
+
+def _trie_pattern(keywords: List[bytes]) -> bytes:
+    """
+    Build a prefix-factored alternation so the regex engine walks a keyword trie.
+
+    Shared prefixes are tested once per position instead of once per keyword,
+    and longer branches are tried first so overlapping keywords match greedily.
+    """
+
+    trie: Dict[int, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for byte in keyword:
+            node = node.setdefault(byte, {})
+        node[-1] = {}
+
+    def build(node: Dict[int, Any]) -> bytes:
+        branches = []
+        terminal = -1 in node
+        for byte in sorted(k for k in node if k != -1):
+            branches.append(re.escape(bytes([byte])) + build(node[byte]))
+        if not branches:
+            return b""
+        body = branches[0] if len(branches) == 1 else b"(?:" + b"|".join(branches) + b")"
+        if terminal:
+            body = b"(?:" + body + b")?"
+        return body
+
+    return build(trie)
+
+class ContentMatcher:
+    """Match every integration indicator in one pass over a byte buffer"""
+
+    def __init__(self, integration_indicators: Dict[str, List[str]] = INTEGRATION_INDICATORS):
+        self.integration_names = list(integration_indicators)
+        self._keyword_types: Dict[bytes, str] = {}
+        for integration_type, indicators in integration_indicators.items():
+            for indicator in indicators:
+                self._keyword_types.setdefault(indicator.lower().encode(), integration_type)
+        self._regex = re.compile(_trie_pattern(list(self._keyword_types)))
+
+    def count(self, data: bytes) -> Dict[str, int]:
+        """Return indicator hit counts per integration type (case-insensitive)"""
+
+        hits: Dict[str, int] = {}
+        for match in self._regex.finditer(data.lower()):
+            integration_type = self._keyword_types[match.group()]
+            hits[integration_type] = hits.get(integration_type, 0) + 1
+        return hits
+
+DEFAULT_MATCHER = ContentMatcher()
+
+def scan_file_contents(
+    root: Path,
+    rel_paths: Iterable[str],
+    matcher: ContentMatcher = DEFAULT_MATCHER,
+    max_bytes_per_file: int = MAX_BYTES_PER_FILE,
+    max_total_bytes: int = MAX_TOTAL_BYTES,
+    max_seconds: float = MAX_SCAN_SECONDS
+) -> Dict[str, Any]:
+    """
+    Detect integrations from file contents.
+
+    Reads at most max_bytes_per_file from the head of each file, exactly
+    once, and matches all indicators together, so cost is linear in bytes
+    read. Stops early once the byte or time budget is spent and reports
+    that the scan was truncated.
+    """
+
+    started = time.monotonic()
+    integrations = {name: {"hit_count": 0, "file_count": 0, "files": []} for name in matcher.integration_names}
+    files_scanned = 0
+    bytes_read = 0
+    truncated = False
+
+    for rel_path in rel_paths:
+        remaining = max_total_bytes - bytes_read
+        if remaining <= 0 or time.monotonic() - started >= max_seconds:
+            truncated = True
+            break
+
+        try:
+            with open(os.path.join(str(root), rel_path), 'rb') as f:
+                data = f.read(min(max_bytes_per_file, remaining))
+        except OSError:
+            continue
+
+        files_scanned += 1
+        bytes_read += len(data)
+        for integration_type, hits in matcher.count(data).items():
+            entry = integrations[integration_type]
+            entry["hit_count"] += hits
+            entry["file_count"] += 1
+            if len(entry["files"]) < MAX_FILES_PER_INTEGRATION:
+                entry["files"].append(rel_path)
+
+    return {
+        "integrations": {name: entry for name, entry in integrations.items() if entry["hit_count"]},
+        "stats": {
+            "files_scanned": files_scanned,
+            "bytes_read": bytes_read,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "truncated": truncated
+        }
+    }
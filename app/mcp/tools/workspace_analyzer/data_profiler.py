@@ -0,0 +1,313 @@
+# app/mcp/tools/workspace_analyzer/data_profiler.py
+import os
+import re
+import csv
+import json
+import mmap
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# Bytes sampled from the start and the end of each file
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 16 * 1024
+
+# Hard caps for a whole profiling pass
+MAX_PROFILE_BYTES = 16 * 1024 * 1024
+MAX_PROFILE_FILES = 50
+MAX_PROFILE_SECONDS = 2.0
+PROFILE_WORKERS = 4
+
+# Formats that can be profiled from samples, by extension
+PROFILE_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".json": "json"}
+
+NULL_VALUES = frozenset(["", "null", "none", "na", "n/a", "nan"])
+
+_INTEGER = re.compile(r"[+-]?\d+")
+_NUMBER = re.compile(r"[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?")
+
+def _text_type(value: str) -> str:
+    """Infer the type of a CSV cell"""
+
+    value = value.strip()
+    if value.lower() in NULL_VALUES:
+        return "null"
+    if _INTEGER.fullmatch(value):
+        return "integer"
+    if _NUMBER.fullmatch(value):
+        return "number"
+    if value.lower() in ("true", "false"):
+        return "boolean"
+    if _DATE.fullmatch(value):
+        return "date"
+    return "string"
+
+def _json_type(value: Any) -> str:
+    """Infer the type of a JSON value"""
+
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "date" if _DATE.fullmatch(value) else "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+def _merge_types(types: Iterable[str]) -> str:
+    seen = set(types) - {"null"}
+    if not seen:
+        return "null"
+    if len(seen) == 1:
+        return seen.pop()
+    if seen == {"integer", "number"}:
+        return "number"
+    return "mixed"
+
+def _columns(names: List[str], samples: Dict[str, List[str]], sampled_rows: int) -> List[Dict[str, Any]]:
+    columns = []
+    for name in names:
+        types = samples.get(name, [])
+        # A key missing from a JSON record counts as null
+        nulls = types.count("null") + (sampled_rows - len(types))
+        columns.append({
+            "name": name,
+            "type": _merge_types(types),
+            "null_ratio": round(nulls / sampled_rows, 3) if sampled_rows else 0.0
+        })
+    return columns
+
+def _complete_lines(head: bytes, tail: bytes, truncated: bool) -> Tuple[bytes, bytes]:
+    """Cut the partial last line off the head and the partial first line off the tail"""
+
+    if truncated:
+        head = head[:head.rfind(b"\n") + 1]
+        tail = tail[tail.find(b"\n") + 1:] if tail else b""
+    return head, tail
+
+def _estimate_rows(size: int, sampled_bytes: int, sampled_rows: int, header_bytes: int, exact: bool) -> Optional[int]:
+    if exact:
+        return sampled_rows
+    if not sampled_rows or not sampled_bytes:
+        return None
+    return int(round((size - header_bytes) / (sampled_bytes / sampled_rows)))
+
+def _profile_csv(head: bytes, tail: bytes, size: int, truncated: bool) -> Optional[Dict[str, Any]]:
+    head, tail = _complete_lines(head, tail, truncated)
+    lines = head.decode("utf-8-sig", errors="replace").splitlines()
+    if not lines:
+        return None
+    header = next(csv.reader([lines[0]]))
+    header_bytes = len(lines[0].encode()) + 1
+
+    rows = [row for row in csv.reader(lines[1:]) if row]
+    if tail:
+        tail_lines = tail.decode("utf-8", errors="replace").splitlines()
+        # Quoted newlines can split a record; rows with the wrong width are skipped
+        rows.extend(row for row in csv.reader(tail_lines) if len(row) == len(header))
+
+    samples: Dict[str, List[str]] = {name: [] for name in header}
+    for row in rows:
+        for name, value in zip(header, row):
+            samples[name].append(_text_type(value))
+
+    return {
+        "columns": _columns(header, samples, len(rows)),
+        "sampled_rows": len(rows),
+        "estimated_rows": _estimate_rows(size, len(head) + len(tail) - header_bytes, len(rows), header_bytes, not truncated)
+    }
+
+def _profile_records(records: List[Any]) -> Tuple[List[str], Dict[str, List[str]]]:
+    names: Dict[str, None] = {}
+    samples: Dict[str, List[str]] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for key, value in record.items():
+            names.setdefault(key, None)
+            samples.setdefault(key, []).append(_json_type(value))
+    return list(names), samples
+
+def _profile_jsonl(head: bytes, tail: bytes, size: int, truncated: bool) -> Optional[Dict[str, Any]]:
+    head, tail = _complete_lines(head, tail, truncated)
+    records = []
+    for line in (head + tail).splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    if not records:
+        return None
+
+    names, samples = _profile_records(records)
+    return {
+        "columns": _columns(names, samples, len(records)),
+        "sampled_rows": len(records),
+        "estimated_rows": _estimate_rows(size, len(head) + len(tail), len(records), 0, not truncated)
+    }
+
+def _profile_json(head: bytes, tail: bytes, size: int, truncated: bool) -> Optional[Dict[str, Any]]:
+    text = head.decode("utf-8-sig", errors="replace")
+    if not truncated:
+        try:
+            document = json.loads(text)
+        except ValueError:
+            return None
+        if isinstance(document, dict):
+            # A single object: describe its top-level keys
+            names, samples = _profile_records([document])
+            return {"columns": _columns(names, samples, 1), "sampled_rows": 1, "estimated_rows": 1}
+        if not isinstance(document, list):
+            return None
+        names, samples = _profile_records(document)
+        return {"columns": _columns(names, samples, len(document)), "sampled_rows": len(document), "estimated_rows": len(document)}
+
+    # Too large to parse whole: decode array elements one by one until the sample runs out
+    start = text.find("[")
+    if start < 0 or text[:start].strip():
+        return None
+    decoder = json.JSONDecoder()
+    records = []
+    position = start + 1
+    while True:
+        while position < len(text) and text[position] in " \t\r\n,":
+            position += 1
+        try:
+            record, end = decoder.raw_decode(text, position)
+        except ValueError:
+            break
+        records.append(record)
+        position = end
+    if not records:
+        return None
+
+    names, samples = _profile_records(records)
+    return {
+        "columns": _columns(names, samples, len(records)),
+        "sampled_rows": len(records),
+        "estimated_rows": _estimate_rows(size, position - start, len(records), start, False)
+    }
+
+_PROFILERS = {"csv": _profile_csv, "jsonl": _profile_jsonl, "json": _profile_json}
+
+def profile_data_file(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Infer the schema of a CSV, JSONL or JSON file from head and tail samples.
+
+    The file is memory-mapped and only HEAD_BYTES from its start and
+    TAIL_BYTES from its end are touched, whatever its size. Returns column
+    names, inferred types and null ratios, the number of rows sampled and
+    an estimated row count (exact when the whole file fit in the sample),
+    or None if the file is empty, unsupported or cannot be profiled.
+    """
+
+    file_format = PROFILE_FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                truncated = size > HEAD_BYTES + TAIL_BYTES
+                if truncated:
+                    head = mapped[:HEAD_BYTES]
+                    tail = mapped[size - TAIL_BYTES:]
+                else:
+                    head = mapped[:]
+                    tail = b""
+    except (OSError, ValueError):
+        return None
+
+    try:
+        profile = _PROFILERS[file_format](head, tail, size, truncated)
+    except Exception:
+        # Any content can turn up here (a deeply nested .json overflows the recursion limit,
+        # for one); a file that cannot be profiled is left out, never fails the analysis
+        return None
+    if profile is None:
+        return None
+    profile.update({
+        "format": file_format,
+        "size_bytes": size,
+        "bytes_sampled": len(head) + len(tail)
+    })
+    return profile
+
+def profile_data_files(
+    root: Path,
+    rel_paths: Iterable[str],
+    max_total_bytes: int = MAX_PROFILE_BYTES,
+    max_files: int = MAX_PROFILE_FILES,
+    max_seconds: float = MAX_PROFILE_SECONDS,
+    workers: int = PROFILE_WORKERS
+) -> Dict[str, Any]:
+    """
+    Profile data files in parallel under a byte, file and time budget.
+
+    Each file's sample size is reserved against max_total_bytes before it
+    is submitted, so the budget holds however the workers interleave. Files
+    still queued when max_seconds runs out are cancelled.
+    """
+
+    started = time.monotonic()
+    root_str = str(root)
+    selected = []
+    reserved = 0
+    truncated = False
+    for rel_path in rel_paths:
+        if os.path.splitext(rel_path)[1].lower() not in PROFILE_FORMATS:
+            continue
+        if len(selected) >= max_files:
+            truncated = True
+            break
+        try:
+            size = os.path.getsize(os.path.join(root_str, rel_path))
+        except OSError:
+            continue
+        cost = min(size, HEAD_BYTES + TAIL_BYTES)
+        if reserved + cost > max_total_bytes:
+            truncated = True
+            break
+        reserved += cost
+        selected.append(rel_path)
+
+    profiles = []
+    bytes_read = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            (rel_path, executor.submit(profile_data_file, os.path.join(root_str, rel_path)))
+            for rel_path in selected
+        ]
+        for rel_path, future in futures:
+            remaining = max_seconds - (time.monotonic() - started)
+            try:
+                profile = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                truncated = True
+                for _, pending in futures:
+                    pending.cancel()
+                break
+            if profile is not None:
+                bytes_read += profile["bytes_sampled"]
+                profiles.append({"path": rel_path, **profile})
+
+    return {
+        "profiles": profiles,
+        "stats": {
+            "files_profiled": len(profiles),
+            "bytes_read": bytes_read,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "truncated": truncated
+        }
+    }
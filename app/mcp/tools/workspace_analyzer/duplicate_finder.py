@@ -0,0 +1,177 @@
+# app/mcp/tools/workspace_analyzer/duplicate_finder.py
+import os
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from .scanner import FILE_NAME, FILE_SIZE
+
+# Bytes hashed from each end of a file before committing to a full hash
+EDGE_BYTES = 64 * 1024
+FULL_HASH_CHUNK = 1024 * 1024
+
+# Files smaller than this are not worth reporting (empty files are all "duplicates")
+MIN_DUPLICATE_SIZE = 1
+
+# Hard caps for a duplicate search
+MAX_TRACKED_FILES = 200_000
+MAX_HASH_SECONDS = 5.0
+HASH_WORKERS = 4
+
+# Duplicate groups listed in the output, largest reclaimable first
+MAX_REPORTED_GROUPS = 20
+
+class SizeBuckets:
+    """
+    Collect file paths by size while a scan streams past.
+
+    Plugs into scan_workspace as an extra collector. Only sizes seen more
+    than once can hold duplicates, so unique sizes cost one dict entry and
+    nothing is read from disk for them. Stops taking new files after
+    max_files and reports itself truncated.
+    """
+
+    __slots__ = ("buckets", "files", "total_bytes", "truncated", "_max_files")
+
+    def __init__(self, max_files: int = MAX_TRACKED_FILES):
+        self.buckets: Dict[int, List[str]] = {}
+        self.files = 0
+        self.total_bytes = 0
+        self.truncated = False
+        self._max_files = max_files
+
+    def add(self, rel_dir: str, file_record: List[Any], scale: float = 1) -> None:
+        size = file_record[FILE_SIZE]
+        if size < MIN_DUPLICATE_SIZE:
+            return
+        if self.files >= self._max_files:
+            self.truncated = True
+            return
+        self.files += 1
+        self.total_bytes += size
+        rel_path = os.path.join(rel_dir, file_record[FILE_NAME]) if rel_dir else file_record[FILE_NAME]
+        self.buckets.setdefault(size, []).append(rel_path)
+
+    def candidates(self) -> List[Tuple[int, List[str]]]:
+        return [(size, paths) for size, paths in self.buckets.items() if len(paths) > 1]
+
+def _edge_digest(path: str, size: int, deadline: float) -> Tuple[bytes, int]:
+    """Hash the first and last EDGE_BYTES of a file (the whole file when it is smaller)"""
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        head = f.read(EDGE_BYTES)
+        digest.update(head)
+        read = len(head)
+        if size > 2 * EDGE_BYTES:
+            f.seek(size - EDGE_BYTES)
+            tail = f.read(EDGE_BYTES)
+            digest.update(tail)
+            read += len(tail)
+        elif size > EDGE_BYTES:
+            rest = f.read()
+            digest.update(rest)
+            read += len(rest)
+    return digest.digest(), read
+
+def _full_digest(path: str, size: int, deadline: float) -> Tuple[bytes, int]:
+    """Hash a whole file, giving up with TimeoutError once the deadline passes"""
+
+    digest = hashlib.blake2b(digest_size=16)
+    read = 0
+    with open(path, 'rb') as f:
+        while True:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(path)
+            chunk = f.read(FULL_HASH_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+            read += len(chunk)
+    return digest.digest(), read
+
+def _regroup(root: str, groups: List[Tuple[int, List[str]]], digest_fn, executor, deadline: float):
+    """
+    Split each same-size group by a content digest, keeping subgroups of two or more.
+
+    Returns (groups, bytes_read, completed); groups not hashed before the
+    deadline are dropped.
+    """
+
+    futures = [
+        (size, [(path, executor.submit(digest_fn, os.path.join(root, path), size, deadline)) for path in paths])
+        for size, paths in groups
+    ]
+    result = []
+    bytes_read = 0
+    completed = True
+    for size, hashed in futures:
+        by_digest: Dict[bytes, List[str]] = {}
+        for path, future in hashed:
+            if time.monotonic() >= deadline and not future.done():
+                future.cancel()
+                completed = False
+                continue
+            try:
+                digest, read = future.result()
+            except TimeoutError:
+                completed = False
+                continue
+            except OSError:
+                continue
+            bytes_read += read
+            by_digest.setdefault(digest, []).append(path)
+        result.extend((size, paths) for paths in by_digest.values() if len(paths) > 1)
+    return result, bytes_read, completed
+
+def find_duplicates(
+    root: Path,
+    buckets: SizeBuckets,
+    max_seconds: float = MAX_HASH_SECONDS,
+    workers: int = HASH_WORKERS
+) -> Dict[str, Any]:
+    """
+    Find files with identical contents in three narrowing passes.
+
+    1. Size: only sizes shared by two or more files are candidates.
+    2. Edges: candidates are split by a hash of their first and last 64 KB,
+       which also settles files no larger than 128 KB.
+    3. Full: larger files that still collide are hashed completely.
+
+    Each pass reads only what survived the previous one, so on data
+    workspaces the bytes read are a small fraction of the bytes stored.
+    """
+
+    started = time.monotonic()
+    deadline = started + max_seconds
+    root_str = str(root)
+    candidates = buckets.candidates()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        edge_groups, edge_bytes, edge_complete = _regroup(root_str, candidates, _edge_digest, executor, deadline)
+        settled = [(size, paths) for size, paths in edge_groups if size <= 2 * EDGE_BYTES]
+        unsettled = [(size, paths) for size, paths in edge_groups if size > 2 * EDGE_BYTES]
+        full_groups, full_bytes, full_complete = _regroup(root_str, unsettled, _full_digest, executor, deadline)
+
+    groups = [
+        {"size_bytes": size, "files": sorted(paths), "reclaimable_bytes": size * (len(paths) - 1)}
+        for size, paths in settled + full_groups
+    ]
+    groups.sort(key=lambda group: group["reclaimable_bytes"], reverse=True)
+
+    return {
+        "groups": groups[:MAX_REPORTED_GROUPS],
+        "stats": {
+            "duplicate_groups": len(groups),
+            "duplicate_files": sum(len(group["files"]) - 1 for group in groups),
+            "reclaimable_bytes": sum(group["reclaimable_bytes"] for group in groups),
+            "files_considered": buckets.files,
+            "bytes_considered": buckets.total_bytes,
+            "candidate_files": sum(len(paths) for _, paths in candidates),
+            "bytes_hashed": edge_bytes + full_bytes,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "truncated": buckets.truncated or not (edge_complete and full_complete)
+        }
+    }
@@ -0,0 +1,221 @@
+# app/mcp/tools/workspace_analyzer/file_statistics.py
+import os
+import time
+import bisect
+from array import array
+from collections import Counter
+from typing import Dict, List, Any
+
+try:
+    import numpy as np
+except ImportError:
+    # Without numpy the same statistics are computed in plain Python, just more slowly
+    np = None
+
+from .scanner import FILE_NAME, FILE_SIZE
+
+# Size percentiles reported
+PERCENTILES = (50, 90, 99)
+
+# Upper bounds of the size histogram buckets (the last bucket is open-ended)
+SIZE_BUCKET_EDGES = (1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024, 100 * 1024 * 1024)
+SIZE_BUCKET_LABELS = ("<1 KB", "1-10 KB", "10-100 KB", "100 KB-1 MB", "1-10 MB", "10-100 MB", ">=100 MB")
+
+# Entries listed per section of the summary
+MAX_EXTENSIONS_REPORTED = 15
+MAX_DIRECTORIES_REPORTED = 10
+
+# Files recorded before the collector stops taking new ones (about 14 bytes each)
+MAX_TRACKED_FILES = 5_000_000
+
+# Extension ids are 16-bit; extensions beyond the last regular id are pooled as "other"
+_MAX_EXTENSION_ID = 0xFFFF - 1
+_OTHER_EXTENSION = "(other)"
+
+class FileStatsCollector:
+    """
+    Record every classified file's size, extension and directory in typed arrays.
+
+    Plugs into scan_workspace as an extra collector over all pattern groups.
+    Each file costs three array appends (8-byte size, 16-bit extension id,
+    32-bit directory id) instead of a Python object, so millions of files
+    fit in a few tens of megabytes; per-directory depth and sampling scale
+    are stored once per directory. summary() then works on whole arrays.
+    """
+
+    __slots__ = (
+        "sizes", "extension_ids", "directory_ids", "extensions", "directories",
+        "directory_depths", "directory_scales", "truncated",
+        "_extension_index", "_last_dir", "_last_dir_id", "_max_files"
+    )
+
+    def __init__(self, max_files: int = MAX_TRACKED_FILES):
+        self.sizes = array("q")
+        self.extension_ids = array("H")
+        self.directory_ids = array("I")
+        self.extensions: List[str] = []
+        self.directories: List[str] = []
+        self.directory_depths = array("H")
+        self.directory_scales = array("d")
+        self.truncated = False
+        self._extension_index: Dict[str, int] = {}
+        self._last_dir = None
+        self._last_dir_id = 0
+        self._max_files = max_files
+
+    def add(self, rel_dir: str, file_record: List[Any], scale: float = 1) -> None:
+        if len(self.sizes) >= self._max_files:
+            self.truncated = True
+            return
+        # Files arrive directory by directory, so the directory id is looked up once per directory
+        if rel_dir != self._last_dir:
+            self._last_dir = rel_dir
+            self._last_dir_id = len(self.directories)
+            self.directories.append(rel_dir)
+            self.directory_depths.append(rel_dir.count(os.sep) + 1 if rel_dir else 0)
+            self.directory_scales.append(scale)
+
+        name = file_record[FILE_NAME]
+        dot = name.rfind(".")
+        extension = name[dot:].lower() if dot > 0 else ""
+        extension_id = self._extension_index.get(extension)
+        if extension_id is None:
+            if len(self.extensions) < _MAX_EXTENSION_ID:
+                extension_id = len(self.extensions)
+                self.extensions.append(extension)
+                self._extension_index[extension] = extension_id
+            else:
+                # The last id is shared by every extension past the limit
+                if len(self.extensions) == _MAX_EXTENSION_ID:
+                    self.extensions.append(_OTHER_EXTENSION)
+                extension_id = _MAX_EXTENSION_ID
+
+        self.sizes.append(file_record[FILE_SIZE])
+        self.extension_ids.append(extension_id)
+        self.directory_ids.append(self._last_dir_id)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Compute size percentiles, a size histogram, extension shares, the
+        largest directories and the depth distribution.
+
+        Counts and bytes are weighted by each directory's sampling scale;
+        percentiles describe the files actually listed. With numpy every
+        statistic is a handful of vectorized passes over the arrays.
+        """
+
+        started = time.monotonic()
+        result = _summarize_numpy(self) if np is not None else _summarize_python(self)
+        result["files"] = len(self.sizes)
+        result["engine"] = "numpy" if np is not None else "python"
+        result["elapsed_ms"] = round((time.monotonic() - started) * 1000, 2)
+        result["truncated"] = self.truncated
+        return result
+
+def _percentile_positions(count: int) -> List[int]:
+    # Nearest rank below, so both engines report sizes that actually occur
+    return [int(percentile / 100 * (count - 1)) for percentile in PERCENTILES]
+
+def _summarize_numpy(stats: FileStatsCollector) -> Dict[str, Any]:
+    sizes = np.frombuffer(stats.sizes, dtype=np.int64)
+    if not len(sizes):
+        return _empty_summary()
+    extension_ids = np.frombuffer(stats.extension_ids, dtype=np.uint16)
+    directory_ids = np.frombuffer(stats.directory_ids, dtype=np.uint32)
+    weights = np.frombuffer(stats.directory_scales, dtype=np.float64)[directory_ids]
+    weighted_sizes = sizes * weights
+
+    positions = _percentile_positions(len(sizes))
+    percentiles = np.partition(sizes, positions)[positions]
+
+    buckets = np.searchsorted(np.array(SIZE_BUCKET_EDGES), sizes, side="right")
+    bucket_files = np.bincount(buckets, weights=weights, minlength=len(SIZE_BUCKET_LABELS))
+    bucket_bytes = np.bincount(buckets, weights=weighted_sizes, minlength=len(SIZE_BUCKET_LABELS))
+
+    extension_files = np.bincount(extension_ids, weights=weights, minlength=len(stats.extensions))
+    extension_bytes = np.bincount(extension_ids, weights=weighted_sizes, minlength=len(stats.extensions))
+    top_extensions = np.argsort(-extension_files, kind="stable")[:MAX_EXTENSIONS_REPORTED]
+
+    directory_files = np.bincount(directory_ids, weights=weights, minlength=len(stats.directories))
+    directory_bytes = np.bincount(directory_ids, weights=weighted_sizes, minlength=len(stats.directories))
+    limit = min(MAX_DIRECTORIES_REPORTED, len(directory_bytes))
+    # Partial selection: only the reported directories are ever sorted
+    top_directories = np.argpartition(-directory_bytes, limit - 1)[:limit]
+    top_directories = top_directories[np.argsort(-directory_bytes[top_directories], kind="stable")]
+
+    depths = np.frombuffer(stats.directory_depths, dtype=np.uint16)[directory_ids]
+    depth_files = np.bincount(depths, weights=weights)
+
+    return {
+        "total_bytes": int(round(weighted_sizes.sum())),
+        "size_percentiles": {f"p{p}": int(value) for p, value in zip(PERCENTILES, percentiles)},
+        "size_histogram": {
+            label: {"files": int(round(files)), "bytes": int(round(size))}
+            for label, files, size in zip(SIZE_BUCKET_LABELS, bucket_files, bucket_bytes)
+        },
+        "extensions": [
+            {"extension": stats.extensions[i] or "(none)", "files": int(round(extension_files[i])), "bytes": int(round(extension_bytes[i]))}
+            for i in top_extensions
+        ],
+        "largest_directories": [
+            {"path": stats.directories[i] or ".", "files": int(round(directory_files[i])), "bytes": int(round(directory_bytes[i]))}
+            for i in top_directories
+        ],
+        "depth_histogram": {str(depth): int(round(files)) for depth, files in enumerate(depth_files) if files}
+    }
+
+def _summarize_python(stats: FileStatsCollector) -> Dict[str, Any]:
+    sizes = stats.sizes
+    if not len(sizes):
+        return _empty_summary()
+    scales = stats.directory_scales
+    depths = stats.directory_depths
+
+    ordered = sorted(sizes)
+    percentiles = [ordered[position] for position in _percentile_positions(len(ordered))]
+
+    bucket_files = [0.0] * len(SIZE_BUCKET_LABELS)
+    bucket_bytes = [0.0] * len(SIZE_BUCKET_LABELS)
+    extension_files: Counter = Counter()
+    extension_bytes: Counter = Counter()
+    directory_files: Counter = Counter()
+    directory_bytes: Counter = Counter()
+    depth_files: Counter = Counter()
+    for size, extension_id, directory_id in zip(sizes, stats.extension_ids, stats.directory_ids):
+        weight = scales[directory_id]
+        bucket = bisect.bisect_right(SIZE_BUCKET_EDGES, size)
+        bucket_files[bucket] += weight
+        bucket_bytes[bucket] += size * weight
+        extension_files[extension_id] += weight
+        extension_bytes[extension_id] += size * weight
+        directory_files[directory_id] += weight
+        directory_bytes[directory_id] += size * weight
+        depth_files[depths[directory_id]] += weight
+
+    return {
+        "total_bytes": int(round(sum(bucket_bytes))),
+        "size_percentiles": {f"p{p}": value for p, value in zip(PERCENTILES, percentiles)},
+        "size_histogram": {
+            label: {"files": int(round(files)), "bytes": int(round(size))}
+            for label, files, size in zip(SIZE_BUCKET_LABELS, bucket_files, bucket_bytes)
+        },
+        "extensions": [
+            {"extension": stats.extensions[i] or "(none)", "files": int(round(files)), "bytes": int(round(extension_bytes[i]))}
+            for i, files in extension_files.most_common(MAX_EXTENSIONS_REPORTED)
+        ],
+        "largest_directories": [
+            {"path": stats.directories[i] or ".", "files": int(round(directory_files[i])), "bytes": int(round(size))}
+            for i, size in directory_bytes.most_common(MAX_DIRECTORIES_REPORTED)
+        ],
+        "depth_histogram": {str(depth): int(round(depth_files[depth])) for depth in sorted(depth_files)}
+    }
+
+def _empty_summary() -> Dict[str, Any]:
+    return {
+        "total_bytes": 0,
+        "size_percentiles": {},
+        "size_histogram": {},
+        "extensions": [],
+        "largest_directories": [],
+        "depth_histogram": {}
+    }
@@ -0,0 +1,204 @@
+# app/mcp/tools/workspace_analyzer/ignore_rules.py
+import os
+import re
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple, Callable
+
+# Ignore files honored in every directory, lowest precedence first
+IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+
+# Repository-wide excludes, applied from the workspace root
+GIT_EXCLUDE_FILE = os.path.join(".git", "info", "exclude")
+
+_CASE_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring slashes) into a regex body"""
+
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            negate = body[0] in "!^"
+            if negate:
+                body = body[1:]
+            body = body.replace("\\", "\\\\")
+            out.append("[" + ("^" if negate else "") + body + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+class IgnoreFile:
+    """
+    Compiled rules of one ignore file.
+
+    Paths are matched relative to the directory the file applies to, with
+    "/" separators. Every rule is folded into one combined regex first, so
+    paths that match no rule, which is nearly all of them, cost a single
+    match; only hits walk the rules in reverse for last-match-wins negation.
+    """
+
+    def __init__(self, base: str, text: str):
+        self.base = base
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        sources = []
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            source = ("" if anchored else "(?:.*/)?") + _translate(line)
+            self.rules.append((re.compile(source + r"\Z", _CASE_FLAGS), negate, dir_only))
+            sources.append(source)
+
+        self._any = re.compile("(?:" + "|".join(sources) + r")\Z", _CASE_FLAGS) if sources else None
+        self.signature = hashlib.sha1(f"{base}\0{text}".encode()).hexdigest()[:16]
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if ignored, False if re-included by a negation, None if no rule matches"""
+
+        if self._any is None or not self._any.match(path):
+            return None
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negate
+        return None
+
+# Compiled ignore files by path, reused while their mtime and size are unchanged
+_file_cache: Dict[str, Tuple[int, int, IgnoreFile]] = {}
+_file_cache_lock = threading.Lock()
+
+def _load_ignore_file(base: str, path: str, mtime_ns: int, size: int) -> Optional[IgnoreFile]:
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+        return cached[2]
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            ignore_file = IgnoreFile(base, f.read())
+    except OSError:
+        return None
+    with _file_cache_lock:
+        _file_cache[path] = (mtime_ns, size, ignore_file)
+    return ignore_file
+
+class IgnoreRules:
+    """
+    The chain of ignore files in effect for a directory, outermost first.
+
+    Rules are immutable; descending into a directory that has its own ignore
+    files extends the chain, so sibling subtrees share their parent's rules.
+    The signature changes whenever any file in the chain does, which lets
+    the workspace index detect records listed under different rules.
+    """
+
+    def __init__(self, files: Tuple[IgnoreFile, ...] = (), signature: str = ""):
+        self.files = files
+        self.signature = signature
+
+    def extend(self, dir_path: str, ignore_files: Optional[Dict[str, List[int]]]) -> "IgnoreRules":
+        """Add a directory's ignore files, given as {name: [mtime_ns, size]}"""
+
+        if not ignore_files:
+            return self
+        files = self.files
+        signature = self.signature
+        for name in sorted(ignore_files, key=_precedence):
+            mtime_ns, size = ignore_files[name]
+            ignore_file = _load_ignore_file(dir_path, os.path.join(dir_path, name), mtime_ns, size)
+            if ignore_file is None or not ignore_file.rules:
+                continue
+            files = files + (ignore_file,)
+            signature = hashlib.sha1(f"{signature}\0{ignore_file.signature}".encode()).hexdigest()[:16]
+        return IgnoreRules(files, signature)
+
+    def matcher(self, dir_path: str) -> Optional[Callable[[str, bool], bool]]:
+        """Return an is_ignored(name, is_dir) test for the entries of dir_path, or None if no rules apply"""
+
+        if not self.files:
+            return None
+        levels = []
+        for ignore_file in reversed(self.files):
+            if dir_path == ignore_file.base:
+                prefix = ""
+            else:
+                prefix = dir_path[len(ignore_file.base) + 1:].replace(os.sep, "/") + "/"
+            levels.append((ignore_file, prefix))
+
+        def is_ignored(name: str, is_dir: bool) -> bool:
+            # Deeper ignore files override outer ones
+            for ignore_file, prefix in levels:
+                decision = ignore_file.match(prefix + name, is_dir)
+                if decision is not None:
+                    return decision
+            return False
+
+        return is_ignored
+
+def _precedence(name: str) -> int:
+    return IGNORE_FILE_NAMES.index(name) if name in IGNORE_FILE_NAMES else -1
+
+def stat_ignore_file(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def root_ignore_rules(root: str) -> IgnoreRules:
+    """Rules applying to the workspace root's entries before its own ignore files"""
+
+    stat = stat_ignore_file(os.path.join(root, GIT_EXCLUDE_FILE))
+    return IgnoreRules().extend(root, {GIT_EXCLUDE_FILE: stat} if stat else None)
+
+def inherited_ignore_rules(root: str, rel_dir: str, directories: Dict[str, Dict[str, object]]) -> IgnoreRules:
+    """Rebuild the rules a directory inherits from the ignore files recorded for its ancestors"""
+
+    rules = root_ignore_rules(root)
+    if not rel_dir:
+        return rules
+    ancestor = ""
+    for part in [""] + rel_dir.split(os.sep)[:-1]:
+        ancestor = os.path.join(ancestor, part) if ancestor else part
+        record = directories.get(ancestor) or {}
+        rules = rules.extend(os.path.join(root, ancestor) if ancestor else root, record.get("ignore_files"))
+    return rules
@@ -0,0 +1,171 @@
+# app/mcp/tools/workspace_analyzer/scan_service.py
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Hashable
+
+from app.mcp.io_executor import run_cancellable
+
+from .scanner import scan_workspace, DEFAULT_EXAMPLE_LIMIT
+from .workspace_index import get_workspace_index
+
+# Scan results kept for reuse, least recently used dropped first
+MAX_MEMO_ENTRIES = 16
+
+# Options filled in before keying, so callers relying on defaults share results
+DEFAULT_SCAN_OPTIONS = {
+    "workers": 1,
+    "follow_symlinks": False,
+    "max_depth": None,
+    "sample_limit": None,
+    "example_limit": DEFAULT_EXAMPLE_LIMIT,
+    "example_order": "hot",
+    "path_limit": 0
+}
+
+class ScanService:
+    """
+    The one entry point every tool uses to scan a workspace.
+
+    Results are memoized per (root, options) together with a fingerprint of
+    the tree they were computed from. With a live (watched) index the
+    fingerprint is the index generation, so a repeat scan is free; otherwise
+    it is checked with one stat per indexed directory and file, so files
+    written in place invalidate it too, without listing or aggregating
+    anything. A result served from the memo carries "memoized" and its own
+    index_stats: every directory a hit, nothing re-listed. Identical
+    requests arriving while a scan is running wait for that scan instead
+    of starting their own.
+
+    Returned results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = MAX_MEMO_ENTRIES):
+        self._max_entries = max_entries
+        self._memo: "OrderedDict[Hashable, Tuple[Hashable, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memo_hits": 0, "coalesced": 0, "scans": 0}
+
+    def scan(
+        self,
+        root: Path,
+        use_index: bool = True,
+        deadline: Optional[float] = None,
+        collectors: Optional[List[Tuple[List[str], Any]]] = None,
+        cancel: Optional[threading.Event] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Scan a workspace, reusing a memoized or in-flight result when possible.
+
+        options are passed to scan_workspace. The workspace index is used
+        when use_index is set and the options allow it (no symlink following,
+        no sampling). Scans with collectors feed caller-owned state, so they
+        always run; so do scans with a deadline that cannot be served from
+        the memo, and their partial results are never memoized.
+
+        cancel stops a scan that serves this caller alone. A shared scan
+        keeps running for the other waiters and is memoized as usual.
+        """
+
+        root = Path(os.path.abspath(root))
+        options = {**DEFAULT_SCAN_OPTIONS, **options}
+        # 0 and 1 workers both mean a serial walk
+        options["workers"] = max(1, options["workers"])
+        index = None
+        if use_index and not options.get("follow_symlinks") and not options.get("sample_limit"):
+            index = get_workspace_index(root)
+
+        if collectors:
+            return self._run(root, index, deadline, collectors, options, cancel)
+
+        key = (str(root), index is not None, tuple(sorted(options.items())))
+        with self._lock:
+            memoized = self._memo.get(key)
+        # Fingerprinting stats the tree, so it runs outside the service lock
+        if memoized is not None and self._fingerprint(index) == memoized[0]:
+            with self._lock:
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                self.stats["memo_hits"] += 1
+            result = memoized[1]
+            # This call's view of the index, not the one of the scan that produced the result
+            hits = result["scan_stats"]["directories_scanned"]
+            return {
+                **result,
+                "index_stats": {"hits": hits, "misses": 0, "refreshed": 0, "removed": 0},
+                "memoized": True
+            }
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is None and deadline is None:
+                inflight = self._inflight[key] = Future()
+                leader = True
+            else:
+                leader = False
+                if inflight is not None:
+                    self.stats["coalesced"] += 1
+
+        if not leader:
+            if inflight is not None:
+                return inflight.result()
+            return self._store(key, self._run(root, index, deadline, None, options, cancel))
+
+        try:
+            result = self._store(key, self._run(root, index, None, None, options))
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            inflight.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        inflight.set_result(result)
+        return result
+
+    async def scan_async(self, root: Path, **kwargs: Any) -> Dict[str, Any]:
+        """
+        scan() on the shared I/O executor, keeping the event loop free while the tree is walked.
+
+        Cancelling the awaiting task cancels the scan (see scan()).
+        """
+
+        return await run_cancellable(self.scan, root, **kwargs)
+
+    def _run(self, root: Path, index, deadline, collectors, options, cancel=None) -> Dict[str, Any]:
+        with self._lock:
+            self.stats["scans"] += 1
+        return scan_workspace(root, index=index, deadline=deadline, collectors=collectors, cancel=cancel, **options)
+
+    def _store(self, key: Hashable, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result["scan_stats"]["timed_out"] or "index_generation" not in result:
+            return result
+        fingerprint = ("generation", result["index_generation"])
+        with self._lock:
+            self._memo[key] = (fingerprint, result)
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._max_entries:
+                self._memo.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _fingerprint(index) -> Optional[Hashable]:
+        """The tree fingerprint a memoized result must match, or None if it cannot be trusted"""
+
+        if index is None:
+            return None
+        with index.lock:
+            if index.live or index.unchanged_on_disk():
+                return ("generation", index.generation)
+        return None
+
+_service = ScanService()
+
+def get_scan_service() -> ScanService:
+    """Return the process-wide scan service"""
+
+    return _service
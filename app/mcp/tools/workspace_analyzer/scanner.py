@@ -0,0 +1,783 @@
+# app/mcp/tools/workspace_analyzer/scanner.py
+import os
+import re
+import json
+import fnmatch
+import time
+import hashlib
+import heapq
+import operator
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from .ignore_rules import IgnoreRules, IGNORE_FILE_NAMES, root_ignore_rules
+
+if TYPE_CHECKING:
+    from .workspace_index import WorkspaceIndex
+
+# Directory and file names that are never analyzed (pruned before descending),
+# on top of whatever .gitignore/.ignore files exclude
+IGNORE_NAMES = frozenset([
+    ".git", "__pycache__", "node_modules", ".pytest_cache",
+    ".venv", "venv", ".env", "dist", "build"
+])
+
+# Skip very large files (over 100MB) for performance
+MAX_FILE_SIZE = 100 * 1024 * 1024
+
+# File patterns to look for
+PATTERNS_CONFIG = {
+    "data_files": {
+        "extensions": [".csv", ".json", ".xlsx", ".xml", ".parquet", ".jsonl"],
+        "automation_type": "Data Processing System"
+    },
+    "api_docs": {
+        "patterns": ["*api*", "*swagger*", "*openapi*", "*.postman*"],
+        "automation_type": "API Integration System"
+    },
+    "config_files": {
+        "patterns": ["*.config.*", "*.env*", "config.*", "settings.*"],
+        "automation_type": "Configuration Management"
+    },
+    "templates": {
+        "extensions": [".template", ".tmpl", ".jinja2"],
+        "automation_type": "Template-Based Generation"
+    },
+    "scripts": {
+        "extensions": [".py", ".js", ".sh", ".bat", ".ps1"],
+        "automation_type": "Script Automation Enhancement"
+    }
+}
+
+# Name fragments indicating integration opportunities
+INTEGRATION_INDICATORS = {
+    "Database": [".sql", "database.py", "db_config", "connection_string"],
+    "Cloud Services": ["aws", "azure", "gcp", "s3", "blob"],
+    "APIs": ["api_key", "endpoint", "webhook", "rest", "graphql"],
+    "Monitoring": ["logging", "metrics", "alerts", "monitoring"],
+    "CI/CD": [".github", ".gitlab", "jenkins", "docker", "kubernetes"]
+}
+
+# Positions of the fields in a file record: [name, size, mtime_ns, group_mask]
+FILE_NAME, FILE_SIZE, FILE_MTIME, FILE_MASK = range(4)
+# Optional fifth field: how often the workspace index saw the file change (absent = never)
+FILE_CHANGES = 4
+
+# Age at which a file's recency counts half as much as a file modified just now
+HOT_HALF_LIFE_SECONDS = 7 * 24 * 3600
+
+class EntryClassifier:
+    """
+    Classify entry names against every pattern group and integration indicator at once.
+
+    Matches are returned as bitmasks (bit i = i-th pattern group or integration type)
+    so directory records stay compact enough to persist in the workspace index.
+    """
+
+    def __init__(self, patterns_config: Dict[str, Dict[str, Any]], integration_indicators: Dict[str, List[str]]):
+        self.group_names = list(patterns_config)
+        self._groups = []
+        for bit, config in enumerate(patterns_config.values()):
+            extensions = tuple(os.path.normcase(ext) for ext in config.get("extensions", []))
+            patterns = config.get("patterns", [])
+            regex = None
+            if patterns:
+                regex = re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+            self._groups.append((1 << bit, extensions, regex))
+
+        self.integration_names = list(integration_indicators)
+        self._indicators = [
+            (1 << bit, tuple(os.path.normcase(i) for i in indicators))
+            for bit, indicators in enumerate(integration_indicators.values())
+        ]
+
+        # Changes whenever the rules change, invalidating persisted classifications
+        rules = json.dumps([patterns_config, integration_indicators, sorted(IGNORE_NAMES), MAX_FILE_SIZE], sort_keys=True)
+        self.signature = hashlib.sha1(rules.encode()).hexdigest()[:16]
+
+    def group_mask(self, name: str) -> int:
+        """Return the bitmask of pattern groups a file name belongs to"""
+
+        normalized = os.path.normcase(name)
+        mask = 0
+        for bit, extensions, regex in self._groups:
+            if (extensions and normalized.endswith(extensions)) or (regex is not None and regex.match(normalized)):
+                mask |= bit
+        return mask
+
+    def integration_mask(self, name: str) -> int:
+        """Return the bitmask of integration types whose indicators appear in a name"""
+
+        normalized = os.path.normcase(name)
+        mask = 0
+        for bit, indicators in self._indicators:
+            if any(indicator in normalized for indicator in indicators):
+                mask |= bit
+        return mask
+
+    def groups_in(self, mask: int) -> List[str]:
+        """Expand a pattern group bitmask into group names"""
+
+        return [name for bit, name in enumerate(self.group_names) if mask & (1 << bit)]
+
+    def integrations_in(self, mask: int) -> List[str]:
+        """Expand an integration bitmask into integration types"""
+
+        return [name for bit, name in enumerate(self.integration_names) if mask & (1 << bit)]
+
+DEFAULT_CLASSIFIER = EntryClassifier(PATTERNS_CONFIG, INTEGRATION_INDICATORS)
+
+def list_directory(
+    dir_path: str,
+    classifier: EntryClassifier = DEFAULT_CLASSIFIER,
+    follow_symlinks: bool = False,
+    sample_limit: Optional[int] = None,
+    ignore: Optional[IgnoreRules] = None
+) -> Dict[str, Any]:
+    """
+    List and classify a single directory.
+
+    Returns a directory record with the directory's own mtime, its classified
+    files as [name, size, mtime_ns, group_mask], the names of non-ignored
+    subdirectories in listing order, and the integration bitmask of all entry
+    names. Only classified files are stat'ed, and DirEntry caches that result.
+
+    Entries are dropped if their name is built in to IGNORE_NAMES or they
+    match the ignore rules inherited from parent directories (ignore)
+    extended with this directory's own ignore files. Ignored subdirectories
+    are counted in "pruned" and never listed. The record keeps the inherited
+    rules' signature and the ignore files' stats so the index can tell when
+    the rules changed.
+
+    With sample_limit, a directory holding more classified files than that
+    only stats an evenly spaced sample of them; the record's "scale" is the
+    factor that extrapolates the sample back to the whole directory.
+    """
+
+    if ignore is None:
+        ignore = IgnoreRules()
+
+    # Stat before listing so a concurrent change leaves a stale mtime, never a stale listing
+    mtime_ns = os.stat(dir_path).st_mtime_ns
+    with os.scandir(dir_path) as it:
+        entries = list(it)
+
+    ignore_files = {}
+    for entry in entries:
+        if entry.name in IGNORE_FILE_NAMES:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            ignore_files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    is_ignored = ignore.extend(dir_path, ignore_files).matcher(dir_path)
+
+    candidates = []
+    subdirs = []
+    integrations = 0
+    pruned = 0
+    for entry in entries:
+        name = entry.name
+        try:
+            # Symlinked directories are not followed by default, matching Path.rglob()
+            is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+        except OSError:
+            continue
+        if name in IGNORE_NAMES or (is_ignored is not None and is_ignored(name, is_dir)):
+            pruned += is_dir
+            continue
+        integrations |= classifier.integration_mask(name)
+        if is_dir:
+            subdirs.append(name)
+            continue
+        mask = classifier.group_mask(name)
+        if mask:
+            candidates.append((entry, mask))
+
+    record = {
+        "mtime_ns": mtime_ns,
+        "files": [],
+        "subdirs": subdirs,
+        "integrations": integrations
+    }
+    if ignore.signature:
+        record["ignore"] = ignore.signature
+    if ignore_files:
+        record["ignore_files"] = ignore_files
+    if pruned:
+        record["pruned"] = pruned
+
+    if sample_limit and len(candidates) > sample_limit:
+        step = len(candidates) / sample_limit
+        record["scale"] = step
+        candidates = [candidates[int(i * step)] for i in range(sample_limit)]
+
+    files = record["files"]
+    for entry, mask in candidates:
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except OSError:
+            continue
+        if stat.st_size > MAX_FILE_SIZE:
+            continue
+        files.append([entry.name, stat.st_size, stat.st_mtime_ns, mask])
+
+    return record
+
+def carry_churn(previous: Optional[Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Carry per-file change counts from a directory's previous record into a fresh listing.
+
+    A file whose mtime differs from the previous record gets one more
+    change; files that were added since start at zero. Counts are stored as
+    an optional FILE_CHANGES field, so unchanged files cost nothing.
+    """
+
+    if not previous or not previous["files"]:
+        return record
+    known = {file_record[FILE_NAME]: file_record for file_record in previous["files"]}
+    for file_record in record["files"]:
+        old = known.get(file_record[FILE_NAME])
+        if old is None:
+            continue
+        changes = old[FILE_CHANGES] if len(old) > FILE_CHANGES else 0
+        if old[FILE_MTIME] != file_record[FILE_MTIME]:
+            changes += 1
+        if changes:
+            file_record.append(changes)
+    return record
+
+def restat_files(record: Dict[str, Any], dir_path: str) -> Dict[str, Any]:
+    """
+    Re-stat the files of a directory record that was not re-listed.
+
+    Writing a file in place leaves its directory's mtime alone, so a record
+    reused on the directory mtime alone would keep the file's old size and
+    mtime and never count the change. Returns the record itself when no
+    file changed, otherwise a copy with fresh sizes and mtimes and the
+    changes counted (see carry_churn). Raises OSError if a file is gone,
+    in which case the directory has to be listed again.
+    """
+
+    fresh = None
+    for position, file_record in enumerate(record["files"]):
+        stat = os.stat(os.path.join(dir_path, file_record[FILE_NAME]))
+        if stat.st_size == file_record[FILE_SIZE] and stat.st_mtime_ns == file_record[FILE_MTIME]:
+            continue
+        if fresh is None:
+            # carry_churn appends counts, so unchanged files are copied without theirs
+            fresh = [file_record[:FILE_CHANGES] for file_record in record["files"]]
+        fresh[position] = [file_record[FILE_NAME], stat.st_size, stat.st_mtime_ns, file_record[FILE_MASK]]
+    if fresh is None:
+        return record
+    files = [file_record for file_record in fresh if file_record[FILE_SIZE] <= MAX_FILE_SIZE]
+    return carry_churn(record, {**record, "files": files})
+
+def file_changes(file_record: List[Any]) -> int:
+    """Number of changes the workspace index observed for a file"""
+
+    return file_record[FILE_CHANGES] if len(file_record) > FILE_CHANGES else 0
+
+def hot_rank(now: float) -> Callable[[List[Any]], float]:
+    """
+    Return a key ranking files by churn and recency as of now.
+
+    Each observed change is worth one point and recency up to one more,
+    halving every HOT_HALF_LIFE_SECONDS of age. Files the index never saw
+    change are therefore ranked by how recently they were modified, and
+    any file that keeps changing ranks above them. Ages come from stat
+    mtimes: the workspace index re-stats the files of directories it reuses.
+    """
+
+    # Called for every file in the walk, so the arithmetic is kept inline
+    def rank(file_record: List[Any]) -> float:
+        age = now - file_record[FILE_MTIME] * 1e-9
+        recency = 0.5 ** (age / HOT_HALF_LIFE_SECONDS) if age > 0 else 1.0
+        return recency + file_record[FILE_CHANGES] if len(file_record) > FILE_CHANGES else recency
+    return rank
+
+def _depth(rel_dir: str) -> int:
+    return rel_dir.count(os.sep) + 1 if rel_dir else 0
+
+def _child_dirs(rel_dir: str, names) -> Iterator[str]:
+    return (os.path.join(rel_dir, name) if rel_dir else name for name in names)
+
+def new_walk_report() -> Dict[str, Any]:
+    """Counters filled in by walk_directories"""
+
+    return {
+        "directories_scanned": 0,
+        "pending_directories": 0,
+        "depth_limited_directories": 0,
+        "pruned_directories": 0,
+        "sampled_directories": 0,
+        "timed_out": False,
+        "cancelled": False,
+        # Per-depth directories scanned, subdirectories descended into, and pending at timeout
+        "_level_directories": [],
+        "_level_subdirs": [],
+        "_pending_by_depth": {}
+    }
+
+def _count_level(levels: List[int], depth: int, amount: int) -> None:
+    while len(levels) <= depth:
+        levels.append(0)
+    levels[depth] += amount
+
+def estimate_total_directories(report: Dict[str, Any]) -> float:
+    """
+    Estimate how many directories a walk cut short by its deadline would have visited.
+
+    Each pending directory is assumed to have the subtree size implied by
+    the average branching factor observed at every depth below it.
+    """
+
+    level_dirs = report["_level_directories"]
+    level_subdirs = report["_level_subdirs"]
+    ratios = [subdirs / dirs if dirs else 0.0 for dirs, subdirs in zip(level_dirs, level_subdirs)]
+    # below[d]: expected number of descendants of a directory at depth d
+    below = [0.0] * (len(ratios) + 1)
+    for depth in reversed(range(len(ratios))):
+        below[depth] = ratios[depth] * (1 + below[depth + 1])
+
+    estimate = float(report["directories_scanned"])
+    for depth, count in report["_pending_by_depth"].items():
+        estimate += count * (1 + (below[depth] if depth < len(below) else 0.0))
+    return estimate
+
+def walk_directories(
+    root: Path,
+    classifier: EntryClassifier = DEFAULT_CLASSIFIER,
+    index: Optional["WorkspaceIndex"] = None,
+    workers: int = 1,
+    follow_symlinks: bool = False,
+    max_depth: Optional[int] = None,
+    sample_limit: Optional[int] = None,
+    deadline: Optional[float] = None,
+    report: Optional[Dict[str, Any]] = None,
+    cancel: Optional[threading.Event] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Walk a workspace depth-first, yielding (relative_dir, record) per directory.
+
+    Ignored directories are pruned before they are listed. With an index,
+    directories whose mtime is unchanged are served from the index instead
+    of being listed again. With workers > 1, directories are listed
+    concurrently but records are still yielded in serial depth-first order.
+    When following symlinks, each physical directory is yielded once, so
+    symlink loops terminate.
+
+    Directories deeper than max_depth are not listed, and the walk stops
+    once time.monotonic() passes deadline; both are counted in report so
+    callers can extrapolate. Setting cancel stops the walk the same way and
+    also marks the report "cancelled".
+    """
+
+    root_str = str(root)
+    root_ignore = root_ignore_rules(root_str)
+    if report is None:
+        report = new_walk_report()
+
+    def load(rel_dir: str, ignore: IgnoreRules) -> Tuple[Dict[str, Any], Optional[Tuple[int, int]], IgnoreRules]:
+        """List a directory under its inherited rules; also return the rules its subdirectories inherit"""
+
+        dir_path = os.path.join(root_str, rel_dir) if rel_dir else root_str
+        identity = None
+        if follow_symlinks:
+            st = os.stat(dir_path)
+            identity = (st.st_dev, st.st_ino)
+        if index is not None:
+            record = index.get_directory(rel_dir, dir_path, ignore)
+        else:
+            record = list_directory(dir_path, classifier, follow_symlinks, sample_limit, ignore)
+        return record, identity, ignore.extend(dir_path, record.get("ignore_files"))
+
+    def within_depth(rel_dir: str) -> bool:
+        return max_depth is None or _depth(rel_dir) < max_depth
+
+    def expired(stack: List[str]) -> bool:
+        if not stack:
+            return False
+        if cancel is not None and cancel.is_set():
+            report["cancelled"] = True
+        elif deadline is None or time.monotonic() < deadline:
+            return False
+        report["timed_out"] = True
+        report["pending_directories"] = len(stack)
+        pending = report["_pending_by_depth"]
+        for rel_dir in stack:
+            depth = _depth(rel_dir)
+            pending[depth] = pending.get(depth, 0) + 1
+        return True
+
+    def visit(rel_dir: str, record: Dict[str, Any], identity, seen: set) -> bool:
+        if identity is not None:
+            if identity in seen:
+                return False
+            seen.add(identity)
+        report["directories_scanned"] += 1
+        report["pruned_directories"] += record.get("pruned", 0)
+        if "scale" in record:
+            report["sampled_directories"] += 1
+        _count_level(report["_level_directories"], _depth(rel_dir), 1)
+        return True
+
+    def descend(rel_dir: str, record: Dict[str, Any]) -> List[str]:
+        subdirs = record["subdirs"]
+        if not within_depth(rel_dir):
+            report["depth_limited_directories"] += len(subdirs)
+            return []
+        _count_level(report["_level_subdirs"], _depth(rel_dir), len(subdirs))
+        # Reverse so the stack pops subdirectories in listing order
+        return list(_child_dirs(rel_dir, reversed(subdirs)))
+
+    if workers > 1:
+        yield from _walk_parallel(load, workers, within_depth, expired, visit, descend, root_ignore)
+        return
+
+    seen = set()
+    stack = [""]
+    inherited = {"": root_ignore}
+    while stack and not expired(stack):
+        rel_dir = stack.pop()
+        try:
+            record, identity, ignore = load(rel_dir, inherited.pop(rel_dir))
+        except OSError:
+            continue
+        if not visit(rel_dir, record, identity, seen):
+            continue
+
+        yield rel_dir, record
+
+        children = descend(rel_dir, record)
+        for child in children:
+            inherited[child] = ignore
+        stack.extend(children)
+
+class _DirectoryPool:
+    """
+    Fixed worker threads taking directory listings from one shared LIFO stack.
+
+    Last-in-first-out keeps workers close to the depth-first frontier the
+    consumer is waiting on, while any idle worker still takes whichever
+    subtree is pending next, wherever it is in the tree.
+    """
+
+    def __init__(self, workers: int, fn):
+        self._fn = fn
+        self._tasks = queue.LifoQueue()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"workspace-scan-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, *args) -> Future:
+        if self._closed:
+            raise RuntimeError("directory pool is shut down")
+        future = Future()
+        self._tasks.put((future, args))
+        return future
+
+    def _work(self) -> None:
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                return
+            future, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Cancel queued listings and wait for running ones to finish"""
+
+        self._closed = True
+        while True:
+            try:
+                item = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+def _walk_parallel(
+    load, workers: int, within_depth, expired, visit, descend, root_ignore: IgnoreRules
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    List directories on a bounded thread pool.
+
+    Each listing task submits its subdirectories to the shared pool as soon
+    as it finishes, so idle workers always pick up pending subtrees wherever
+    they are. The consumer walks the same depth-first order as the serial
+    walk and waits on each directory's future, keeping output deterministic.
+    Symlink loops are cut on the producer side by refusing to descend into
+    a directory that is one of its own ancestors; duplicates that are not
+    loops are skipped by the consumer in depth-first order.
+    """
+
+    futures: Dict[str, Future] = {}
+
+    def task(rel_dir: str, ancestors: Tuple[Tuple[int, int], ...], ignore: IgnoreRules):
+        record, identity, ignore = load(rel_dir, ignore)
+        if identity is not None:
+            if identity in ancestors:
+                return None, identity
+            ancestors = ancestors + (identity,)
+        if within_depth(rel_dir):
+            # Submitted last-child-first so the first child is listed first
+            for child in _child_dirs(rel_dir, reversed(record["subdirs"])):
+                try:
+                    futures[child] = pool.submit(child, ancestors, ignore)
+                except RuntimeError:
+                    # Pool shut down because the consumer stopped early
+                    break
+        return record, identity
+
+    pool = _DirectoryPool(workers, task)
+    futures[""] = pool.submit("", (), root_ignore)
+    seen = set()
+    stack = [""]
+    try:
+        while stack and not expired(stack):
+            rel_dir = stack.pop()
+            try:
+                record, identity = futures.pop(rel_dir).result()
+            except OSError:
+                continue
+            if record is None or not visit(rel_dir, record, identity, seen):
+                continue
+
+            yield rel_dir, record
+
+            stack.extend(descend(rel_dir, record))
+    finally:
+        pool.shutdown()
+
+# Examples kept per pattern group, and how each example order ranks them (given the scan time)
+DEFAULT_EXAMPLE_LIMIT = 5
+EXAMPLE_ORDERS: Dict[str, Callable[[float], Callable[[List[Any]], Any]]] = {
+    "hot": hot_rank,
+    "size": lambda now: operator.itemgetter(FILE_SIZE),
+    "recent": lambda now: operator.itemgetter(FILE_MTIME)
+}
+
+class GroupAggregator:
+    """
+    Streaming totals for one pattern group in constant memory.
+
+    Keeps a running count and size sum, a min-heap of the example_limit
+    highest-ranked files (ranked by rank_key applied to each file record) and
+    the first path_limit paths in walk order. Relative paths are only built
+    for files that are kept, so the per-file cost is a few comparisons.
+    """
+
+    __slots__ = ("count", "total_size", "paths", "_examples", "_example_limit", "_rank_key", "_path_limit", "_sequence")
+
+    def __init__(
+        self,
+        example_limit: int = DEFAULT_EXAMPLE_LIMIT,
+        rank_key: Callable[[List[Any]], Any] = operator.itemgetter(FILE_SIZE),
+        path_limit: int = 0
+    ):
+        self.count = 0
+        self.total_size = 0
+        self.paths: List[str] = []
+        self._examples: List[Tuple[Any, int, str, List[Any]]] = []
+        self._example_limit = example_limit
+        self._rank_key = rank_key
+        self._path_limit = path_limit
+        self._sequence = 0
+
+    def add(self, rel_dir: str, file_record: List[Any], scale: float = 1) -> None:
+        self.count += scale
+        self.total_size += file_record[FILE_SIZE] * scale
+
+        rel_path = None
+        if len(self.paths) < self._path_limit:
+            rel_path = _join(rel_dir, file_record[FILE_NAME])
+            self.paths.append(rel_path)
+
+        rank = self._rank_key(file_record)
+        examples = self._examples
+        if len(examples) < self._example_limit:
+            pass
+        elif examples and rank > examples[0][0]:
+            heapq.heappop(examples)
+        else:
+            return
+        # The negated sequence number keeps ties in walk order
+        self._sequence += 1
+        heapq.heappush(examples, (rank, -self._sequence, rel_path or _join(rel_dir, file_record[FILE_NAME]), file_record))
+
+    def result(self, factor: float = 1.0) -> Dict[str, Any]:
+        """
+        Return the group totals, extrapolated by factor, with examples best-ranked first.
+
+        example_files repeats the examples with their size, mtime, observed
+        changes and rank, so callers can merge examples across groups.
+        """
+
+        ranked = sorted(self._examples, key=lambda example: example[:2], reverse=True)
+        return {
+            "count": int(round(self.count * factor)),
+            "total_size": int(round(self.total_size * factor)),
+            "examples": [path for _, _, path, _ in ranked],
+            "example_files": [
+                {
+                    "path": path,
+                    "size": file_record[FILE_SIZE],
+                    "mtime_ns": file_record[FILE_MTIME],
+                    "changes": file_changes(file_record),
+                    "rank": rank
+                }
+                for rank, _, path, file_record in ranked
+            ],
+            "paths": self.paths
+        }
+
+def group_aggregators(
+    classifier: EntryClassifier = DEFAULT_CLASSIFIER,
+    example_limit: int = DEFAULT_EXAMPLE_LIMIT,
+    example_order: str = "hot",
+    path_limit: int = 0,
+    collectors: Optional[List[Tuple[List[str], Any]]] = None
+) -> Tuple[Dict[str, GroupAggregator], List[Tuple[int, Any]]]:
+    """
+    Create one GroupAggregator per pattern group.
+
+    Also returns the (group bitmask, aggregator or collector) pairs every
+    classified file is routed through: a file is added to each entry whose
+    bitmask shares a bit with its own group mask.
+    """
+
+    if example_order not in EXAMPLE_ORDERS:
+        raise ValueError(f"Example order '{example_order}' must be one of: {', '.join(EXAMPLE_ORDERS)}")
+
+    rank_key = EXAMPLE_ORDERS[example_order](time.time())
+    aggregators = {
+        name: GroupAggregator(example_limit, rank_key, path_limit)
+        for name in classifier.group_names
+    }
+    group_bits = [(1 << bit, aggregators[name]) for bit, name in enumerate(classifier.group_names)]
+    for group_names, collector in collectors or []:
+        mask = 0
+        for name in group_names:
+            mask |= 1 << classifier.group_names.index(name)
+        group_bits.append((mask, collector))
+    return aggregators, group_bits
+
+def _join(rel_dir: str, name: str) -> str:
+    return os.path.join(rel_dir, name) if rel_dir else name
+
+def scan_workspace(
+    root: Path,
+    classifier: EntryClassifier = DEFAULT_CLASSIFIER,
+    index: Optional["WorkspaceIndex"] = None,
+    workers: int = 1,
+    follow_symlinks: bool = False,
+    max_depth: Optional[int] = None,
+    sample_limit: Optional[int] = None,
+    deadline: Optional[float] = None,
+    example_limit: int = DEFAULT_EXAMPLE_LIMIT,
+    example_order: str = "hot",
+    path_limit: int = 0,
+    collectors: Optional[List[Tuple[List[str], Any]]] = None,
+    cancel: Optional[threading.Event] = None
+) -> Dict[str, Any]:
+    """
+    Classify every file in the workspace against all pattern groups in a single traversal.
+
+    Group counts and sizes are extrapolated when directories were sampled or
+    the deadline cut the walk short; "scan_stats" says which happened. For a
+    timed-out walk the extrapolation factor is the estimated total number of
+    directories (see estimate_total_directories) over the scanned ones. The
+    index only holds full, non-symlink-following records, so it is bypassed
+    when follow_symlinks or sample_limit is set.
+
+    Groups are aggregated as they stream past (see GroupAggregator): each
+    reports its count, total size, example_limit examples ranked by
+    example_order ("hot", "size" or "recent") and, for follow-up stages such as
+    content scanning, the first path_limit paths in walk order. Memory
+    therefore does not grow with the number of files. collectors are extra
+    (group names, collector) pairs whose add(rel_dir, file_record, scale) is
+    called once for every file in any of those groups.
+
+    Setting cancel (from another thread) ends the walk early like the
+    deadline does; the partial result has scan_stats["cancelled"] set.
+    """
+
+    aggregators, group_bits = group_aggregators(classifier, example_limit, example_order, path_limit, collectors)
+
+    if follow_symlinks or sample_limit:
+        index = None
+
+    integrations = 0
+    report = new_walk_report()
+    walk = walk_directories(
+        root, classifier, index,
+        workers=workers,
+        follow_symlinks=follow_symlinks,
+        max_depth=max_depth,
+        sample_limit=sample_limit,
+        deadline=deadline,
+        report=report,
+        cancel=cancel
+    )
+
+    index_stats = None
+    if index is None:
+        for rel_dir, record in walk:
+            integrations |= _aggregate_record(rel_dir, record, group_bits)
+    else:
+        # Hold the index lock so a watcher thread cannot update records mid-scan
+        with index.lock:
+            index.begin_scan()
+            for rel_dir, record in walk:
+                integrations |= _aggregate_record(rel_dir, record, group_bits)
+            index_stats = index.finish_scan(complete=not report["timed_out"])
+            # Identifies the index state this result reflects (see scan_service)
+            index_generation = index.generation
+
+    factor = 1.0
+    if report["timed_out"] and report["directories_scanned"]:
+        factor = estimate_total_directories(report) / report["directories_scanned"]
+    groups = {name: aggregator.result(factor) for name, aggregator in aggregators.items()}
+    report["extrapolation_factor"] = round(factor, 3)
+    for key in [key for key in report if key.startswith("_")]:
+        del report[key]
+
+    result = {
+        "groups": groups,
+        "integrations": classifier.integrations_in(integrations),
+        "scan_stats": report
+    }
+    if index_stats is not None:
+        result["index_stats"] = index_stats
+        result["index_generation"] = index_generation
+    return result
+
+def _aggregate_record(rel_dir: str, record: Dict[str, Any], group_bits: List[Tuple[int, "GroupAggregator"]]) -> int:
+    """Add a directory record's files to the group aggregators and return its integration mask"""
+
+    scale = record.get("scale", 1)
+    for file_record in record["files"]:
+        mask = file_record[FILE_MASK]
+        for bit, aggregator in group_bits:
+            if mask & bit:
+                aggregator.add(rel_dir, file_record, scale)
+    return record["integrations"]
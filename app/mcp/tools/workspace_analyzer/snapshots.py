@@ -0,0 +1,159 @@
+# app/mcp/tools/workspace_analyzer/snapshots.py
+import os
+import re
+import gzip
+import json
+import time
+import secrets
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from .scanner import FILE_NAME, FILE_SIZE, FILE_MTIME, FILE_MASK
+from .workspace_index import INDEX_DIR
+
+SNAPSHOT_VERSION = 1
+
+# Where snapshot manifests live (one gzipped JSON file per token)
+SNAPSHOT_DIR = Path(os.getenv("WORKSPACE_SNAPSHOT_DIR", str(INDEX_DIR.parent / "workspace-snapshots")))
+
+# Oldest snapshots are deleted beyond this many
+MAX_SNAPSHOTS = 64
+
+# Paths listed per change kind in a delta
+MAX_DELTA_PATHS = 200
+
+_TOKEN = re.compile(r"[0-9a-f]{32}")
+
+class ManifestCollector:
+    """
+    Record every classified file's size, mtime and pattern groups during a scan.
+
+    Plugs into scan_workspace as an extra collector over all pattern groups;
+    files are keyed by directory so a later diff can skip directories whose
+    entries are unchanged with a single comparison.
+    """
+
+    __slots__ = ("directories",)
+
+    def __init__(self):
+        self.directories: Dict[str, Dict[str, List[int]]] = {}
+
+    def add(self, rel_dir: str, file_record: List[Any], scale: float = 1) -> None:
+        files = self.directories.get(rel_dir)
+        if files is None:
+            files = self.directories[rel_dir] = {}
+        files[file_record[FILE_NAME]] = [file_record[FILE_SIZE], file_record[FILE_MTIME], file_record[FILE_MASK]]
+
+def save_snapshot(root: Path, manifest: Dict[str, Dict[str, List[int]]], summary: Dict[str, Any]) -> str:
+    """Persist a manifest with the analysis summary it produced and return its token"""
+
+    token = secrets.token_hex(16)
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "root": os.path.abspath(root),
+        "created": time.time(),
+        "manifest": manifest,
+        "summary": summary
+    }
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = SNAPSHOT_DIR / f"{token}.tmp"
+    with gzip.open(tmp_file, 'wt', compresslevel=1) as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_file, SNAPSHOT_DIR / f"{token}.json.gz")
+    _prune_snapshots()
+    return token
+
+def _prune_snapshots() -> None:
+    try:
+        snapshots = sorted(SNAPSHOT_DIR.glob("*.json.gz"), key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for stale in snapshots[:-MAX_SNAPSHOTS]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+def load_snapshot(root: Path, token: str) -> Optional[Dict[str, Any]]:
+    """Return a snapshot taken of the same root, or None if the token is unknown or expired"""
+
+    if not _TOKEN.fullmatch(token):
+        return None
+    try:
+        with gzip.open(SNAPSHOT_DIR / f"{token}.json.gz", 'rt') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != SNAPSHOT_VERSION or data.get("root") != os.path.abspath(root):
+        return None
+    return data
+
+def diff_manifests(
+    old: Dict[str, Dict[str, List[int]]],
+    new: Dict[str, Dict[str, List[int]]],
+    group_names: List[str]
+) -> Dict[str, Any]:
+    """
+    Compare two manifests file by file.
+
+    Returns added, removed and modified paths (at most MAX_DELTA_PATHS of
+    each, with full counts) and per pattern group count and size changes.
+    A file counts as modified when its size or mtime changed.
+    """
+
+    changes = {"added": [], "removed": [], "modified": []}
+    counts = {"added": 0, "removed": 0, "modified": 0}
+    group_deltas = [[0, 0] for _ in group_names]
+
+    def record(kind: str, rel_dir: str, name: str) -> None:
+        counts[kind] += 1
+        if len(changes[kind]) < MAX_DELTA_PATHS:
+            changes[kind].append(os.path.join(rel_dir, name) if rel_dir else name)
+
+    def account(entry: List[int], sign: int) -> None:
+        size, _, mask = entry
+        for bit in range(len(group_names)):
+            if mask & (1 << bit):
+                group_deltas[bit][0] += sign
+                group_deltas[bit][1] += sign * size
+
+    for rel_dir in sorted(old.keys() | new.keys()):
+        old_files = old.get(rel_dir, {})
+        new_files = new.get(rel_dir, {})
+        if old_files == new_files:
+            continue
+        for name, entry in new_files.items():
+            previous = old_files.get(name)
+            if previous is None:
+                record("added", rel_dir, name)
+            elif previous != entry:
+                record("modified", rel_dir, name)
+            else:
+                continue
+            if previous is not None:
+                account(previous, -1)
+            account(entry, 1)
+        for name, entry in old_files.items():
+            if name not in new_files:
+                record("removed", rel_dir, name)
+                account(entry, -1)
+
+    return {
+        **changes,
+        "counts": counts,
+        "pattern_changes": {
+            name: {"count_delta": count, "size_delta": size}
+            for name, (count, size) in zip(group_names, group_deltas)
+            if count or size
+        }
+    }
+
+def diff_summaries(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Compare the suggestion types and integrations of two analyses"""
+
+    result = {}
+    for key in ("suggestions", "integrations"):
+        before, after = old.get(key, []), new.get(key, [])
+        result[f"{key}_added"] = [item for item in after if item not in before]
+        result[f"{key}_removed"] = [item for item in before if item not in after]
+    return result
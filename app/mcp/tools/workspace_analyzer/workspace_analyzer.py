@@ -1,12 +1,69 @@
 # app/mcp/tools/workspace_analyzer/workspace_analyzer.py
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import json
+import time
+from datetime import datetime, timezone
 
 from app.mcp.server import mcp
+from app.mcp.io_executor import run_io, run_cancellable
+from fastmcp import Context
 from pydantic import BaseModel, Field
 
+from .scanner import PATTERNS_CONFIG, EXAMPLE_ORDERS, DEFAULT_EXAMPLE_LIMIT
+from .scan_service import get_scan_service
+from .client_manifest import scan_manifest
+from .content_scanner import scan_file_contents, MAX_SCAN_SECONDS
+from .data_profiler import profile_data_files, MAX_PROFILE_SECONDS
+from .duplicate_finder import SizeBuckets, find_duplicates, MAX_HASH_SECONDS
+from .code_stats import LanguageCollector, language_stats, MAX_COUNT_SECONDS
+from .file_statistics import FileStatsCollector
+from .snapshots import ManifestCollector, save_snapshot, load_snapshot, diff_manifests, diff_summaries
+from .batch_analysis import iter_workspace_analyses, rollup_analyses, batch_worker_count
+
+# Cost contract of each analysis depth
+DEPTH_MODES = {
+    "shallow": {
+        "max_depth": 3,           # Only the top directory levels are listed
+        "sample_limit": 200,      # Larger directories are sampled and extrapolated
+        "content_scan": False,
+        "profile_data": False,
+        "detect_duplicates": False,
+        "language_stats": False,
+        "file_statistics": False
+    },
+    "standard": {
+        "max_depth": None,
+        "sample_limit": None,
+        "content_scan": False,
+        "profile_data": False,
+        "detect_duplicates": False,
+        "language_stats": False,
+        "file_statistics": False
+    },
+    "deep": {
+        "max_depth": None,
+        "sample_limit": None,
+        "content_scan": True,
+        "profile_data": True,
+        "detect_duplicates": True,
+        "language_stats": True,
+        "file_statistics": True
+    }
+}
+
+# Pattern groups whose hottest files are surfaced; every group keeps its own hot examples,
+# so the top DEFAULT_EXAMPLE_LIMIT across them come out of the walk without extra I/O
+HOT_FILE_GROUPS = ["data_files", "config_files", "scripts"]
+
+# Lines of script code that make orchestrating the scripts worthwhile
+SCRIPT_ORCHESTRATION_MIN_LINES = 500
+
+# Paths per pattern group handed to content scanning and data profiling, both of
+# which stop long before this many files under their byte and time caps
+FOLLOW_UP_PATHS_PER_GROUP = 4096
+
 class WorkspaceAnalysisInput(BaseModel):
     """Input for workspace analysis"""
     target_directory: str = Field(
@@ -15,12 +72,67 @@ class WorkspaceAnalysisInput(BaseModel):
     )
     analysis_depth: str = Field(
         "standard",
-        description="Analysis depth: shallow, standard, or deep"
+        description="Analysis depth: shallow (top levels only, large directories sampled), standard (full metadata walk), or deep (standard plus content scanning, data profiling, duplicate detection, language and file statistics)"
+    )
+    time_budget_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Wall-clock budget for the analysis. When it runs out, partial results are returned with extrapolated counts"
+    )
+    example_order: str = Field(
+        "hot",
+        description="How example files are chosen per pattern: hot (most often changed, then most recently modified, first), size (largest first) or recent (most recently modified first)"
+    )
+    snapshot: bool = Field(
+        False,
+        description="Return a snapshot_token recording every matched file's path, size and mtime for later delta requests"
+    )
+    since_snapshot: Optional[str] = Field(
+        None,
+        description="snapshot_token of a previous analysis: return only what changed since then (plus a new token). Falls back to a full result if the token expired"
     )
     include_suggestions: bool = Field(
         True,
         description="Whether to include automation suggestions based on findings"
     )
+    use_index: bool = Field(
+        True,
+        description="Reuse the persistent workspace index so only directories changed since the last analysis are rescanned"
+    )
+    parallel_workers: int = Field(
+        0,
+        ge=0,
+        le=64,
+        description="Number of directories to list concurrently (0 or 1 = serial walk). Speeds up high-latency filesystems such as NFS"
+    )
+    follow_symlinks: bool = Field(
+        False,
+        description="Descend into symlinked directories (each physical directory is analyzed once; bypasses the workspace index)"
+    )
+    content_scan: bool = Field(
+        False,
+        description="Also detect integrations from the first 64 KB of each matched file (byte- and time-capped)"
+    )
+    detect_duplicates: bool = Field(
+        False,
+        description="Find identical data and script files and report the bytes their extra copies take up"
+    )
+    profile_data: bool = Field(
+        False,
+        description="Infer columns, types, null ratios and row counts of CSV/JSONL/JSON files from head and tail samples (byte- and time-capped)"
+    )
+    language_stats: bool = Field(
+        False,
+        description="Count files, bytes, lines and blank lines of scripts per language (byte- and time-capped; unchanged files are served from a cache)"
+    )
+    file_statistics: bool = Field(
+        False,
+        description="Summarize matched files' size percentiles and histogram, extensions, largest directories and depths (no extra I/O)"
+    )
+    manifest: Optional[str] = Field(
+        None,
+        description="Listing of the client's workspace to analyze instead of the server's filesystem, for remote servers: base64 of gzip- or zlib-compressed UTF-8 text with one 'size<TAB>mtime<TAB>relative/path' line per file. target_directory then only names the workspace, and stages that read file contents are skipped"
+    )
 
 class FilePattern(BaseModel):
     """Information about discovered file patterns"""
@@ -38,6 +150,91 @@ class AutomationSuggestion(BaseModel):
     estimated_value: str = Field(..., description="Expected value/time savings")
     files_involved: List[str] = Field(..., description="Files that would be processed")
 
+class DuplicateGroup(BaseModel):
+    """Files with identical contents"""
+    size_bytes: int = Field(..., description="Size of each copy in bytes")
+    files: List[str] = Field(..., description="Paths of the identical files")
+    reclaimable_bytes: int = Field(..., description="Bytes freed by keeping a single copy")
+
+class HotFile(BaseModel):
+    """A file that changes often or was modified recently"""
+    path: str = Field(..., description="File path relative to the analyzed directory")
+    pattern_types: List[str] = Field(..., description="Pattern types the file belongs to")
+    size_bytes: int = Field(..., description="File size in bytes")
+    modified: str = Field(..., description="Last modification time (ISO 8601, UTC)")
+    changes: int = Field(..., description="Modifications observed by the workspace index across analyses")
+
+class IntegrationEvidence(BaseModel):
+    """Integration indicators found inside file contents"""
+    integration_type: str = Field(..., description="Type of integration detected")
+    hit_count: int = Field(..., description="Total indicator matches across scanned files")
+    file_count: int = Field(..., description="Number of files containing at least one indicator")
+    files: List[str] = Field(..., description="Example files containing indicators")
+
+class ColumnProfile(BaseModel):
+    """A column inferred from sampled rows of a data file"""
+    name: str = Field(..., description="Column name or JSON key")
+    type: str = Field(..., description="Inferred type: integer, number, boolean, date, string, array, object, null or mixed")
+    null_ratio: float = Field(..., description="Share of sampled rows where the value is empty or missing")
+
+class DataFileProfile(BaseModel):
+    """Schema of a data file inferred from head and tail samples"""
+    path: str = Field(..., description="File path relative to the analyzed directory")
+    format: str = Field(..., description="csv, jsonl or json")
+    size_bytes: int = Field(..., description="File size in bytes")
+    columns: List[ColumnProfile] = Field(..., description="Inferred columns")
+    sampled_rows: int = Field(..., description="Rows parsed from the samples")
+    estimated_rows: Optional[int] = Field(None, description="Estimated total rows (exact when the whole file was sampled)")
+    bytes_sampled: int = Field(..., description="Bytes read from the file")
+
+class LanguageStats(BaseModel):
+    """Size of the scripts written in one language"""
+    language: str = Field(..., description="Language name")
+    files: int = Field(..., description="Number of files")
+    bytes: int = Field(..., description="Total size in bytes")
+    lines: int = Field(..., description="Lines in the counted files")
+    blank_lines: int = Field(..., description="Whitespace-only lines in the counted files")
+    code_lines: int = Field(..., description="Non-blank lines in the counted files")
+    counted_files: int = Field(..., description="Files whose lines were counted (all of them unless the budget ran out)")
+
+class ExtensionTotal(BaseModel):
+    """Files sharing one extension"""
+    extension: str = Field(..., description="Lower-cased extension, or (none)")
+    files: int = Field(..., description="Number of files")
+    bytes: int = Field(..., description="Total size in bytes")
+
+class DirectoryTotal(BaseModel):
+    """Matched files directly inside one directory"""
+    path: str = Field(..., description="Directory relative to the analyzed directory")
+    files: int = Field(..., description="Number of matched files")
+    bytes: int = Field(..., description="Total size of the matched files in bytes")
+
+class FileStatistics(BaseModel):
+    """Distribution of matched files by size, extension, directory and depth"""
+    files: int = Field(..., description="Files the statistics were computed from")
+    total_bytes: int = Field(..., description="Total size in bytes")
+    size_percentiles: Dict[str, int] = Field(..., description="File size in bytes at the p50, p90 and p99 percentiles")
+    size_histogram: Dict[str, Dict[str, int]] = Field(..., description="files and bytes per size bucket")
+    extensions: List[ExtensionTotal] = Field(..., description="Most common extensions")
+    largest_directories: List[DirectoryTotal] = Field(..., description="Directories holding the most bytes of matched files")
+    depth_histogram: Dict[str, int] = Field(..., description="Files per directory depth (0 = analyzed directory)")
+    engine: str = Field(..., description="numpy (vectorized) or python")
+    elapsed_ms: float = Field(..., description="Time spent computing the statistics after the walk")
+    truncated: bool = Field(..., description="True when there were more files than the collector records")
+
+class WorkspaceDelta(BaseModel):
+    """Changes since a previous snapshot"""
+    base_token: str = Field(..., description="Snapshot the delta is relative to")
+    added: List[str] = Field(..., description="New matched files (capped; see counts)")
+    removed: List[str] = Field(..., description="Matched files that disappeared (capped; see counts)")
+    modified: List[str] = Field(..., description="Matched files whose size or mtime changed (capped; see counts)")
+    counts: Dict[str, int] = Field(..., description="Total added, removed and modified files")
+    pattern_changes: Dict[str, Dict[str, int]] = Field(..., description="Per pattern group count_delta and size_delta")
+    suggestions_added: List[str] = Field(..., description="Automation types newly suggested")
+    suggestions_removed: List[str] = Field(..., description="Automation types no longer suggested")
+    integrations_added: List[str] = Field(..., description="Newly detected integration opportunities")
+    integrations_removed: List[str] = Field(..., description="Integration opportunities no longer detected")
+
 class WorkspaceAnalysisOutput(BaseModel):
     """Output from workspace analysis"""
     analysis_summary: str = Field(..., description="High-level summary of the workspace")
@@ -46,6 +243,115 @@ class WorkspaceAnalysisOutput(BaseModel):
     integration_opportunities: List[str] = Field(..., description="Detected integration opportunities")
     total_files_analyzed: int = Field(..., description="Total number of files analyzed")
     workspace_health_score: str = Field(..., description="Overall workspace organization score")
+    hot_files: Optional[List[HotFile]] = Field(
+        None,
+        description="Most active data, config and script files (most changes, then most recent first), when examples are ordered by hot"
+    )
+    index_stats: Optional[Dict[str, int]] = Field(
+        None,
+        description="Workspace index directory hits (reused), misses (rescanned), refreshed (reused, but with files edited in place) and removed counts, when the index was used"
+    )
+    content_integrations: Optional[List[IntegrationEvidence]] = Field(
+        None,
+        description="Integrations detected from file contents, when content scanning was requested"
+    )
+    content_scan_stats: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Files scanned, bytes read, elapsed time and whether the content scan hit its budget"
+    )
+    data_profiles: Optional[List[DataFileProfile]] = Field(
+        None,
+        description="Inferred schemas of data files, when data profiling was requested"
+    )
+    data_profile_stats: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Files profiled, bytes read, elapsed time and whether profiling hit its budget"
+    )
+    file_statistics: Optional[FileStatistics] = Field(
+        None,
+        description="Size, extension, directory and depth distributions, when file statistics were requested"
+    )
+    language_stats: Optional[List[LanguageStats]] = Field(
+        None,
+        description="Per-language script statistics, most lines first, when language statistics were requested"
+    )
+    language_stats_info: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Files counted, cache hits, bytes read, elapsed time and whether line counting hit its budget"
+    )
+    duplicate_groups: Optional[List[DuplicateGroup]] = Field(
+        None,
+        description="Largest groups of identical data and script files, when duplicate detection was requested"
+    )
+    duplicate_stats: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Duplicate groups and files, reclaimable bytes, bytes hashed versus considered, and whether the search hit its budget"
+    )
+    snapshot_token: Optional[str] = Field(
+        None,
+        description="Token to pass as since_snapshot next time, when a snapshot was requested and the analysis was complete"
+    )
+    delta: Optional[WorkspaceDelta] = Field(
+        None,
+        description="Changes since since_snapshot. When set, file_patterns, automation_suggestions and integration_opportunities only list what changed"
+    )
+    is_partial: bool = Field(
+        False,
+        description="True when the time budget ran out; file counts and sizes are then extrapolated"
+    )
+    scan_stats: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Directories scanned, pending, depth-limited, pruned by ignore rules and sampled, plus the extrapolation factor applied"
+    )
+
+class WorkspaceBatchInput(BaseModel):
+    """Input for analyzing several workspaces at once"""
+    target_directories: List[str] = Field(
+        ...,
+        min_length=1,
+        description="Directories to analyze, e.g. every service folder of a monorepo"
+    )
+    options: WorkspaceAnalysisInput = Field(
+        default_factory=WorkspaceAnalysisInput,
+        description="Analysis settings applied to every directory (its target_directory is ignored)"
+    )
+    max_workers: int = Field(
+        0,
+        ge=0,
+        le=32,
+        description="Worker processes (0 = one per CPU core, never more than the number of directories)"
+    )
+
+class WorkspaceRootResult(BaseModel):
+    """Analysis of one directory in a batch"""
+    target_directory: str = Field(..., description="Directory analyzed")
+    analysis: Optional[WorkspaceAnalysisOutput] = Field(None, description="Analysis result, unless it failed")
+    error: Optional[str] = Field(None, description="Why the analysis failed")
+    elapsed_ms: float = Field(..., description="Time spent analyzing this directory")
+
+class PatternRollup(BaseModel):
+    """A file pattern summed across directories"""
+    file_count: int = Field(..., description="Matching files across all directories")
+    total_size_mb: float = Field(..., description="Total size in MB across all directories")
+    roots: int = Field(..., description="Number of directories the pattern appears in")
+
+class WorkspaceRollup(BaseModel):
+    """Combined view over every successfully analyzed directory"""
+    total_files_analyzed: int = Field(..., description="Files analyzed across all directories")
+    file_patterns: Dict[str, PatternRollup] = Field(..., description="Per pattern type totals, most files first")
+    integration_opportunities: Dict[str, int] = Field(..., description="Integration opportunities by number of roots they were detected in")
+    automation_suggestions: Dict[str, int] = Field(..., description="Suggested automation types by number of roots they were suggested for")
+    health_scores: Dict[str, int] = Field(..., description="Number of roots per workspace health grade")
+
+class WorkspaceBatchOutput(BaseModel):
+    """Output from a multi-root workspace analysis"""
+    results: List[WorkspaceRootResult] = Field(..., description="Per-directory results, in completion order")
+    rollup: WorkspaceRollup = Field(..., description="Totals across all successfully analyzed directories")
+    roots_analyzed: int = Field(..., description="Directories analyzed successfully")
+    roots_failed: int = Field(..., description="Directories whose analysis failed")
+    partial_roots: List[str] = Field(..., description="Directories whose time budget ran out before the analysis completed")
+    workers: int = Field(..., description="Worker processes used")
+    elapsed_ms: float = Field(..., description="Wall-clock time for the whole batch")
 
 @mcp.tool(
     description="Analyze a workspace to identify automation opportunities, file patterns, and integration possibilities."
@@ -66,11 +372,34 @@ async def analyze_workspace(input_data: WorkspaceAnalysisInput) -> WorkspaceAnal
     """
     
     target_path = Path(input_data.target_directory)
-    if not target_path.exists():
+    if input_data.manifest is None and not await run_io(target_path.exists):
         raise ValueError(f"Directory '{input_data.target_directory}' does not exist")
+    if input_data.analysis_depth not in DEPTH_MODES:
+        raise ValueError(f"Analysis depth '{input_data.analysis_depth}' must be one of: {', '.join(DEPTH_MODES)}")
+    if input_data.example_order not in EXAMPLE_ORDERS:
+        raise ValueError(f"Example order '{input_data.example_order}' must be one of: {', '.join(EXAMPLE_ORDERS)}")
+    
+    deadline = None
+    if input_data.time_budget_ms:
+        deadline = time.monotonic() + input_data.time_budget_ms / 1000
     
     # Perform the analysis
-    analysis = await _perform_workspace_analysis(target_path, input_data.analysis_depth)
+    analysis = await _perform_workspace_analysis(
+        target_path,
+        input_data.analysis_depth,
+        use_index=input_data.use_index,
+        workers=input_data.parallel_workers,
+        follow_symlinks=input_data.follow_symlinks,
+        content_scan=input_data.content_scan,
+        profile_data=input_data.profile_data,
+        detect_duplicates=input_data.detect_duplicates,
+        count_languages=input_data.language_stats,
+        file_statistics=input_data.file_statistics,
+        example_order=input_data.example_order,
+        client_manifest=input_data.manifest,
+        collect_manifest=input_data.snapshot or input_data.since_snapshot is not None,
+        deadline=deadline
+    )
     
     # Generate automation suggestions if requested
     suggestions = []
@@ -80,109 +409,297 @@ async def analyze_workspace(input_data: WorkspaceAnalysisInput) -> WorkspaceAnal
     # Calculate workspace health score
     health_score = await _calculate_workspace_health(analysis)
     
+    patterns = analysis["patterns"]
+    integrations = analysis["integrations"]
+    snapshot_token = None
+    delta = None
+    manifest = analysis.get("manifest")
+    # Partial or sampled manifests would make the next delta report phantom changes
+    if manifest is not None and not analysis["is_partial"]:
+        summary = {
+            "suggestions": [suggestion.automation_type for suggestion in suggestions],
+            "integrations": integrations
+        }
+        if input_data.since_snapshot:
+            base = await run_io(load_snapshot, target_path, input_data.since_snapshot)
+            if base is not None:
+                # Diffing millions of entries is CPU-bound; on the executor it cannot stall the loop
+                changes = await run_io(diff_manifests, base["manifest"], manifest, list(PATTERNS_CONFIG))
+                delta = WorkspaceDelta(
+                    base_token=input_data.since_snapshot,
+                    **changes,
+                    **diff_summaries(base["summary"], summary)
+                )
+        try:
+            snapshot_token = await run_io(save_snapshot, target_path, manifest, summary)
+        except OSError:
+            snapshot_token = None
+    
+    if delta is not None:
+        # Only ship what changed
+        changed_types = {name.replace("_", " ").title() for name in delta.pattern_changes}
+        patterns = [pattern for pattern in patterns if pattern.pattern_type in changed_types]
+        suggestions = [suggestion for suggestion in suggestions if suggestion.automation_type in delta.suggestions_added]
+        integrations = delta.integrations_added
+        analysis["summary"] = (
+            f"{delta.counts['added']} added, {delta.counts['removed']} removed and {delta.counts['modified']} modified "
+            f"files since the previous snapshot. {analysis['summary']}"
+        )
+    
     return WorkspaceAnalysisOutput(
         analysis_summary=analysis["summary"],
-        file_patterns=analysis["patterns"],
+        file_patterns=patterns,
         automation_suggestions=suggestions,
-        integration_opportunities=analysis["integrations"],
+        integration_opportunities=integrations,
         total_files_analyzed=analysis["total_files"],
-        workspace_health_score=health_score
+        workspace_health_score=health_score,
+        hot_files=analysis.get("hot_files"),
+        index_stats=analysis.get("index_stats"),
+        content_integrations=analysis.get("content_integrations"),
+        content_scan_stats=analysis.get("content_scan_stats"),
+        data_profiles=analysis.get("data_profiles"),
+        data_profile_stats=analysis.get("data_profile_stats"),
+        file_statistics=analysis.get("file_statistics"),
+        language_stats=analysis.get("language_stats"),
+        language_stats_info=analysis.get("language_stats_info"),
+        duplicate_groups=analysis.get("duplicate_groups"),
+        duplicate_stats=analysis.get("duplicate_stats"),
+        snapshot_token=snapshot_token,
+        delta=delta,
+        is_partial=analysis.get("is_partial", False),
+        scan_stats=analysis.get("scan_stats")
     )
 
-async def _perform_workspace_analysis(target_path: Path, depth: str) -> Dict[str, Any]:
-    """Perform the actual workspace analysis"""
+@mcp.tool(
+    description="Analyze several workspaces in parallel across worker processes, streaming each result as it completes and returning a combined roll-up."
+)
+async def analyze_workspaces(input_data: WorkspaceBatchInput, ctx: Optional[Context] = None) -> WorkspaceBatchOutput:
+    """
+    Run analyze_workspace over many directories at once.
+    
+    Directories are analyzed in a pool of worker processes sized to the
+    machine's cores. Each finished directory is streamed to the client as a
+    progress notification plus a log message carrying its full result, so
+    early roots are usable while later ones are still being walked. The
+    final output lists every result and a roll-up across all of them.
+    """
+    
+    started = time.monotonic()
+    # Resolve and de-duplicate up front so worker processes see the same paths
+    roots = list(dict.fromkeys(os.path.abspath(directory) for directory in input_data.target_directories))
+    inputs = [input_data.options.model_copy(update={"target_directory": root}) for root in roots]
+    workers = batch_worker_count(len(roots), input_data.max_workers)
     
+    results = []
+    async for position, output, error, elapsed in iter_workspace_analyses(inputs, workers):
+        result = WorkspaceRootResult(
+            target_directory=roots[position],
+            analysis=output,
+            error=error,
+            elapsed_ms=round(elapsed * 1000, 1)
+        )
+        results.append(result)
+        if ctx is not None:
+            status = output.analysis_summary if output is not None else f"failed: {error}"
+            await ctx.report_progress(len(results), len(roots), f"{roots[position]}: {status}")
+            await ctx.info(f"{roots[position]} {'analyzed' if output is not None else 'failed'}", extra=result.model_dump(mode="json"))
+    
+    succeeded = [result.analysis for result in results if result.analysis is not None]
+    return WorkspaceBatchOutput(
+        results=results,
+        rollup=WorkspaceRollup(**rollup_analyses(succeeded)),
+        roots_analyzed=len(succeeded),
+        roots_failed=len(results) - len(succeeded),
+        partial_roots=[result.target_directory for result in results if result.analysis is not None and result.analysis.is_partial],
+        workers=workers,
+        elapsed_ms=round((time.monotonic() - started) * 1000, 1)
+    )
+
+async def _perform_workspace_analysis(
+    target_path: Path,
+    depth: str,
+    use_index: bool = False,
+    workers: int = 1,
+    follow_symlinks: bool = False,
+    content_scan: bool = False,
+    profile_data: bool = False,
+    detect_duplicates: bool = False,
+    count_languages: bool = False,
+    file_statistics: bool = False,
+    example_order: str = "hot",
+    client_manifest: Optional[str] = None,
+    collect_manifest: bool = False,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """Perform the actual workspace analysis within the cost contract of the requested depth"""
+    
+    mode = DEPTH_MODES.get(depth, DEPTH_MODES["standard"])
     analysis = {
         "patterns": [],
         "integrations": [],
         "total_files": 0,
-        "summary": ""
+        "summary": "",
+        "is_partial": False
     }
     
-    # Define file patterns to look for
-    patterns_config = {
-        "data_files": {
-            "extensions": [".csv", ".json", ".xlsx", ".xml", ".parquet", ".jsonl"],
-            "automation_type": "Data Processing System"
-        },
-        "api_docs": {
-            "patterns": ["*api*", "*swagger*", "*openapi*", "*.postman*"],
-            "automation_type": "API Integration System"
-        },
-        "config_files": {
-            "patterns": ["*.config.*", "*.env*", "config.*", "settings.*"],
-            "automation_type": "Configuration Management"
-        },
-        "templates": {
-            "extensions": [".template", ".tmpl", ".jinja2"],
-            "automation_type": "Template-Based Generation"
-        },
-        "scripts": {
-            "extensions": [".py", ".js", ".sh", ".bat", ".ps1"],
-            "automation_type": "Script Automation Enhancement"
-        }
-    }
+    content_scan = content_scan or mode["content_scan"]
+    profile_data = profile_data or mode["profile_data"]
+    detect_duplicates = detect_duplicates or mode["detect_duplicates"]
+    count_languages = count_languages or mode["language_stats"]
+    file_statistics = file_statistics or mode["file_statistics"]
     
-    pattern_results = {}
+    # A client-supplied manifest replaces the walk; stages that read file contents need the files themselves
+    if client_manifest is not None:
+        content_scan = profile_data = detect_duplicates = count_languages = False
     
-    # Analyze each pattern type
-    for pattern_name, config in patterns_config.items():
-        files = []
-        total_size = 0
-        
-        # Search by extensions
-        if "extensions" in config:
-            for ext in config["extensions"]:
-                for file_path in target_path.rglob(f"*{ext}"):
-                    if _should_include_file(file_path):
-                        files.append(file_path)
-                        total_size += file_path.stat().st_size
-        
-        # Search by patterns
-        if "patterns" in config:
-            for pattern in config["patterns"]:
-                for file_path in target_path.rglob(pattern):
-                    if _should_include_file(file_path) and file_path.is_file():
-                        files.append(file_path)
-                        total_size += file_path.stat().st_size
-        
-        if files:
-            pattern_results[pattern_name] = {
-                "files": files,
-                "total_size": total_size,
-                "automation_type": config["automation_type"]
-            }
+    # Duplicate candidates are bucketed by size while the scan streams past
+    size_buckets = SizeBuckets() if detect_duplicates else None
+    collectors = [(["data_files", "scripts"], size_buckets)] if size_buckets else []
+    
+    # Scripts are tallied per language during the walk; their lines are counted afterwards
+    languages = LanguageCollector() if count_languages else None
+    if languages is not None:
+        collectors.append((["scripts"], languages))
+    
+    # Sizes, extensions and directories go into typed arrays and are summarized after the walk
+    file_stats = FileStatsCollector() if file_statistics else None
+    if file_stats is not None:
+        collectors.append((list(PATTERNS_CONFIG), file_stats))
+    
+    # Snapshots record every matched file; sampled listings cannot be diffed reliably
+    manifest = None
+    if collect_manifest and not mode["sample_limit"]:
+        manifest = ManifestCollector()
+        collectors.append((list(PATTERNS_CONFIG), manifest))
+    
+    # Classify every entry against all pattern groups and integration indicators in one walk,
+    # aggregating as it goes so memory does not grow with the number of files. The shared
+    # scan service reuses results other tools already computed for an unchanged tree
+    if client_manifest is not None:
+        scan = await run_cancellable(
+            scan_manifest,
+            client_manifest,
+            max_depth=mode["max_depth"],
+            deadline=deadline,
+            example_order=example_order,
+            collectors=collectors or None
+        )
+    else:
+        scan = await get_scan_service().scan_async(
+            target_path,
+            use_index=use_index,
+            workers=workers,
+            follow_symlinks=follow_symlinks,
+            max_depth=mode["max_depth"],
+            sample_limit=mode["sample_limit"],
+            deadline=deadline,
+            example_order=example_order,
+            path_limit=FOLLOW_UP_PATHS_PER_GROUP if (content_scan or profile_data) else 0,
+            collectors=collectors or None
+        )
+    analysis["scan_stats"] = scan["scan_stats"]
+    analysis["is_partial"] = scan["scan_stats"]["timed_out"] or scan["scan_stats"].get("manifest", {}).get("truncated", False)
+    if "index_stats" in scan:
+        analysis["index_stats"] = scan["index_stats"]
+    if manifest is not None:
+        analysis["manifest"] = manifest.directories
     
     # Convert to FilePattern objects
-    for pattern_name, data in pattern_results.items():
-        examples = [str(f.relative_to(target_path)) for f in data["files"][:5]]
+    for pattern_name, group in scan["groups"].items():
+        if not group["count"]:
+            continue
         
         analysis["patterns"].append(FilePattern(
             pattern_type=pattern_name.replace("_", " ").title(),
-            file_count=len(data["files"]),
-            total_size_mb=data["total_size"] / (1024 * 1024),
-            examples=examples,
-            automation_opportunity=data["automation_type"]
+            file_count=group["count"],
+            total_size_mb=group["total_size"] / (1024 * 1024),
+            examples=group["examples"],
+            automation_opportunity=PATTERNS_CONFIG[pattern_name]["automation_type"]
         ))
         
-        analysis["total_files"] += len(data["files"])
-    
-    # Look for integration opportunities
-    integration_indicators = {
-        "Database": [".sql", "database.py", "db_config", "connection_string"],
-        "Cloud Services": ["aws", "azure", "gcp", "s3", "blob"],
-        "APIs": ["api_key", "endpoint", "webhook", "rest", "graphql"],
-        "Monitoring": ["logging", "metrics", "alerts", "monitoring"],
-        "CI/CD": [".github", ".gitlab", "jenkins", "docker", "kubernetes"]
-    }
+        analysis["total_files"] += group["count"]
+    
+    # The walk already ranked every group's files by churn and recency; merge the top of each
+    if example_order == "hot":
+        hot: Dict[str, Dict[str, Any]] = {}
+        for group_name in HOT_FILE_GROUPS:
+            for example in scan["groups"][group_name]["example_files"]:
+                entry = hot.setdefault(example["path"], {**example, "pattern_types": []})
+                entry["pattern_types"].append(group_name.replace("_", " ").title())
+        ranked = sorted(hot.values(), key=lambda entry: entry["rank"], reverse=True)[:DEFAULT_EXAMPLE_LIMIT]
+        analysis["hot_files"] = [
+            HotFile(
+                path=entry["path"],
+                pattern_types=entry["pattern_types"],
+                size_bytes=entry["size"],
+                modified=datetime.fromtimestamp(entry["mtime_ns"] / 1e9, timezone.utc).isoformat(timespec="seconds"),
+                changes=entry["changes"]
+            )
+            for entry in ranked
+        ]
     
-    for integration_type, indicators in integration_indicators.items():
-        for indicator in indicators:
-            # Check in file names and content (basic)
-            matches = list(target_path.rglob(f"*{indicator}*"))
-            if matches:
+    # Integration opportunities detected from file and directory names
+    for integration_type in scan["integrations"]:
+        analysis["integrations"].append(f"{integration_type} integration detected")
+    
+    # Integration opportunities detected from file contents (one capped pass over the matched files)
+    if content_scan:
+        max_seconds = MAX_SCAN_SECONDS
+        if deadline is not None:
+            max_seconds = min(max_seconds, max(0.0, deadline - time.monotonic()))
+        candidates = dict.fromkeys(
+            rel_path for group in scan["groups"].values() for rel_path in group["paths"]
+        )
+        content = await run_io(scan_file_contents, target_path, candidates, max_seconds=max_seconds)
+        if content["stats"]["truncated"] and deadline is not None and time.monotonic() >= deadline:
+            analysis["is_partial"] = True
+        analysis["content_integrations"] = [
+            IntegrationEvidence(integration_type=integration_type, **evidence)
+            for integration_type, evidence in content["integrations"].items()
+        ]
+        analysis["content_scan_stats"] = content["stats"]
+        for integration_type in content["integrations"]:
+            if integration_type not in scan["integrations"]:
                 analysis["integrations"].append(f"{integration_type} integration detected")
-                break
+    
+    # Schemas of data files, sampled from their heads and tails
+    if profile_data:
+        max_seconds = MAX_PROFILE_SECONDS
+        if deadline is not None:
+            max_seconds = min(max_seconds, max(0.0, deadline - time.monotonic()))
+        profiled = await run_io(profile_data_files, target_path, scan["groups"]["data_files"]["paths"], max_seconds=max_seconds)
+        if profiled["stats"]["truncated"] and deadline is not None and time.monotonic() >= deadline:
+            analysis["is_partial"] = True
+        analysis["data_profiles"] = [DataFileProfile(**profile) for profile in profiled["profiles"]]
+        analysis["data_profile_stats"] = profiled["stats"]
+    
+    if file_stats is not None:
+        analysis["file_statistics"] = FileStatistics(**await run_io(file_stats.summary))
+    
+    # Files, bytes, lines and blank lines per language
+    if languages is not None:
+        max_seconds = MAX_COUNT_SECONDS
+        if deadline is not None:
+            max_seconds = min(max_seconds, max(0.0, deadline - time.monotonic()))
+        counted = await run_io(language_stats, target_path, languages, max_seconds=max_seconds)
+        if counted["stats"]["truncated"] and deadline is not None and time.monotonic() >= deadline:
+            analysis["is_partial"] = True
+        analysis["language_stats"] = [
+            LanguageStats(language=language, **totals) for language, totals in counted["languages"].items()
+        ]
+        analysis["language_stats_info"] = counted["stats"]
+        analysis["largest_scripts"] = counted["largest_files"]
+    
+    # Identical data and script files: size buckets, then edge hashes, then full hashes
+    if size_buckets is not None:
+        max_seconds = MAX_HASH_SECONDS
+        if deadline is not None:
+            max_seconds = min(max_seconds, max(0.0, deadline - time.monotonic()))
+        duplicates = await run_io(find_duplicates, target_path, size_buckets, max_seconds=max_seconds)
+        if duplicates["stats"]["truncated"] and deadline is not None and time.monotonic() >= deadline:
+            analysis["is_partial"] = True
+        analysis["duplicate_groups"] = [DuplicateGroup(**group) for group in duplicates["groups"]]
+        analysis["duplicate_stats"] = duplicates["stats"]
     
     # Generate summary
     total_patterns = len(analysis["patterns"])
@@ -195,38 +712,41 @@ async def _perform_workspace_analysis(target_path: Path, depth: str) -> Dict[str
     else:
         analysis["summary"] = "Workspace appears to be primarily code-based with limited automation file patterns"
     
-    return analysis
-
-def _should_include_file(file_path: Path) -> bool:
-    """Determine if a file should be included in analysis"""
+    if analysis["is_partial"]:
+        if analysis["scan_stats"].get("manifest", {}).get("truncated"):
+            analysis["summary"] += " (partial: manifest size limit reached, counts extrapolated)"
+        else:
+            analysis["summary"] += " (partial: time budget reached, counts extrapolated)"
     
-    # Skip hidden directories and common ignore patterns
-    ignore_patterns = [
-        ".git", "__pycache__", "node_modules", ".pytest_cache", 
-        ".venv", "venv", ".env", "dist", "build"
-    ]
-    
-    path_parts = file_path.parts
-    for ignore in ignore_patterns:
-        if ignore in path_parts:
-            return False
-    
-    # Skip very large files (over 100MB) for performance
-    try:
-        if file_path.stat().st_size > 100 * 1024 * 1024:
-            return False
-    except (OSError, IOError):
-        return False
-    
-    return True
+    return analysis
 
 async def _generate_automation_suggestions(analysis: Dict[str, Any]) -> List[AutomationSuggestion]:
     """Generate automation suggestions based on workspace analysis"""
     
     suggestions = []
     
+    # Largest profiled datasets first; they are what a pipeline would process
+    profiles = sorted(analysis.get("data_profiles") or [], key=lambda p: p.estimated_rows or 0, reverse=True)
+    
     for pattern in analysis["patterns"]:
-        if pattern.pattern_type == "Data Files":
+        if pattern.pattern_type == "Data Files" and profiles:
+            total_rows = sum(p.estimated_rows or 0 for p in profiles)
+            formats = "/".join(sorted({p.format.upper() for p in profiles}))
+            largest = profiles[0]
+            suggestions.append(AutomationSuggestion(
+                automation_type="Data Processing Pipeline",
+                description=(
+                    f"Process {pattern.file_count} data files (~{total_rows} rows across {len(profiles)} profiled {formats} files; "
+                    f"largest: {largest.path} with columns {', '.join(c.name for c in largest.columns[:6])}) "
+                    f"with validation, transformation, and reporting"
+                ),
+                confidence="High",
+                estimated_value=f"Save 2-4 hours per processing cycle with {pattern.file_count} files",
+                files_involved=[p.path for p in profiles[:5]]
+            ))
+            suggestions.extend(_profile_suggestions(profiles))
+        
+        elif pattern.pattern_type == "Data Files":
             suggestions.append(AutomationSuggestion(
                 automation_type="Data Processing Pipeline",
                 description=f"Process {pattern.file_count} data files with validation, transformation, and reporting",
@@ -262,6 +782,20 @@ async def _generate_automation_suggestions(analysis: Dict[str, Any]) -> List[Aut
                 files_involved=pattern.examples
             ))
         
+        elif pattern.pattern_type == "Scripts" and analysis.get("language_stats"):
+            # Judge by how much code there is, not by how many files happen to hold it
+            stats = analysis["language_stats"]
+            code_lines = sum(language.code_lines for language in stats)
+            if pattern.file_count > 1 and code_lines >= SCRIPT_ORCHESTRATION_MIN_LINES:
+                breakdown = ", ".join(f"{language.code_lines} {language.language}" for language in stats if language.code_lines)
+                suggestions.append(AutomationSuggestion(
+                    automation_type="Script Orchestration",
+                    description=f"Create workflow automation to orchestrate {pattern.file_count} scripts with {code_lines} lines of code ({breakdown})",
+                    confidence="High" if code_lines >= 10 * SCRIPT_ORCHESTRATION_MIN_LINES else "Medium",
+                    estimated_value="Reduce manual script execution, improve reliability",
+                    files_involved=analysis.get("largest_scripts", [])[:3] or pattern.examples[:3]
+                ))
+        
         elif pattern.pattern_type == "Scripts" and pattern.file_count > 10:
             suggestions.append(AutomationSuggestion(
                 automation_type="Script Orchestration",
@@ -271,6 +805,58 @@ async def _generate_automation_suggestions(analysis: Dict[str, Any]) -> List[Aut
                 files_involved=pattern.examples[:3]  # Just show a few examples
             ))
     
+    duplicate_stats = analysis.get("duplicate_stats")
+    if duplicate_stats and duplicate_stats["duplicate_files"]:
+        suggestions.append(AutomationSuggestion(
+            automation_type="Duplicate File Cleanup",
+            description=(
+                f"Deduplicate {duplicate_stats['duplicate_files']} redundant copies in "
+                f"{duplicate_stats['duplicate_groups']} groups of identical files"
+            ),
+            confidence="High",
+            estimated_value=f"Reclaim {duplicate_stats['reclaimable_bytes'] / (1024 * 1024):.1f} MB and keep a single source of truth",
+            files_involved=[path for group in analysis["duplicate_groups"][:3] for path in group.files[:2]]
+        ))
+    
+    return suggestions
+
+def _profile_suggestions(profiles: List[DataFileProfile]) -> List[AutomationSuggestion]:
+    """Suggest validation and reporting automations from inferred data file schemas"""
+    
+    suggestions = []
+    # Single JSON objects are usually configuration, not datasets
+    profiles = [profile for profile in profiles if profile.sampled_rows > 1]
+    
+    # Columns with gaps or inconsistent types need validation before processing
+    gaps = [
+        (profile, column) for profile in profiles for column in profile.columns
+        if column.null_ratio > 0 or column.type == "mixed"
+    ]
+    if gaps:
+        examples = ", ".join(f"{column.name} in {profile.path}" for profile, column in gaps[:3])
+        suggestions.append(AutomationSuggestion(
+            automation_type="Data Quality Validation",
+            description=f"Validate {len(gaps)} column{'s' if len(gaps) != 1 else ''} with missing or mixed-type values (e.g. {examples})",
+            confidence="High",
+            estimated_value="Catch bad records before they reach downstream systems",
+            files_involved=list(dict.fromkeys(profile.path for profile, _ in gaps))[:5]
+        ))
+    
+    # Numeric columns are natural inputs for scheduled summary reports
+    numeric = [
+        (profile, column) for profile in profiles for column in profile.columns
+        if column.type in ("integer", "number")
+    ]
+    if numeric:
+        examples = ", ".join(f"{column.name} in {profile.path}" for profile, column in numeric[:3])
+        suggestions.append(AutomationSuggestion(
+            automation_type="Automated Reporting",
+            description=f"Aggregate {len(numeric)} numeric column{'s' if len(numeric) != 1 else ''} into scheduled summary reports (e.g. {examples})",
+            confidence="Medium",
+            estimated_value="Replace manual spreadsheet summaries with generated reports",
+            files_involved=list(dict.fromkeys(profile.path for profile, _ in numeric))[:5]
+        ))
+    
     return suggestions
 
 async def _calculate_workspace_health(analysis: Dict[str, Any]) -> str:
@@ -282,6 +868,20 @@ async def _calculate_workspace_health(analysis: Dict[str, Any]) -> str:
         "automation_potential": min(100, analysis["total_files"] * 2)  # More files = more potential
     }
     
+    # With line counts, scripts weigh by their code (every 50 lines count like one file) instead of their number
+    language_stats = analysis.get("language_stats")
+    if language_stats:
+        script_files = sum(language.files for language in language_stats)
+        code_lines = sum(language.code_lines for language in language_stats)
+        other_files = max(0, analysis["total_files"] - script_files)
+        score_factors["automation_potential"] = min(100, other_files * 2 + code_lines // 25)
+    
+    # Redundant copies count against organization, in proportion to the bytes they waste
+    duplicate_stats = analysis.get("duplicate_stats")
+    if duplicate_stats and duplicate_stats["bytes_considered"]:
+        wasted_share = duplicate_stats["reclaimable_bytes"] / duplicate_stats["bytes_considered"]
+        score_factors["duplication"] = -min(50, int(wasted_share * 100))
+    
     total_score = sum(score_factors.values())
     
     if total_score >= 100:
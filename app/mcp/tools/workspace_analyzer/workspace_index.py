@@ -0,0 +1,239 @@
+# app/mcp/tools/workspace_analyzer/workspace_index.py
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .scanner import (
+    EntryClassifier, DEFAULT_CLASSIFIER, FILE_NAME, FILE_SIZE, FILE_MTIME,
+    list_directory, carry_churn, restat_files
+)
+from .ignore_rules import IgnoreRules, stat_ignore_file, root_ignore_rules
+
+INDEX_VERSION = 3
+
+# Where persisted workspace indexes live (one JSON lines file per workspace root)
+INDEX_DIR = Path(os.getenv(
+    "WORKSPACE_INDEX_DIR",
+    str(Path.home() / ".cache" / "cursor-automation-builder" / "workspace-index")
+))
+
+class WorkspaceIndex:
+    """
+    Persistent per-directory index of a workspace.
+
+    Each directory record stores the directory's mtime together with its
+    classified files (name, size, mtime, pattern groups) and subdirectory
+    names. A directory's mtime changes whenever an entry is added, removed
+    or renamed in it, so a later scan only re-lists directories whose mtime
+    changed. Every other record is reused without listing or classifying
+    anything, but its files are re-stat'ed (see restat_files), since
+    writing a file in place leaves the directory mtime untouched. Each
+    re-listing or re-stat also counts, per file, how often its mtime
+    changed since it was first indexed (see carry_churn), which ranks
+    "hot" files without reading any history. Records also
+    remember the ignore rules they were listed under: editing any
+    .gitignore/.ignore file re-lists the directory holding it and every
+    directory below.
+
+    When a WorkspaceWatcher keeps the index live, records are trusted
+    without touching the disk at all.
+    """
+
+    def __init__(self, root: Path, classifier: EntryClassifier = DEFAULT_CLASSIFIER):
+        self.root = Path(os.path.abspath(root))
+        self.classifier = classifier
+        root_key = hashlib.sha1(str(self.root).encode()).hexdigest()[:16]
+        self.index_file = INDEX_DIR / f"{root_key}.jsonl"
+        self.directories: Dict[str, Dict[str, Any]] = {}
+        self._visited: Dict[str, Dict[str, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        # Reused directories whose files changed in place
+        self._refreshed = 0
+        self._changed = False
+        # Bumped whenever records change, so cached scan results can tell they are stale
+        self.generation = 0
+        # Set by a WorkspaceWatcher while it keeps every record up to date
+        self.live = False
+        # Guards records shared between scans and the watcher thread
+        self.lock = threading.RLock()
+        self._counter_lock = threading.Lock()
+        self._load()
+
+    def _header(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "signature": self.classifier.signature
+        }
+
+    def _load(self) -> None:
+        """
+        Load the persisted index, discarding it if it was built with other rules.
+
+        The file holds a header line and then one [rel_dir, record] line per
+        directory. Decoding line by line lets other threads (such as a
+        server's event loop) run between directories, where decoding one
+        large document would hold the interpreter until it was done.
+        """
+
+        directories = {}
+        try:
+            with open(self.index_file, 'r') as f:
+                if json.loads(f.readline() or "null") != self._header():
+                    return
+                for line in f:
+                    rel_dir, record = json.loads(line)
+                    directories[rel_dir] = record
+        except (OSError, ValueError, TypeError):
+            return
+        self.directories = directories
+
+    def save(self) -> None:
+        """Persist the index atomically, one directory per line; an unwritable cache only costs the next cold start"""
+
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, 'w') as f:
+                f.write(json.dumps(self._header(), separators=(",", ":")) + "\n")
+                for rel_dir, record in self.directories.items():
+                    f.write(json.dumps([rel_dir, record], separators=(",", ":")) + "\n")
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            pass
+
+    def begin_scan(self) -> None:
+        """Reset per-scan bookkeeping"""
+
+        self._visited = {}
+        self._hits = 0
+        self._misses = 0
+        self._refreshed = 0
+
+    def get_directory(self, rel_dir: str, dir_path: str, ignore: Optional[IgnoreRules] = None) -> Dict[str, Any]:
+        """
+        Return the record for a directory, re-listing it only if its mtime or ignore rules changed.
+
+        A reused record's files are re-stat'ed unless the index is live (the
+        watcher already sees in-place writes).
+        """
+
+        if ignore is None:
+            ignore = IgnoreRules()
+        record = self.directories.get(rel_dir)
+        hit = record is not None and (self.live or self._is_current(record, dir_path, ignore))
+        refreshed = False
+        if hit and not self.live:
+            try:
+                fresh = restat_files(record, dir_path)
+            except OSError:
+                hit = False
+            else:
+                refreshed = fresh is not record
+                record = fresh
+        if not hit:
+            record = carry_churn(record, list_directory(dir_path, self.classifier, ignore=ignore))
+
+        # Parallel walks call this from several threads at once
+        with self._counter_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._refreshed += refreshed
+            self._visited[rel_dir] = record
+        return record
+
+    @staticmethod
+    def _is_current(record: Dict[str, Any], dir_path: str, ignore: IgnoreRules) -> bool:
+        if os.stat(dir_path).st_mtime_ns != record["mtime_ns"]:
+            return False
+        if record.get("ignore", "") != ignore.signature:
+            return False
+        # Ignore files edited in place leave the directory mtime alone
+        return all(
+            stat_ignore_file(os.path.join(dir_path, name)) == stat
+            for name, stat in record.get("ignore_files", {}).items()
+        )
+
+    def unchanged_on_disk(self) -> bool:
+        """
+        Check every indexed directory's mtime and ignore files, and every indexed file's size and mtime, without listing anything.
+
+        True means a scan would serve every record from the index as-is,
+        files written in place included.
+        """
+
+        if not self.directories:
+            return False
+        root = str(self.root)
+        root_record = self.directories.get("")
+        if root_record is None or root_record.get("ignore", "") != root_ignore_rules(root).signature:
+            return False
+        try:
+            for rel_dir, record in self.directories.items():
+                dir_path = os.path.join(root, rel_dir) if rel_dir else root
+                if os.stat(dir_path).st_mtime_ns != record["mtime_ns"]:
+                    return False
+                for name, stat in record.get("ignore_files", {}).items():
+                    if stat_ignore_file(os.path.join(dir_path, name)) != stat:
+                        return False
+                for file_record in record["files"]:
+                    stat = os.stat(os.path.join(dir_path, file_record[FILE_NAME]))
+                    if stat.st_size != file_record[FILE_SIZE] or stat.st_mtime_ns != file_record[FILE_MTIME]:
+                        return False
+        except OSError:
+            return False
+        return True
+
+    def mark_changed(self) -> None:
+        """Flag records updated outside a scan so the next scan persists them"""
+
+        self._changed = True
+        self.generation += 1
+
+    def finish_scan(self, complete: bool = True) -> Dict[str, int]:
+        """
+        Drop directories that no longer exist, persist changes and return hit/miss counts.
+
+        An incomplete scan (stopped by a time budget) only adds what it
+        visited; unvisited directories are kept for the next scan.
+        """
+
+        if complete:
+            removed = len(self.directories.keys() - self._visited.keys())
+            self.directories = self._visited
+        else:
+            removed = 0
+            self.directories.update(self._visited)
+        self._visited = {}
+        if self._misses or self._refreshed or removed:
+            self.generation += 1
+        # A live index is persisted when its watcher stops, keeping hot scans free of disk writes
+        if (self._misses or self._refreshed or removed or self._changed) and not self.live:
+            self._changed = False
+            self.save()
+
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "refreshed": self._refreshed,
+            "removed": removed
+        }
+
+# Indexes already loaded in this process, keyed by absolute root
+_indexes: Dict[str, WorkspaceIndex] = {}
+
+def get_workspace_index(root: Path, classifier: EntryClassifier = DEFAULT_CLASSIFIER) -> WorkspaceIndex:
+    """Return the in-memory index for a root, loading it from disk on first use"""
+
+    key = os.path.abspath(root)
+    index: Optional[WorkspaceIndex] = _indexes.get(key)
+    if index is None or index.classifier is not classifier:
+        index = WorkspaceIndex(Path(key), classifier)
+        _indexes[key] = index
+    return index
@@ -0,0 +1,407 @@
+# app/mcp/tools/workspace_analyzer/workspace_watcher.py
+import os
+import time
+import errno
+import ctypes
+import ctypes.util
+import logging
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, List, Iterator, Optional, Set
+
+from .scanner import list_directory, scan_workspace, carry_churn
+from .ignore_rules import IgnoreRules, IGNORE_FILE_NAMES, inherited_ignore_rules
+from .workspace_index import WorkspaceIndex, get_workspace_index
+
+logger = logging.getLogger("cursor_automation_builder_mcp")
+
+# inotify event masks (see inotify(7))
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Upper bounds that keep a watcher's memory independent of event volume
+MAX_WATCHES = int(os.getenv("WORKSPACE_WATCH_MAX_DIRS", "65536"))
+MAX_PENDING_DIRS = 4096
+MAX_REVALIDATE_SUBTREES = 256
+READ_BUFFER_SIZE = 64 * 1024
+
+# Event bursts are applied once they go quiet, or after the max latency at the latest
+DEBOUNCE_SECONDS = 0.2
+MAX_LATENCY_SECONDS = 1.0
+
+_libc = None
+
+def _inotify():
+    """Load libc's inotify functions, raising OSError where inotify is unavailable"""
+
+    global _libc
+    if _libc is None:
+        if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+def _check(result: int) -> int:
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+def _depth(rel_dir: str) -> int:
+    return rel_dir.count(os.sep) + 1 if rel_dir else 0
+
+def _ancestors(rel_dir: str) -> Iterator[str]:
+    while rel_dir:
+        rel_dir = os.path.dirname(rel_dir)
+        yield rel_dir
+
+def common_ancestors(rel_dirs: Set[str], limit: int = MAX_REVALIDATE_SUBTREES) -> Set[str]:
+    """
+    Collapse directories into at most limit subtree roots covering all of them.
+
+    The deepest directories are replaced by their parents first, so a burst
+    confined to a few subtrees collapses to those subtrees and only a burst
+    spread over the whole workspace reaches the root (""). Directories
+    below another returned directory are left out.
+    """
+
+    roots = set(rel_dirs)
+    while len(roots) > limit:
+        deepest = max(_depth(rel_dir) for rel_dir in roots)
+        roots = {os.path.dirname(rel_dir) if _depth(rel_dir) == deepest else rel_dir for rel_dir in roots}
+    return {rel_dir for rel_dir in roots if not any(ancestor in roots for ancestor in _ancestors(rel_dir))}
+
+class WorkspaceWatcher:
+    """
+    Keep a workspace index live from Linux inotify events.
+
+    Every indexed directory gets a watch. Events only mark their directory
+    dirty; bursts are coalesced and each dirty directory is re-listed once,
+    so counts, sizes and integration flags stay current while scans read
+    the in-memory records without touching the disk. A queue overflow or a
+    burst touching more than MAX_PENDING_DIRS directories falls back to an
+    revalidation: the dirty directories collapse to their common ancestors
+    (see common_ancestors) and every directory in those subtrees is
+    re-listed, since lost events may have been writes in place. The whole
+    index is only revalidated (by a scan, which re-stats every indexed
+    file) when the queue overflowed before any directory was known. Changes to
+    .gitignore/.ignore files revalidate the subtree of their directory,
+    since they can change what is indexed anywhere below it. If the watch
+    limit is reached the index simply stops being live and scans revert to
+    mtime checks.
+    """
+
+    def __init__(self, root: Path, index: Optional[WorkspaceIndex] = None):
+        self.index = index or get_workspace_index(root)
+        self.root = self.index.root
+        self._fd = -1
+        self._wd_to_dir: Dict[int, str] = {}
+        self._dir_to_wd: Dict[str, int] = {}
+        self._degraded = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Synchronize the index with the disk, watch every directory and start the event thread"""
+
+        self._fd = _check(_inotify().inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+
+        with self.index.lock:
+            # Watches go in before the sync so changes made during it are not lost
+            for rel_dir in list(self.index.directories):
+                self._add_watch(rel_dir)
+            self.index.live = False
+            scan_workspace(self.root, self.index.classifier, index=self.index)
+            for rel_dir in self.index.directories:
+                if rel_dir not in self._dir_to_wd:
+                    self._add_watch(rel_dir)
+            self.index.live = not self._degraded
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"workspace-watcher:{self.root}",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {len(self._dir_to_wd)} directories under {self.root}")
+
+    def stop(self) -> None:
+        """Stop the event thread, close inotify and persist the index"""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        with self.index.lock:
+            self.index.live = False
+            self.index.save()
+
+    @property
+    def is_live(self) -> bool:
+        return self.index.live
+
+    def _add_watch(self, rel_dir: str) -> None:
+        if rel_dir in self._dir_to_wd:
+            return
+        if len(self._dir_to_wd) >= MAX_WATCHES:
+            self._degrade(f"watch limit of {MAX_WATCHES} directories reached")
+            return
+
+        dir_path = os.path.join(str(self.root), rel_dir) if rel_dir else str(self.root)
+        wd = _inotify().inotify_add_watch(self._fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                # Removed before we got to it; the parent's event will drop its record
+                return
+            self._degrade(f"cannot watch {dir_path}: {os.strerror(err)}")
+            return
+
+        self._wd_to_dir[wd] = rel_dir
+        self._dir_to_wd[rel_dir] = wd
+
+    def _remove_watch(self, rel_dir: str) -> None:
+        wd = self._dir_to_wd.pop(rel_dir, None)
+        if wd is not None:
+            self._wd_to_dir.pop(wd, None)
+            # Fails harmlessly when the kernel already dropped the watch
+            _inotify().inotify_rm_watch(self._fd, wd)
+
+    def _degrade(self, reason: str) -> None:
+        if not self._degraded:
+            logger.warning(f"Workspace watcher for {self.root} is no longer live: {reason}")
+        self._degraded = True
+        self.index.live = False
+
+    def _run(self) -> None:
+        pending: Set[str] = set()
+        # Subtrees to revalidate; overflow means the whole root
+        subtrees: Set[str] = set()
+        overflow = False
+        first_event = last_event = 0.0
+
+        while not self._stop.is_set():
+            dirty = pending or subtrees or overflow
+            timeout = DEBOUNCE_SECONDS if dirty else 0.5
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+
+            if readable:
+                now = time.monotonic()
+                if not dirty:
+                    first_event = now
+                last_event = now
+                try:
+                    if self._read_events(pending, subtrees):
+                        # Events were lost: revalidate around the directories seen so far,
+                        # or everything if there are none
+                        if pending or subtrees:
+                            subtrees |= pending
+                            pending.clear()
+                        else:
+                            overflow = True
+                except BlockingIOError:
+                    pass
+                if len(pending) > MAX_PENDING_DIRS or len(subtrees) > MAX_REVALIDATE_SUBTREES:
+                    subtrees = common_ancestors(subtrees | pending)
+                    pending.clear()
+
+            if not (pending or subtrees or overflow):
+                continue
+            now = time.monotonic()
+            if now - last_event >= DEBOUNCE_SECONDS or now - first_event >= MAX_LATENCY_SECONDS:
+                try:
+                    self._apply(pending, subtrees, overflow)
+                except Exception as e:
+                    logger.error(f"Workspace watcher for {self.root} failed to apply changes: {e}")
+                    self._degrade(str(e))
+                pending = set()
+                subtrees = set()
+                overflow = False
+
+    def _read_events(self, pending: Set[str], subtrees: Set[str]) -> bool:
+        """
+        Drain queued events into the pending directory set; return True on a queue overflow.
+
+        Directories with a changed ignore file go into subtrees instead.
+        """
+
+        buffer = os.read(self._fd, READ_BUFFER_SIZE)
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+            name = buffer[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + name_len].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + name_len
+
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            rel_dir = self._wd_to_dir.get(wd)
+            if rel_dir is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wd_to_dir.pop(wd, None)
+                self._dir_to_wd.pop(rel_dir, None)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # The parent directory's listing decides what happened to this subtree
+                rel_dir = os.path.dirname(rel_dir)
+            elif os.fsdecode(name) in IGNORE_FILE_NAMES:
+                subtrees.add(rel_dir)
+                continue
+            pending.add(rel_dir)
+        return overflow
+
+    def _apply(self, pending: Set[str], subtrees: Set[str], overflow: bool) -> None:
+        """Revalidate subtrees, re-list the other dirty directories (parents first) and fold the results into the index"""
+
+        with self.index.lock:
+            if overflow or "" in subtrees:
+                self._revalidate()
+                return
+            relisted = self._revalidate_subtrees(subtrees) if subtrees else set()
+            # Files written in place leave the directory mtime alone, so dirty directories are re-listed regardless
+            for rel_dir in sorted(pending - relisted, key=lambda d: (d.count(os.sep), d)):
+                self._refresh_directory(rel_dir)
+            self.index.mark_changed()
+
+    def _refresh_directory(self, rel_dir: str) -> None:
+        directories = self.index.directories
+        old_record = directories.get(rel_dir)
+        if old_record is None:
+            # Part of a subtree that was already replaced or dropped
+            return
+
+        dir_path = os.path.join(str(self.root), rel_dir) if rel_dir else str(self.root)
+        ignore = inherited_ignore_rules(str(self.root), rel_dir, directories)
+        try:
+            record = list_directory(dir_path, self.index.classifier, ignore=ignore)
+        except OSError:
+            self._drop_subtree(rel_dir)
+            return
+        directories[rel_dir] = carry_churn(old_record, record)
+
+        old_subdirs = set(old_record["subdirs"])
+        new_subdirs = set(record["subdirs"])
+        for name in old_subdirs - new_subdirs:
+            self._drop_subtree(os.path.join(rel_dir, name) if rel_dir else name)
+        child_ignore = ignore.extend(dir_path, record.get("ignore_files"))
+        for name in new_subdirs - old_subdirs:
+            self._index_subtree(os.path.join(rel_dir, name) if rel_dir else name, child_ignore)
+
+    def _index_subtree(self, rel_dir: str, ignore: IgnoreRules) -> None:
+        """Watch and list a directory that appeared, including anything moved in with it"""
+
+        stack = [(rel_dir, ignore)]
+        while stack:
+            current, ignore = stack.pop()
+            self._add_watch(current)
+            dir_path = os.path.join(str(self.root), current)
+            try:
+                record = list_directory(dir_path, self.index.classifier, ignore=ignore)
+            except OSError:
+                self._remove_watch(current)
+                continue
+            self.index.directories[current] = record
+            child_ignore = ignore.extend(dir_path, record.get("ignore_files"))
+            stack.extend((os.path.join(current, name), child_ignore) for name in record["subdirs"])
+
+    def _drop_subtree(self, rel_dir: str) -> None:
+        prefix = rel_dir + os.sep
+        stale = [
+            d for d in self.index.directories
+            if not rel_dir or d == rel_dir or d.startswith(prefix)
+        ]
+        for d in stale:
+            del self.index.directories[d]
+            self._remove_watch(d)
+
+    def _revalidate(self) -> None:
+        """Recover from lost events: re-list only directories whose mtime changed"""
+
+        logger.info(f"Workspace watcher for {self.root} lost events or root ignore rules changed; revalidating")
+        live = self.index.live
+        self.index.live = False
+        scan_workspace(self.root, self.index.classifier, index=self.index)
+        for rel_dir in list(self._dir_to_wd):
+            if rel_dir not in self.index.directories:
+                self._remove_watch(rel_dir)
+        for rel_dir in self.index.directories:
+            self._add_watch(rel_dir)
+        self.index.live = live and not self._degraded
+
+    def _revalidate_subtrees(self, subtrees: Set[str]) -> Set[str]:
+        """
+        Re-list every indexed directory below subtrees, parents first; return the re-listed ones.
+
+        Lost events may have been writes in place, which leave directory
+        mtimes alone, so nothing below subtrees is trusted.
+        """
+
+        logger.info(f"Workspace watcher for {self.root} re-listing {len(subtrees)} subtrees")
+        below = [
+            rel_dir for rel_dir in self.index.directories
+            if rel_dir in subtrees or any(ancestor in subtrees for ancestor in _ancestors(rel_dir))
+        ]
+        for rel_dir in sorted(below, key=lambda d: (d.count(os.sep), d)):
+            # Skips directories dropped along with a re-listed parent
+            self._refresh_directory(rel_dir)
+        return set(below)
+
+# Running watchers, keyed by absolute root
+_watchers: Dict[str, WorkspaceWatcher] = {}
+
+def start_workspace_watchers(roots: List[str]) -> List[WorkspaceWatcher]:
+    """Start a watcher per workspace root; roots that cannot be watched are logged and skipped"""
+
+    started = []
+    for root in roots:
+        key = os.path.abspath(root)
+        if key in _watchers:
+            continue
+        if not os.path.isdir(key):
+            logger.warning(f"Not watching '{root}': directory does not exist")
+            continue
+        watcher = WorkspaceWatcher(Path(key))
+        try:
+            watcher.start()
+        except OSError as e:
+            logger.warning(f"Not watching '{root}': {e}")
+            continue
+        _watchers[key] = watcher
+        started.append(watcher)
+    return started
+
+def stop_workspace_watchers() -> None:
+    """Stop every running watcher"""
+
+    while _watchers:
+        _, watcher = _watchers.popitem()
+        watcher.stop()
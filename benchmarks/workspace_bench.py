@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# benchmarks/workspace_bench.py
+"""
+Workspace Analyzer Benchmarks
+Times the analyzer on reproducible synthetic workspaces and compares the
+results against the committed baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.workspace_bench                      # compare with baseline.json
+    python -m benchmarks.workspace_bench --sizes 10k,100k,1m  # include the 1M-entry trees
+    python -m benchmarks.workspace_bench --update-baseline    # record a new baseline
+    python -m benchmarks.workspace_bench --memory-check       # peak memory on 1M-entry trees
+
+Exits with status 1 when any measurement exceeds the baseline by more than
+the regression threshold, or when a file edited in place is missing from
+a snapshot delta. --memory-check instead generates 1M-entry trees and
+exits with status 1 when peak memory grows with tree size.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import builtins
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+
+# Bump when tree generation changes so cached trees are rebuilt
+GENERATOR_VERSION = 1
+
+SHAPES = ["wide", "deep", "node_modules", "data"]
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = ["10k", "100k"]
+
+# A measurement regresses when it grows by more than this share of the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and by more than this absolute amount, so microsecond stages do not flap on noise
+MIN_REGRESSION = {"wall_ms": 5.0, "peak_rss_mb": 8.0, "fs_calls": 10, "loop_lag_ms": 2.0}
+
+# Most peak RSS a 1M-entry tree may take over the 10k-entry tree of the same shape (--memory-check):
+# aggregation keeps counts, sums and a few examples per group, so memory must not grow with the tree
+MAX_RSS_GROWTH_MB = 32.0
+
+# Longest the event loop may stall while an analysis runs, whatever the baseline says
+MAX_LOOP_LAG_MS = 10.0
+# How often the loop lag probe wakes up
+LOOP_PROBE_INTERVAL = 0.001
+
+SCRIPT_EXTENSIONS = [".py", ".js", ".sh", ".ts"]
+DATA_EXTENSIONS = [".csv", ".json", ".jsonl", ".parquet"]
+OTHER_EXTENSIONS = [".md", ".txt", ".yml", ".html", ".png", ".lock"]
+DATA_CONTENT = b"id,name,value\n1,alpha,0.5\n2,beta,1.5\n"
+
+def _file_name(rng: random.Random, index: int, data_share: float) -> str:
+    roll = rng.random()
+    if roll < data_share:
+        extension = rng.choice(DATA_EXTENSIONS)
+    elif roll < data_share + (1 - data_share) / 2:
+        extension = rng.choice(SCRIPT_EXTENSIONS)
+    else:
+        extension = rng.choice(OTHER_EXTENSIONS)
+    return f"f{index:07d}{extension}"
+
+def _write_files(directory: Path, count: int, rng: random.Random, start: int, data_share: float) -> int:
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(start, start + count):
+        name = _file_name(rng, index, data_share)
+        with open(directory / name, 'wb') as f:
+            if name.endswith(tuple(DATA_EXTENSIONS)):
+                f.write(DATA_CONTENT)
+    return count
+
+def generate_tree(root: Path, shape: str, entries: int, seed: int) -> None:
+    """Create a synthetic workspace of roughly `entries` files and directories"""
+
+    rng = random.Random(f"{shape}-{entries}-{seed}")
+    written = 0
+    if shape == "wide":
+        # A handful of directories holding thousands of entries each
+        per_dir = 10_000
+        for d in range(max(1, entries // per_dir)):
+            written += _write_files(root / f"bulk{d:03d}", min(per_dir, entries - written) - 1, rng, written, 0.3) + 1
+    elif shape == "deep":
+        # Chains of 24 nested directories with a few files at every level
+        depth, per_dir = 24, 9
+        chain = 0
+        while written < entries:
+            directory = root / f"chain{chain:05d}"
+            for level in range(depth):
+                directory = directory / f"level{level:02d}"
+                written += _write_files(directory, per_dir, rng, written, 0.2) + 1
+                if written >= entries:
+                    break
+            chain += 1
+    elif shape == "node_modules":
+        # 90% of entries inside node_modules, which the analyzer prunes
+        vendored = int(entries * 0.9)
+        package = 0
+        while written < vendored:
+            package_dir = root / "node_modules" / f"pkg{package:05d}"
+            written += _write_files(package_dir / "lib", 40, rng, written, 0.05) + 2
+            written += _write_files(package_dir, 8, rng, written, 0.1)
+            package += 1
+        module = 0
+        while written < entries:
+            written += _write_files(root / "src" / f"module{module:04d}", 50, rng, written, 0.1) + 1
+            module += 1
+    elif shape == "data":
+        # Mostly data files spread over dated partitions
+        partition = 0
+        while written < entries:
+            directory = root / "datasets" / f"source{partition % 20:02d}" / f"day{partition:05d}"
+            written += _write_files(directory, min(500, entries - written), rng, written, 0.8) + 1
+            partition += 1
+    else:
+        raise ValueError(f"Unknown shape '{shape}', expected one of: {', '.join(SHAPES)}")
+
+def ensure_tree(workdir: Path, shape: str, entries: int, seed: int) -> Path:
+    """Return a generated tree, reusing one built by an earlier run"""
+
+    root = workdir / f"{shape}-{entries}-s{seed}-v{GENERATOR_VERSION}"
+    # The marker lives next to the tree so it is not counted as one of its entries
+    marker = root.with_name(root.name + ".complete")
+    if marker.exists():
+        return root
+    if root.exists():
+        shutil.rmtree(root)
+    print(f"  generating {shape} tree with {entries:,} entries...", flush=True)
+    generate_tree(root, shape, entries, seed)
+    marker.touch()
+    return root
+
+class _FsCallCounter:
+    """Count directory listings, stats (including DirEntry.stat) and file opens"""
+
+    def __init__(self):
+        self.counts = {"scandir": 0, "stat": 0, "open": 0}
+
+    def install(self) -> None:
+        counts = self.counts
+        original_scandir, original_stat, original_open = os.scandir, os.stat, builtins.open
+
+        class CountingEntry:
+            __slots__ = ("_entry",)
+
+            def __init__(self, entry):
+                self._entry = entry
+
+            def stat(self, *args, **kwargs):
+                counts["stat"] += 1
+                return self._entry.stat(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(self._entry, name)
+
+        class CountingScandir:
+            def __init__(self, iterator):
+                self._iterator = iterator
+
+            def __iter__(self):
+                return (CountingEntry(entry) for entry in self._iterator)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._iterator.close()
+
+        def scandir(*args, **kwargs):
+            counts["scandir"] += 1
+            return CountingScandir(original_scandir(*args, **kwargs))
+
+        def stat(*args, **kwargs):
+            counts["stat"] += 1
+            return original_stat(*args, **kwargs)
+
+        def counting_open(*args, **kwargs):
+            counts["open"] += 1
+            return original_open(*args, **kwargs)
+
+        os.scandir, os.stat, builtins.open = scandir, stat, counting_open
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+async def _probe_loop_lag(lags: List[float]) -> None:
+    """Wake up every LOOP_PROBE_INTERVAL and record how late each wake-up was, in ms"""
+
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LOOP_PROBE_INTERVAL
+        await asyncio.sleep(LOOP_PROBE_INTERVAL)
+        lags.append((loop.time() - expected) * 1000)
+
+async def _measure(root: Path, depth: str, repeat: int) -> Dict[str, Any]:
+    from app.mcp.io_executor import freeze_startup_objects
+    from app.mcp.tools.workspace_analyzer.workspace_analyzer import (
+        _perform_workspace_analysis, _generate_automation_suggestions, _calculate_workspace_health
+    )
+    # The servers freeze startup objects once their tools are registered
+    freeze_startup_objects()
+
+    timings: Dict[str, List[float]] = {"analysis": [], "suggestions": [], "health": []}
+    analysis = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        analysis = await _perform_workspace_analysis(root, depth)
+        timings["analysis"].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await _generate_automation_suggestions(analysis)
+        timings["suggestions"].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await _calculate_workspace_health(analysis)
+        timings["health"].append((time.perf_counter() - started) * 1000)
+    peak_rss_mb = _peak_rss_mb()
+
+    # Another client's view of the server: how late the event loop answers while a scan runs.
+    # Probed in an untimed run, since the probe itself competes for the interpreter
+    lags: List[float] = []
+    probe = asyncio.create_task(_probe_loop_lag(lags))
+    await _perform_workspace_analysis(root, depth)
+    probe.cancel()
+    lags.sort()
+
+    # Counted separately so the proxies do not slow down the timed runs
+    counter = _FsCallCounter()
+    counter.install()
+    await _perform_workspace_analysis(root, depth)
+
+    return {
+        "files_analyzed": analysis["total_files"],
+        "stages": {
+            stage: {"wall_ms": round(statistics.median(runs), 3), "runs_ms": [round(run, 3) for run in runs]}
+            for stage, runs in timings.items()
+        },
+        "fs_calls": counter.counts,
+        "peak_rss_mb": peak_rss_mb,
+        "loop_lag_ms": {
+            "max": round(lags[-1], 3) if lags else 0.0,
+            "p99": round(lags[int(len(lags) * 0.99)], 3) if lags else 0.0
+        }
+    }
+
+def _edit_in_place(path: Path) -> None:
+    """Append to a file without touching its directory, moving its mtime even on filesystems with coarse timestamps"""
+
+    stat = os.stat(path)
+    with open(path, 'ab') as f:
+        f.write(DATA_CONTENT * 100)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+async def _snapshot_delta_misses(root: Path, name: str, options: Dict[str, Any]) -> Optional[str]:
+    """Snapshot root, edit name in place, take the delta and return why it missed the edit, or None"""
+
+    from app.mcp.tools.workspace_analyzer.workspace_analyzer import analyze_workspace, WorkspaceAnalysisInput
+
+    analyze = getattr(analyze_workspace, "fn", analyze_workspace)
+    options = {"target_directory": str(root), **options}
+    # A first analysis fills the workspace index, so the snapshot itself is served from it
+    await analyze(WorkspaceAnalysisInput(**options))
+    first = await analyze(WorkspaceAnalysisInput(snapshot=True, **options))
+    _edit_in_place(root / name)
+    second = await analyze(WorkspaceAnalysisInput(since_snapshot=first.snapshot_token, **options))
+
+    if second.delta is None:
+        return "snapshot delta missing"
+    if name not in second.delta.modified:
+        return f"edit to {name} missing from delta (modified={second.delta.modified})"
+    return None
+
+async def _check_snapshot_delta(workdir: Path) -> Optional[str]:
+    """
+    Edit files in place between two snapshots and make sure the deltas report them.
+
+    Covers the default options, where the workspace index serves unchanged
+    directories, and a plain walk without the index. Returns why a check
+    failed, or None.
+    """
+
+    root = workdir / "snapshot-check"
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True)
+    try:
+        (root / "indexed.csv").write_bytes(DATA_CONTENT)
+        failure = await _snapshot_delta_misses(root, "indexed.csv", {})
+        if failure:
+            return f"default options: {failure}"
+
+        (root / "walked.csv").write_bytes(DATA_CONTENT)
+        failure = await _snapshot_delta_misses(root, "walked.csv", {"use_index": False})
+        if failure:
+            return f"without the index: {failure}"
+        return None
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def run_check(workdir: Path) -> Optional[str]:
+    """Run the correctness checks in a fresh interpreter; returns why they failed, or None"""
+
+    command = [sys.executable, "-m", "benchmarks.workspace_bench", "--run-check", str(workdir)]
+    with tempfile.TemporaryDirectory() as index_dir:
+        env = {**os.environ, "WORKSPACE_INDEX_DIR": index_dir, "PYTHONPATH": str(REPO_ROOT)}
+        completed = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark checks failed to run:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_case(root: Path, depth: str, repeat: int) -> Dict[str, Any]:
+    """Measure one tree in a fresh interpreter so peak RSS and caches belong to it alone"""
+
+    command = [
+        sys.executable, "-m", "benchmarks.workspace_bench",
+        "--run-case", json.dumps({"root": str(root), "depth": depth, "repeat": repeat})
+    ]
+    with tempfile.TemporaryDirectory() as index_dir:
+        env = {**os.environ, "WORKSPACE_INDEX_DIR": index_dir, "PYTHONPATH": str(REPO_ROOT)}
+        completed = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark case {root.name} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_memory_check(workdir: Path, shapes: List[str], depth: str, seed: int) -> List[str]:
+    """
+    Analyze each shape at 10k and 1M entries and return every shape whose peak RSS grew past MAX_RSS_GROWTH_MB.
+
+    The index is not used (as in every case), so nothing in the process
+    holds per-file state apart from what aggregation keeps.
+    """
+
+    failures = []
+    for shape in shapes:
+        peaks = {}
+        for size in ("10k", "1m"):
+            root = ensure_tree(workdir, shape, SIZES[size], seed)
+            peaks[size] = run_case(root, depth, 1)["peak_rss_mb"]
+        growth = peaks["1m"] - peaks["10k"]
+        print(f"  {shape}: peak RSS {peaks['10k']} MB at 10k, {peaks['1m']} MB at 1m (+{growth:.1f} MB)")
+        if growth > MAX_RSS_GROWTH_MB:
+            failures.append(f"{shape} peak RSS grew {growth:.1f} MB from 10k to 1m entries (limit {MAX_RSS_GROWTH_MB:g} MB)")
+    return failures
+
+def _machine() -> Dict[str, Any]:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count()
+    }
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every measurement that regressed past the threshold"""
+
+    def check(label: str, kind: str, old: Optional[float], new: Optional[float]) -> None:
+        if old is None or new is None:
+            return
+        if new > old * (1 + threshold) and new - old > MIN_REGRESSION[kind]:
+            regressions.append(f"{label}: {old:g} -> {new:g} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+
+    regressions: List[str] = []
+    for case, result in results["cases"].items():
+        old = baseline.get("cases", {}).get(case)
+        if old is None:
+            continue
+        for stage, measured in result["stages"].items():
+            check(f"{case} {stage} wall_ms", "wall_ms", old["stages"].get(stage, {}).get("wall_ms"), measured["wall_ms"])
+        for call, count in result["fs_calls"].items():
+            check(f"{case} {call} calls", "fs_calls", old["fs_calls"].get(call), count)
+        check(f"{case} peak_rss_mb", "peak_rss_mb", old.get("peak_rss_mb"), result["peak_rss_mb"])
+        lag = result.get("loop_lag_ms", {}).get("max")
+        check(f"{case} loop_lag_ms max", "loop_lag_ms", old.get("loop_lag_ms", {}).get("max"), lag)
+        # Also an absolute limit: a stalled loop freezes every connected client
+        if lag is not None and lag > MAX_LOOP_LAG_MS:
+            regressions.append(f"{case} event loop stalled {lag:g} ms (limit {MAX_LOOP_LAG_MS:g} ms)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the workspace analyzer on synthetic trees")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help=f"Comma-separated shapes ({', '.join(SHAPES)})")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"Comma-separated sizes ({', '.join(SIZES)})")
+    parser.add_argument("--depth", default="standard", help="Analysis depth to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (the median is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for tree generation")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed growth over the baseline, e.g. 0.25 for 25%%")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline instead of comparing")
+    parser.add_argument("--memory-check", action="store_true", help="Only check that peak RSS on 1M-entry trees stays within MAX_RSS_GROWTH_MB of the 10k trees")
+    parser.add_argument("--workdir", type=Path, default=Path(tempfile.gettempdir()) / "workspace-bench", help="Where generated trees are kept between runs")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--run-check", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_check:
+        print(json.dumps(asyncio.run(_check_snapshot_delta(args.run_check))))
+        return 0
+
+    if args.run_case:
+        case = json.loads(args.run_case)
+        result = asyncio.run(_measure(Path(case["root"]), case["depth"], case["repeat"]))
+        print(json.dumps(result))
+        return 0
+
+    shapes = [shape.strip() for shape in args.shapes.split(",") if shape.strip()]
+    sizes = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+    for shape in shapes:
+        if shape not in SHAPES:
+            parser.error(f"unknown shape '{shape}'")
+    for size in sizes:
+        if size not in SIZES:
+            parser.error(f"unknown size '{size}'")
+
+    print("📊 WORKSPACE ANALYZER BENCHMARKS")
+    print("=" * 50)
+    args.workdir.mkdir(parents=True, exist_ok=True)
+
+    if args.memory_check:
+        print("\n🧠 Peak memory, 10k vs 1m entries")
+        failures = run_memory_check(args.workdir, shapes, args.depth, args.seed)
+        if failures:
+            print(f"\n❌ {len(failures)} memory regression(s):")
+            for failure in failures:
+                print(f"   • {failure}")
+            return 1
+        print(f"\n✅ Peak memory within {MAX_RSS_GROWTH_MB:g} MB of the 10k trees")
+        return 0
+    results = {"machine": _machine(), "depth": args.depth, "repeat": args.repeat, "seed": args.seed, "cases": {}}
+    for size in sizes:
+        for shape in shapes:
+            case = f"{shape}/{size}"
+            print(f"\n🌳 {case}")
+            root = ensure_tree(args.workdir, shape, SIZES[size], args.seed)
+            result = run_case(root, args.depth, args.repeat)
+            results["cases"][case] = result
+            stages = ", ".join(f"{stage} {measured['wall_ms']:.1f} ms" for stage, measured in result["stages"].items())
+            print(f"  {result['files_analyzed']:,} files analyzed: {stages}")
+            print(f"  fs calls {result['fs_calls']}, peak RSS {result['peak_rss_mb']} MB")
+            print(f"  event loop lag max {result['loop_lag_ms']['max']:.1f} ms, p99 {result['loop_lag_ms']['p99']:.1f} ms")
+
+    # Correctness, not speed: a failure fails the run whatever the baseline says
+    check_failure = run_check(args.workdir)
+    if check_failure:
+        print(f"\n❌ Snapshot delta check failed: {check_failure}")
+        return 1
+
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+        # Cases not run this time (e.g. the 1M trees) keep their recorded values
+        merged = {**baseline.get("cases", {}), **results["cases"]}
+        results["cases"] = dict(sorted(merged.items()))
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\n✅ Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\n⚠️ No baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("machine") != results["machine"]:
+        print(f"\n⚠️ Baseline was recorded on a different machine ({baseline.get('machine')}); timings may not be comparable")
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over the {args.threshold:.0%} threshold:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+    print(f"\n✅ No regressions over the {args.threshold:.0%} threshold")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())